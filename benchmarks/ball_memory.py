@@ -0,0 +1,74 @@
+"""
+Memory and construction time of Ball against CompactBall and FrozenBall.
+
+Replays the deliveries of tests/951373.json, repeated to give a corpus of the requested size. Each copy is
+decoded from JSON separately so that, as in a real import, every ball starts out with its own name strings.
+
+    python benchmarks/ball_memory.py [copies]
+"""
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict
+from pathlib import Path
+
+TESTS = Path(__file__).parents[1] / "tests"
+sys.path.insert(0, str(TESTS))
+
+from classes import Match
+
+from ec2.scorebook import Ball, CompactBall, FrozenBall
+
+
+def fixture_json() -> str:
+    match = Match.from_json((TESTS / "951373.json").read_text())
+    return json.dumps(
+        [
+            asdict(ball)
+            for inns in range(len(match.innings))
+            for ball in match.balls(inns)
+        ]
+    )
+
+
+def construction_time(cls, text: str, copies: int) -> float:
+    elapsed = 0.0
+    for _ in range(copies):
+        deliveries = json.loads(text)
+        start = time.perf_counter()
+        for kwargs in deliveries:
+            cls(**kwargs)
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def retained_memory(cls, text: str, copies: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    balls = [cls(**kwargs) for _ in range(copies) for kwargs in json.loads(text)]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del balls
+    return size
+
+
+def main(copies: int) -> None:
+    text = fixture_json()
+    count = len(json.loads(text)) * copies
+    print(f"{count:,} balls ({copies} copies of {count // copies})")
+    print(f"{'class':<12} {'ms':>8} {'ns/ball':>8} {'MiB':>8} {'bytes/ball':>11}")
+    for cls in (Ball, CompactBall, FrozenBall):
+        elapsed = construction_time(cls, text, copies)
+        size = retained_memory(cls, text, copies)
+        print(
+            f"{cls.__name__:<12} {elapsed * 1000:>8.1f} {elapsed * 1e9 / count:>8.0f}"
+            f" {size / 2**20:>8.1f} {size / count:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,87 @@
+"""
+Per-ball publish and delivery latency as matches and spectators are added, all in one event loop.
+
+Publish is the time for Match.update to score the ball and fan the rendered card out; delivery is from the start of
+the update until a spectator has the message.
+
+    python benchmarks/broadcast_latency.py [balls per match]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from ec2.importers import cricsheet
+from ec2.live.registry import Match, MatchRegistry
+
+FIXTURE = Path(__file__).parents[1] / "tests" / "951373.json"
+MATCHES = (1, 4, 12)
+VIEWERS = (1, 10, 50)
+
+
+async def spectate(
+    match: Match, started: dict[str, float], delivered: list[float]
+) -> None:
+    async for message in match.channel.listen():
+        delivered.append(time.perf_counter() - started[match.match_id])
+
+
+async def score(
+    match: Match, balls, started: dict[str, float], published: list[float]
+) -> None:
+    for ball in balls:
+        started[match.match_id] = start = time.perf_counter()
+        match.update(ball)
+        published.append(time.perf_counter() - start)
+        await asyncio.sleep(0)
+
+
+async def run(balls, matches: int, viewers: int) -> tuple[list[float], list[float]]:
+    registry = MatchRegistry()
+    started: dict[str, float] = {}
+    published: list[float] = []
+    delivered: list[float] = []
+    spectators = [
+        asyncio.create_task(spectate(registry.open(f"m{m}"), started, delivered))
+        for m in range(matches)
+        for _ in range(viewers)
+    ]
+    await asyncio.sleep(0)
+    await asyncio.gather(
+        *(score(match, balls, started, published) for match in registry)
+    )
+    await asyncio.sleep(0)
+    for task in spectators:
+        task.cancel()
+    await asyncio.gather(*spectators, return_exceptions=True)
+    return published, delivered
+
+
+def centiles(latencies: list[float]) -> str:
+    cuts = statistics.quantiles(latencies, n=100)
+    return f"{cuts[49] * 1e6:>14.0f} {cuts[98] * 1e6:>9.0f}"
+
+
+def main(count: int) -> None:
+    deliveries = [
+        ball
+        for inns in cricsheet.read(FIXTURE)["innings"]
+        for ball in cricsheet.balls(inns)
+    ]
+    balls = [deliveries[i % len(deliveries)] for i in range(count)]
+    print(f"{count:,} balls per match")
+    print(
+        f"{'matches':>7} {'viewers':>7} {'publish p50 µs':>14} {'p99':>9} {'deliver p50 µs':>14} {'p99':>9}"
+    )
+    for matches in MATCHES:
+        for viewers in VIEWERS:
+            published, delivered = asyncio.run(run(balls, matches, viewers))
+            print(
+                f"{matches:>7} {viewers:>7} {centiles(published)} {centiles(delivered)}"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 240)
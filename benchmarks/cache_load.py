@@ -0,0 +1,61 @@
+"""
+Loading match files through MatchCache: cold (decode, then write the cache file) against warm (map the cache
+file), both to ledgers and through to score cards.
+
+    python benchmarks/cache_load.py [files]
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from ec2.importers import cricsheet
+from ec2.importers.cache import MatchCache
+
+FIXTURE = Path(__file__).parents[1] / "tests" / "951373.json"
+
+
+def timed(label: str, count: int, func) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:8.3f}s {count / elapsed:>10,.0f} files/s")
+    return elapsed
+
+
+def load_all(cache: MatchCache, files: list[Path]) -> list:
+    return [cache.load(file) for file in files]
+
+
+def iterate_balls(matches: list) -> int:
+    return sum(1 for match in matches for ledger in match.innings for _ in ledger)
+
+
+def main(count: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        files = [
+            Path(shutil.copy(FIXTURE, Path(tmp) / f"{i:06}.json")) for i in range(count)
+        ]
+        cache = MatchCache(Path(tmp) / "cache")
+        print(f"{count:,} copies of {FIXTURE.name}")
+        timed(
+            "decode, no cache",
+            count,
+            lambda: [cricsheet.load_ledgers(file) for file in files],
+        )
+        cold = timed("cold cache", count, lambda: load_all(cache, files))
+        warm = timed("warm cache", count, lambda: load_all(cache, files))
+        print(f"{'warm speed-up':<24} {cold / warm:8.1f}x")
+        matches = load_all(cache, files)
+        timed("warm, iterate balls", count, lambda: iterate_balls(matches))
+        timed(
+            "warm, score cards",
+            count,
+            lambda: [cricsheet.to_cards(match) for match in matches],
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
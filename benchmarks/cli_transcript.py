@@ -0,0 +1,58 @@
+"""
+Scoring a long notation transcript through cli.py: the innings of tests/951373.json written out as notation and
+repeated until the transcript has the requested number of lines, then scored in process with Reader and end to end
+by piping it to cli.py.
+
+    python benchmarks/cli_transcript.py [lines]
+"""
+
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from ec2.importers import cricsheet
+from ec2.importers.notation import Reader, transcript
+
+ROOT = Path(__file__).parents[1]
+FIXTURE = ROOT / "tests" / "951373.json"
+
+
+def fixture_lines(count: int) -> list[str]:
+    match = []
+    for ledger in cricsheet.load_ledgers(FIXTURE).innings:
+        match += transcript(ledger)
+        match.append("innings")
+    return [match[i % len(match)] for i in range(count)]
+
+
+def main(count: int) -> None:
+    lines = fixture_lines(count)
+    deliveries = sum(1 for line in lines if line[0].isdigit() or line[0] in "./+")
+    print(f"{count:,} lines, {deliveries:,} deliveries")
+    for report in ("over", "innings", "end"):
+        start = time.perf_counter()
+        Reader(report).read(lines).close()
+        elapsed = time.perf_counter() - start
+        print(
+            f"Reader, report={report:<8} {elapsed:8.3f}s {count / elapsed:>12,.0f} lines/s"
+        )
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt") as file:
+        file.write("\n".join(lines))
+        file.flush()
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, str(ROOT / "cli.py"), file.name, "--report", "end"],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        elapsed = time.perf_counter() - start
+        print(
+            f"cli.py, with start-up   {elapsed:8.3f}s {count / elapsed:>12,.0f} lines/s"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,79 @@
+"""
+Cost of NiceGUI binding on the scorebook: import time of the plain core against the bindable adapter, attribute
+writes on a plain Batter against a bindable one, and scoring a plain card against a bindable one.
+
+    python benchmarks/core_overhead.py [writes]
+"""
+
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from ec2.importers import cricsheet
+from ec2.scorebook import Batter, ScoreCard, Scorer
+
+FIXTURE = Path(__file__).parents[1] / "tests" / "951373.json"
+IMPORTS = ("ec2.scorebook", "ec2.ui.bindable")
+
+
+def import_ms(module: str, runs: int = 5) -> float:
+    """Median cumulative import time of `module` in a fresh interpreter, from python -X importtime."""
+    times = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        pattern = rf"^import time:\s+\d+ \|\s+(\d+) \|\s*{re.escape(module)}$"
+        times.append(
+            int(re.search(pattern, result.stderr, re.MULTILINE).group(1)) / 1000
+        )
+    return statistics.median(times)
+
+
+def writes_per_second(batter: Batter, count: int) -> float:
+    start = time.perf_counter()
+    for n in range(count):
+        batter.runs = n
+    return count / (time.perf_counter() - start)
+
+
+def balls_per_second(card: ScoreCard, balls: list) -> float:
+    scorer = Scorer(card)
+    start = time.perf_counter()
+    for ball in balls:
+        scorer.update(ball)
+    return len(balls) / (time.perf_counter() - start)
+
+
+def main(count: int) -> None:
+    for module in IMPORTS:
+        print(f"import {module:<20} {import_ms(module):8.1f} ms")
+
+    from ec2.ui.bindable import BindableBatter, bindable_card
+
+    plain = writes_per_second(Batter(), count)
+    bound = writes_per_second(BindableBatter(), count)
+    print(f"{count:,} attribute writes")
+    print(f"plain Batter     {plain:>14,.0f} writes/s")
+    print(f"bindable Batter  {bound:>14,.0f} writes/s  ({plain / bound:.1f}x slower)")
+
+    balls = [
+        ball
+        for inns in cricsheet.read(FIXTURE)["innings"]
+        for ball in cricsheet.balls(inns)
+    ]
+    plain = balls_per_second(ScoreCard(), balls)
+    bound = balls_per_second(bindable_card(), balls)
+    print(f"{len(balls):,} balls scored with Scorer.update")
+    print(f"plain card       {plain:>14,.0f} balls/s")
+    print(f"bindable card    {bound:>14,.0f} balls/s  ({plain / bound:.1f}x slower)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,73 @@
+"""
+Cricsheet import: the dataclasses-json model from tests/classes.py against ec2.importers.cricsheet, and
+ingestion of a directory of match files in-process and across a process pool.
+
+    python benchmarks/cricsheet_import.py [files]
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TESTS = Path(__file__).parents[1] / "tests"
+FIXTURE = TESTS / "951373.json"
+sys.path.insert(0, str(TESTS))
+
+from classes import Match
+
+from ec2.importers import cricsheet
+
+
+def dataclasses_json_balls(text: str) -> int:
+    match = Match.from_json(text)
+    return sum(1 for inns in range(len(match.innings)) for _ in match.balls(inns))
+
+
+def fast_balls(text: str) -> int:
+    return sum(
+        1
+        for innings in cricsheet.loads(text)["innings"]
+        for _ in cricsheet.balls(innings)
+    )
+
+
+def timed(label: str, count: int, func) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.2f}s {count / elapsed:>10,.0f} files/s")
+    return elapsed
+
+
+def main(files: int) -> None:
+    text = FIXTURE.read_text()
+    print(f"{files:,} copies of {FIXTURE.name}")
+    slow = timed(
+        "dataclasses-json decode",
+        files,
+        lambda: [dataclasses_json_balls(text) for _ in range(files)],
+    )
+    fast = timed(
+        "cricsheet decode", files, lambda: [fast_balls(text) for _ in range(files)]
+    )
+    print(f"{'decode speed-up':<28} {slow / fast:8.1f}x")
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(files):
+            shutil.copy(FIXTURE, Path(tmp) / f"{i:06}.json")
+        timed(
+            "ingest, in process",
+            files,
+            lambda: list(cricsheet.ingest(tmp, processes=0)),
+        )
+        timed("ingest, process pool", files, lambda: list(cricsheet.ingest(tmp)))
+        timed(
+            "ingest ledgers, process pool",
+            files,
+            lambda: list(cricsheet.ingest(tmp, ledgers=True)),
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
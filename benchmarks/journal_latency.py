@@ -0,0 +1,48 @@
+"""
+Per-ball latency of Journal.append under each durability setting.
+
+    python benchmarks/journal_latency.py [balls]
+"""
+
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from ec2.importers import cricsheet
+from ec2.storage.journal import Journal
+
+FIXTURE = Path(__file__).parents[1] / "tests" / "951373.json"
+
+SETTINGS = {
+    "no fsync": {"sync_every": 0},
+    "group, 32 balls / 50ms": {"sync_every": 32, "sync_ms": 50},
+    "group, 8 balls / 10ms": {"sync_every": 8, "sync_ms": 10},
+    "fsync every ball": {"sync_every": 1},
+}
+
+
+def main(count: int) -> None:
+    innings = cricsheet.read(FIXTURE)["innings"]
+    deliveries = [ball for inns in innings for ball in cricsheet.balls(inns)]
+    balls = [deliveries[i % len(deliveries)] for i in range(count)]
+    print(f"{count:,} balls")
+    print(f"{'setting':<24} {'mean µs':>9} {'p50 µs':>9} {'p99 µs':>9} {'max µs':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n, (label, setting) in enumerate(SETTINGS.items()):
+            latencies = []
+            with Journal(Path(tmp) / f"{n}.journal", **setting) as journal:
+                for ball in balls:
+                    start = time.perf_counter()
+                    journal.append(ball)
+                    latencies.append((time.perf_counter() - start) * 1e6)
+            centiles = statistics.quantiles(latencies, n=100)
+            print(
+                f"{label:<24} {statistics.fmean(latencies):>9.1f} {centiles[49]:>9.1f}"
+                f" {centiles[98]:>9.1f} {max(latencies):>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,46 @@
+"""
+Latency of Projector.project: the innings of tests/951373.json fitted as a T20 model, then the second innings
+projected after every ball, as Display.update_scorer would, for each number of simulations.
+
+    python benchmarks/projection.py [simulations ...]
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from ec2.importers import cricsheet
+from ec2.projection import Projector
+from ec2.scorebook import Scorer
+
+FIXTURE = Path(__file__).parents[1] / "tests" / "951373.json"
+
+
+def main(counts: list[int]) -> None:
+    ledgers = cricsheet.load_ledgers(FIXTURE).innings
+    for count in counts:
+        projector = Projector(simulations=count, seed=1)
+        start = time.perf_counter()
+        projector.fit("T20", ledgers * 100)
+        fitted = time.perf_counter() - start
+
+        chase = ledgers[1]
+        scorer = Scorer()
+        scorer.card.analytics.target = 156
+        times = []
+        for index in range(len(chase)):
+            while scorer.card.over < chase.over[index]:
+                scorer.over_bowled()
+            scorer.update(chase.ball(index))
+            times.append(projector.project(scorer.card).seconds)
+        times.sort()
+        median, p99 = statistics.median(times), times[int(len(times) * 0.99)]
+        print(
+            f"{count:>7,} simulations: fit {fitted * 1e3:6.1f} ms, project median {median * 1e3:6.2f} ms,"
+            f" p99 {p99 * 1e3:6.2f} ms, max {times[-1] * 1e3:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 20_000, 50_000])
@@ -0,0 +1,54 @@
+"""
+Throughput of rebuilding score cards ball by ball with Scorer.update against Scorer.update_many.
+
+Replays the innings of tests/951373.json in turn until the requested number of innings has been scored.
+
+    python benchmarks/replay.py [innings]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+TESTS = Path(__file__).parents[1] / "tests"
+sys.path.insert(0, str(TESTS))
+
+from classes import Match
+
+from ec2.scorebook import ScoreCard, Scorer
+
+
+def fixture_innings() -> list[list]:
+    match = Match.from_json((TESTS / "951373.json").read_text())
+    return [list(match.balls(inns)) for inns in range(len(match.innings))]
+
+
+def ball_by_ball(balls: list) -> None:
+    scorer = Scorer(ScoreCard())
+    for ball in balls:
+        scorer.update(ball)
+
+
+def bulk(balls: list) -> None:
+    Scorer(ScoreCard()).update_many(balls)
+
+
+def main(count: int) -> None:
+    innings = fixture_innings()
+    corpus = [innings[i % len(innings)] for i in range(count)]
+    deliveries = sum(len(balls) for balls in corpus)
+    print(f"{count:,} innings, {deliveries:,} balls")
+    timings = {}
+    for replay in (ball_by_ball, bulk):
+        start = time.perf_counter()
+        for balls in corpus:
+            replay(balls)
+        timings[replay.__name__] = elapsed = time.perf_counter() - start
+        print(
+            f"{replay.__name__:<12} {elapsed:8.2f}s {deliveries / elapsed:>12,.0f} balls/s"
+        )
+    print(f"speed-up     {timings['ball_by_ball'] / timings['bulk']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
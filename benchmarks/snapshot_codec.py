@@ -0,0 +1,50 @@
+"""
+Encoding and decoding both innings of tests/951373.json with dataclasses-json (ScoreCard.to_json/from_json)
+against the snapshot codec's JSON and binary forms.
+
+    python benchmarks/snapshot_codec.py [repeats]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from ec2.importers import cricsheet
+from ec2.scorebook import ScoreCard, snapshot
+
+FIXTURE = Path(__file__).parents[1] / "tests" / "951373.json"
+
+CODECS = {
+    "dataclasses-json": (ScoreCard.to_json, ScoreCard.from_json),
+    "snapshot json": (snapshot.to_json, snapshot.from_json),
+    "snapshot binary": (snapshot.dumps, snapshot.loads),
+}
+
+
+def timed(func, items: list, repeats: int) -> tuple[float, list]:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        results = [func(item) for item in items]
+    return (time.perf_counter() - start) / repeats, results
+
+
+def main(repeats: int) -> None:
+    cards = cricsheet.load(FIXTURE).innings
+    print(f"both innings of {FIXTURE.name}, mean of {repeats}")
+    print(
+        f"{'codec':<18} {'encode ms':>10} {'decode ms':>10} {'bytes':>8} {'speed-up':>9}"
+    )
+    baseline = None
+    for label, (encode, decode) in CODECS.items():
+        encode_time, encoded = timed(encode, cards, repeats)
+        decode_time, _ = timed(decode, encoded, repeats)
+        total = encode_time + decode_time
+        baseline = baseline or total
+        size = sum(len(data) for data in encoded)
+        print(
+            f"{label:<18} {encode_time * 1e3:>10.2f} {decode_time * 1e3:>10.2f} {size:>8,} {baseline / total:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,275 @@
+"""
+Benchmark suite for the hot paths: scoring (Scorer.update, update_many and the bulk replay), the UI's polling of
+player slots and their html, Cricsheet decoding and ScoreCard.to_json/from_json.
+
+Scoring replays the innings of tests/951373.json until the requested number of innings has been scored. Each
+benchmark is run `--repeats` times and its median time per operation recorded. Results are written as JSON with
+`--output`; `--baseline` compares them against an earlier results file and exits with status 1 if any metric tracked
+by both is slower by more than `--threshold` (a fraction, 0.25 by default). `--results` compares an existing results
+file instead of running the suite.
+
+    python benchmarks/suite.py [--innings N] [--repeats N] [--only PATTERN] [--output FILE]
+                               [--baseline FILE [--results FILE] [--threshold FRACTION]]
+"""
+
+import argparse
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+from ec2.importers import cricsheet
+from ec2.scorebook import Ball, ScoreCard, Scorer
+
+FIXTURE = Path(__file__).parents[1] / "tests" / "951373.json"
+VERSION = 1
+
+# name -> (unit, setup); setup(innings) returns the operation count and a function running them all once
+BENCHMARKS: dict[
+    str, tuple[str, Callable[[int], tuple[int, Callable[[], object]]]]
+] = {}
+
+
+def benchmark(name: str, unit: str):
+    def register(setup):
+        BENCHMARKS[name] = (unit, setup)
+        return setup
+
+    return register
+
+
+def corpus(innings: int) -> list[list[Ball]]:
+    fixture = [list(ledger) for ledger in cricsheet.load_ledgers(FIXTURE).innings]
+    return [fixture[i % len(fixture)] for i in range(innings)]
+
+
+def fixture_cards() -> list[ScoreCard]:
+    return cricsheet.load(FIXTURE).innings
+
+
+@benchmark("scorer.update", "ball")
+def scorer_update(innings: int):
+    balls = corpus(innings)
+
+    def run():
+        for deliveries in balls:
+            scorer = Scorer()
+            for ball in deliveries:
+                scorer.update(ball)
+
+    return sum(map(len, balls)), run
+
+
+@benchmark("scorer.update_many", "ball")
+def scorer_update_many(innings: int):
+    balls = corpus(innings)
+
+    def run():
+        for deliveries in balls:
+            Scorer().update_many(deliveries)
+
+    return sum(map(len, balls)), run
+
+
+@benchmark("scorer.replay_bulk", "ball")
+def scorer_replay_bulk(innings: int):
+    fixture = cricsheet.load_ledgers(FIXTURE).innings
+    ledgers = [fixture[i % len(fixture)] for i in range(innings)]
+
+    def run():
+        for ledger in ledgers:
+            Scorer(undoable=False).replay(ledger)
+
+    return sum(map(len, ledgers)), run
+
+
+def polls(innings: int) -> int:
+    # the UI's timer polls every slot of both orders, ten times a second
+    return max(innings * 10, 100)
+
+
+@benchmark("ui.slot_lookup", "lookup")
+def ui_slot_lookup(innings: int):
+    cards = fixture_cards()
+    count = polls(innings)
+
+    def run():
+        for _ in range(count):
+            for card in cards:
+                batting, bowling = card.batting_order, card.bowling_order
+                for position in range(1, 12):
+                    getattr(batting, f"batter_{position}")()
+                    getattr(bowling, f"bowler_{position}")()
+
+    return count * len(cards) * 22, run
+
+
+@benchmark("ui.html_cached", "player")
+def ui_html_cached(innings: int):
+    players = [
+        player
+        for card in fixture_cards()
+        for player in card.batting_order.slots + card.bowling_order.slots
+    ]
+    count = polls(innings)
+
+    def run():
+        html = ""
+        for _ in range(count):
+            for player in players:
+                html = player.html
+        return html
+
+    return count * len(players), run
+
+
+@benchmark("ui.html_render", "player")
+def ui_html_render(innings: int):
+    players = [
+        player
+        for card in fixture_cards()
+        for player in card.batting_order.slots + card.bowling_order.slots
+    ]
+    count = max(innings // 10, 10)
+
+    def run():
+        html = ""
+        for _ in range(count):
+            for player in players:
+                player.revision += 1
+                html = player.html
+        return html
+
+    return count * len(players), run
+
+
+@benchmark("cricsheet.decode", "file")
+def cricsheet_decode(innings: int):
+    text = FIXTURE.read_text()
+    count = max(innings // 10, 10)
+
+    def run():
+        for _ in range(count):
+            for data in cricsheet.loads(text)["innings"]:
+                for _ in cricsheet.balls(data):
+                    pass
+
+    return count, run
+
+
+@benchmark("card.to_json", "card")
+def card_to_json(innings: int):
+    cards = fixture_cards()
+    count = max(innings // 10, 10)
+
+    def run():
+        for _ in range(count):
+            for card in cards:
+                card.to_json()
+
+    return count * len(cards), run
+
+
+@benchmark("card.from_json", "card")
+def card_from_json(innings: int):
+    texts = [card.to_json() for card in fixture_cards()]
+    count = max(innings // 10, 10)
+
+    def run():
+        for _ in range(count):
+            for text in texts:
+                ScoreCard.from_json(text)
+
+    return count * len(texts), run
+
+
+def run_suite(innings: int, repeats: int, only: str = "*") -> dict:
+    metrics = {}
+    for name, (unit, setup) in BENCHMARKS.items():
+        if not fnmatch.fnmatch(name, only):
+            continue
+        count, run = setup(innings)
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            times.append((time.perf_counter() - start) / count)
+        metrics[name] = {
+            "seconds": statistics.median(times),
+            "unit": unit,
+            "count": count,
+            "repeats": times,
+        }
+        median = statistics.median(times)
+        print(f"{name:<22} {median * 1e6:>10.3f} us/{unit:<7} {1 / median:>14,.0f}/s")
+    return {
+        "version": VERSION,
+        "created": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "innings": innings,
+        "repeats": repeats,
+        "metrics": metrics,
+    }
+
+
+def compare(baseline: dict, results: dict, threshold: float) -> list[str]:
+    """The metrics in both sets of results that are slower than the baseline by more than `threshold`."""
+    regressions = []
+    for name, metric in results["metrics"].items():
+        before = baseline["metrics"].get(name)
+        if before is None:
+            continue
+        ratio = metric["seconds"] / before["seconds"]
+        regressed = ratio > 1 + threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<22} {ratio:>7.2f}x baseline{'  REGRESSED' if regressed else ''}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--innings",
+        type=int,
+        default=1000,
+        help="innings scored by the scoring benchmarks",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument(
+        "--only", default="*", help="run only the benchmarks matching this pattern"
+    )
+    parser.add_argument("--output", type=Path, help="write the results here, as JSON")
+    parser.add_argument("--baseline", type=Path, help="results to compare against")
+    parser.add_argument(
+        "--results",
+        type=Path,
+        help="compare these results rather than running the suite",
+    )
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    if args.results:
+        results = json.loads(args.results.read_text())
+    else:
+        results = run_suite(args.innings, args.repeats, args.only)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("version") != VERSION:
+            sys.exit(f"{args.baseline} is not version {VERSION} benchmark results")
+        if regressions := compare(baseline, results, args.threshold):
+            sys.exit(
+                f"regressed by more than {args.threshold:.0%}: {', '.join(regressions)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
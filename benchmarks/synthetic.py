@@ -0,0 +1,65 @@
+"""
+Synthetic match generation, then the Cricsheet import path end to end: the rate ec2.synthetic generates deliveries
+for each format, and for the first, the rates the matches are written as JSON files, read back as ledgers, and scored.
+
+    python benchmarks/synthetic.py [--matches N] [--formats T20 ODI Test] [--processes N]
+"""
+
+import argparse
+import tempfile
+import time
+
+from ec2.importers import cricsheet
+from ec2.synthetic import FORMATS, Generator, write
+
+
+def timed(label: str, deliveries: int, function) -> object:
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:7.2f} s  {deliveries / elapsed:>12,.0f} deliveries/s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--matches", type=int, default=10_000)
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=0,
+        help="import workers, 0 to import in this process",
+    )
+    args = parser.parse_args()
+
+    generated = {}
+    for format in args.formats:
+        start = time.perf_counter()
+        matches = list(Generator(format, seed=1).matches(args.matches))
+        elapsed = time.perf_counter() - start
+        deliveries = sum(len(ledger) for match in matches for ledger in match.innings)
+        print(
+            f"generate {args.matches:,} {format:<5} {elapsed:10.2f} s  {deliveries / elapsed:>12,.0f} deliveries/s"
+        )
+        generated[format] = matches, deliveries
+
+    matches, deliveries = generated[args.formats[0]]
+    with tempfile.TemporaryDirectory() as directory:
+        timed(
+            "write Cricsheet JSON", deliveries, lambda: write(directory, iter(matches))
+        )
+        timed(
+            "import ledgers",
+            deliveries,
+            lambda: list(cricsheet.ingest(directory, args.processes, ledgers=True)),
+        )
+        timed(
+            "import and score",
+            deliveries,
+            lambda: list(cricsheet.ingest(directory, args.processes)),
+        )
+
+
+if __name__ == "__main__":
+    main()
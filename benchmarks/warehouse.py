@@ -0,0 +1,139 @@
+"""
+Ingest rate and query latency of the statistics warehouse on a synthetic corpus.
+
+Each synthetic match is the innings of tests/951373.json with its players renamed from a pool of squads, and a
+format, season and venue of its own, so careers, seasons and venues build up across the corpus. Matches are added
+in batches of `--batch` into a new database file, then each query is timed for random players.
+
+    python benchmarks/warehouse.py [--matches N] [--batch N] [--queries N] [--database FILE]
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from ec2.importers import cricsheet
+from ec2.scorebook import Ledger
+from ec2.scorebook.ledger import COLUMNS
+from ec2.storage.warehouse import Warehouse
+
+FIXTURE = Path(__file__).parents[1] / "tests" / "951373.json"
+SQUADS = 100
+VENUES = [f"Ground {n}" for n in range(60)]
+SEASONS = [str(year) for year in range(2000, 2025)]
+FORMATS = ("T20", "ODI")
+
+
+def corpus(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    fixture = cricsheet.load_ledgers(FIXTURE)
+    squads = [
+        [f"Squad {squad} Player {n}" for n in range(16)] for squad in range(SQUADS)
+    ]
+    for number in range(count):
+        home, away = rng.sample(squads, 2)
+        # each innings' names, batting side first, renamed in the order they appear
+        innings = []
+        for ledger, (batting, bowling) in zip(
+            fixture.innings, ((home, away), (away, home))
+        ):
+            batters = set(ledger.striker) | set(ledger.non_striker)
+            names = iter(batting), iter(bowling)
+            renamed = [""] + [
+                next(names[player not in batters])
+                for player in range(1, len(ledger.names))
+            ]
+            innings.append(
+                Ledger(
+                    names=renamed,
+                    **{column: getattr(ledger, column) for column in COLUMNS},
+                )
+            )
+        info = fixture.info | {
+            "match_type": FORMATS[number % 2],
+            "season": rng.choice(SEASONS),
+            "venue": rng.choice(VENUES),
+        }
+        yield replace(fixture, source=f"synthetic/{number}", info=info, innings=innings)
+
+
+def time_query(run, arguments: list[tuple]) -> float:
+    times = []
+    for args in arguments:
+        start = time.perf_counter()
+        run(*args)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--matches", type=int, default=10_000)
+    parser.add_argument(
+        "--batch", type=int, default=500, help="matches added in each transaction"
+    )
+    parser.add_argument(
+        "--queries", type=int, default=200, help="times each query is run"
+    )
+    parser.add_argument(
+        "--database", type=Path, help="the database file, a temporary one by default"
+    )
+    args = parser.parse_args()
+
+    matches = list(corpus(args.matches))
+    deliveries = sum(len(ledger) for match in matches for ledger in match.innings)
+    with (
+        tempfile.TemporaryDirectory() as directory,
+        Warehouse(args.database or Path(directory) / "warehouse.db") as warehouse,
+    ):
+        start = time.perf_counter()
+        for first in range(0, len(matches), args.batch):
+            warehouse.add(matches[first : first + args.batch])
+        elapsed = time.perf_counter() - start
+        print(
+            f"ingest {len(matches):,} matches, {deliveries:,} deliveries in {elapsed:.2f}s:"
+        )
+        print(
+            f"  {len(matches) / elapsed:,.0f} matches/s, {deliveries / elapsed:,.0f} deliveries/s"
+        )
+
+        rng = random.Random(2)
+        players = list(warehouse.players)[1:]
+        picks = [rng.choice(players) for _ in range(args.queries)]
+        queries = {
+            "career batting": (warehouse.batting, [(player,) for player in picks]),
+            "career bowling, T20": (
+                warehouse.bowling,
+                [(player, None, "T20") for player in picks],
+            ),
+            "season batting": (
+                warehouse.batting,
+                [(player, rng.choice(SEASONS)) for player in picks],
+            ),
+            "batting at venue": (
+                warehouse.batting_at,
+                [(player, rng.choice(VENUES)) for player in picks],
+            ),
+            "matchup": (
+                warehouse.matchup,
+                [(player, rng.choice(players)) for player in picks],
+            ),
+            "season run leaders": (
+                warehouse.leaders,
+                [("batting", "runs", rng.choice(SEASONS))] * 20,
+            ),
+            "career wicket leaders": (
+                warehouse.leaders,
+                [("bowling", "wickets")] * 20,
+            ),
+        }
+        for name, (run, arguments) in queries.items():
+            print(f"{name:<22} {time_query(run, arguments) * 1e6:>10.1f} us median")
+
+
+if __name__ == "__main__":
+    main()
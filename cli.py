@@ -1,30 +1,80 @@
-from ec2.scorebook import ScoreCard, Scorer, Ball
-
-card = ScoreCard()
-scorer = Scorer()
-
-striker: str = ""
-non_striker: str = ""
-bowler: str = ""
-
-
-def prompt() -> str:
-    return f"{bowler} to {striker}: "
-
-
-while True:
-    cmd = input(prompt())
-    match cmd:
-        case ".":
-            scorer.update(Ball(striker=striker, non_striker=non_striker, bowler=bowler))
-        case s if cmd.startswith("str"):
-            striker = cmd.split()[1]
-        case s if cmd.startswith("non"):
-            non_striker = cmd.split()[1]
-        case s if s.startswith("bow"):
-            bowler = cmd.split()[1]
-        case s if s in ["1", "2", "3", "4", "6"]:
-            scorer.update(Ball(striker=striker, non_striker=non_striker, bowler=bowler, batter_runs=int(s)))
-        case "q":
-            break
-    print(scorer.card.score)
+"""
+Scoring from the terminal.
+
+    python cli.py                                   score interactively, one command at a time
+    python cli.py TRANSCRIPT [--report REPORT]      score a transcript, "-" for stdin
+    ... | python cli.py [--report REPORT]           likewise, from a pipe
+
+Transcripts are in the notation described in ec2.importers.notation, and the score is written at the end of every
+over, every innings or only once the whole transcript has been scored, as REPORT says.
+"""
+
+import argparse
+import sys
+
+from ec2.importers.notation import REPORTS, Reader
+from ec2.scorebook import Ball, Scorer
+
+
+def interactive() -> None:
+    scorer = Scorer()
+    striker = non_striker = bowler = ""
+    while True:
+        cmd = input(f"{bowler} to {striker}: ")
+        match cmd:
+            case ".":
+                scorer.update(
+                    Ball(striker=striker, non_striker=non_striker, bowler=bowler)
+                )
+            case s if cmd.startswith("str"):
+                striker = cmd.split()[1]
+            case s if cmd.startswith("non"):
+                non_striker = cmd.split()[1]
+            case s if s.startswith("bow"):
+                bowler = cmd.split()[1]
+            case s if s in ["1", "2", "3", "4", "6"]:
+                scorer.update(
+                    Ball(
+                        striker=striker,
+                        non_striker=non_striker,
+                        bowler=bowler,
+                        batter_runs=int(s),
+                    )
+                )
+            case "q":
+                break
+        print(scorer.card.score)
+
+
+def scripted(transcript: str, report: str) -> None:
+    reader = Reader(report, sys.stdout)
+    try:
+        if transcript == "-":
+            reader.read(sys.stdin)
+        else:
+            with open(transcript) as lines:
+                reader.read(lines)
+        reader.close()
+    except ValueError as error:
+        sys.exit(f"{transcript}: {error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Score a match from the terminal or from a transcript."
+    )
+    parser.add_argument(
+        "transcript", nargs="?", help='file of scoring notation, or "-" for stdin'
+    )
+    parser.add_argument(
+        "--report", choices=REPORTS, default="innings", help="when to write the score"
+    )
+    args = parser.parse_args()
+    if args.transcript is None and sys.stdin.isatty():
+        interactive()
+    else:
+        scripted(args.transcript or "-", args.report)
+
+
+if __name__ == "__main__":
+    main()
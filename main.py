@@ -1,10 +1,49 @@
-from nicegui import ui
+import os
 
-from ec2.scorebook import ScoreCard
-from src.ec2.ui.display import Display
+from nicegui import app, ui
 
-display = Display(card_1=ScoreCard(), card_2=ScoreCard())
+from ec2.instrumentation import instruments
+from ec2.live.registry import MatchRegistry
+from ec2.live.scoring import FRAME_RATE
+from ec2.ui.pages import register
 
-display.show()
+# each match's scoring events are journalled here, and replayed on start-up to carry on after a restart; the scoring
+# page is redrawn at most EC2_FRAME_RATE times a second, however fast they come in; matches are played to EC2_FORMAT
+frame_rate = float(os.environ.get("EC2_FRAME_RATE", FRAME_RATE))
+registry = MatchRegistry(
+    os.environ.get("EC2_JOURNALS", "journals"),
+    frame_rate,
+    os.environ.get("EC2_FORMAT", "T20"),
+)
+registry.recover()
+app.on_shutdown(registry.close)
+
+# with EC2_HISTORY naming a statistics warehouse, the scoring page projects each innings from the matches in it
+projector = None
+if history := os.environ.get("EC2_HISTORY"):
+    from ec2.projection import (  # needs numpy, only installed with the projection extra
+        FORMATS,
+        Projector,
+    )
+    from ec2.storage.warehouse import Warehouse
+
+    projector = Projector()
+    with Warehouse(history) as warehouse:
+        for format in FORMATS:
+            if warehouse.connection.execute(
+                "SELECT 1 FROM matches WHERE format = ?", (format,)
+            ).fetchone():
+                projector.fit_warehouse(warehouse, format)
+
+register(registry, projector)
+
+# hot-path timings and counters, written to this file as JSON every EC2_INSTRUMENT_INTERVAL seconds; with
+# EC2_TRACEMALLOC set, the biggest allocations too
+if report := os.environ.get("EC2_INSTRUMENT"):
+    instruments.enable(allocations=bool(os.environ.get("EC2_TRACEMALLOC")))
+    instruments.start_reporting(
+        report, float(os.environ.get("EC2_INSTRUMENT_INTERVAL", "10"))
+    )
+    app.on_shutdown(instruments.stop_reporting)
 
 ui.run()
@@ -0,0 +1,138 @@
+"""
+On-disk cache of imported matches, so that a match file is only decoded the first time it is loaded.
+
+Each cached match is one file:
+
+    header      magic, version, byte order, innings count, info length, names length
+    ball counts one uint32 per innings
+    info        the match's Cricsheet "info" as JSON
+    names       every player name in the match, newline separated, stored once for all innings
+    columns     for each innings, each Ledger column in turn as a packed array, name columns indexing the names
+
+Reading maps the file into memory, and the ledgers returned are views onto the mapping rather than copies.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from ec2.scorebook import Ledger
+from ec2.scorebook.ledger import COLUMNS, NAME_COLUMNS, TYPECODES
+
+from .cricsheet import ImportedMatch, Source, load_ledgers, read_bytes, source_name
+
+MAGIC = b"EC2C"
+VERSION = 1
+HEADER = struct.Struct("<4sHcxIII")
+BYTE_ORDER = sys.byteorder[0].encode()
+ALIGNMENT = 8
+
+
+def padding(offset: int) -> int:
+    return -offset % ALIGNMENT
+
+
+def write(path: str | Path, imported: ImportedMatch) -> None:
+    names: list[str] = []
+    ids: dict[str, int] = {}
+    for ledger in imported.innings:
+        for name in ledger.names:
+            if name not in ids:
+                ids[name] = len(names)
+                names.append(name)
+
+    info = json.dumps(imported.info, default=str).encode()
+    name_blob = "\n".join(names).encode()
+    counts = array("I", (len(ledger) for ledger in imported.innings))
+
+    path = Path(path)
+    temp = path.with_suffix(".tmp")
+    with temp.open("wb") as f:
+        f.write(
+            HEADER.pack(
+                MAGIC, VERSION, BYTE_ORDER, len(counts), len(info), len(name_blob)
+            )
+        )
+        f.write(counts.tobytes())
+        f.write(info)
+        f.write(name_blob)
+        for ledger in imported.innings:
+            to_file = array("H", (ids[name] for name in ledger.names))
+            for column in COLUMNS:
+                f.write(bytes(padding(f.tell())))
+                values = getattr(ledger, column)
+                if column in NAME_COLUMNS:
+                    values = array("H", (to_file[i] for i in values))
+                f.write(array(TYPECODES[column], values).tobytes())
+    os.replace(temp, path)
+
+
+def read(path: str | Path, source: str = "") -> ImportedMatch:
+    with open(path, "rb") as f:
+        buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    magic, version, byte_order, innings, info_length, names_length = HEADER.unpack_from(
+        buffer
+    )
+    if magic != MAGIC or version != VERSION or byte_order != BYTE_ORDER:
+        raise ValueError(
+            f"{path} is not a version {VERSION} match cache file for this machine"
+        )
+
+    offset = HEADER.size
+    counts = buffer[offset : offset + 4 * innings].cast("I")
+    offset += 4 * innings
+    info = json.loads(bytes(buffer[offset : offset + info_length]))
+    offset += info_length
+    names = bytes(buffer[offset : offset + names_length]).decode().split("\n")
+    offset += names_length
+
+    ledgers = []
+    for count in counts:
+        columns = {}
+        for column in COLUMNS:
+            offset += padding(offset)
+            code = TYPECODES[column]
+            size = count * array(code).itemsize
+            columns[column] = buffer[offset : offset + size].cast(code)
+            offset += size
+        ledgers.append(Ledger(names=list(names), **columns))
+    return ImportedMatch(source=source or str(path), info=info, innings=ledgers)
+
+
+class MatchCache:
+    """
+    Cached matches in `directory`, keyed on the source's path and either its modification time and size
+    (`validate="mtime"`) or a hash of its contents (`validate="hash"`).
+    """
+
+    def __init__(self, directory: str | Path, validate: str = "mtime"):
+        if validate not in ("mtime", "hash"):
+            raise ValueError(f"unknown validation {validate!r}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.validate = validate
+
+    def key(self, source: Source) -> str:
+        file, member = source if isinstance(source, tuple) else (source, "")
+        file = Path(file).resolve()
+        digest = hashlib.sha1(f"{file}\0{member}".encode())
+        if self.validate == "hash":
+            digest.update(hashlib.sha1(read_bytes(source)).digest())
+        else:
+            stat = file.stat()
+            digest.update(f"\0{stat.st_mtime_ns}\0{stat.st_size}".encode())
+        return digest.hexdigest()
+
+    def path(self, source: Source) -> Path:
+        return self.directory / f"{self.key(source)}.ec2c"
+
+    def load(self, source: Source) -> ImportedMatch:
+        path = self.path(source)
+        if not path.exists():
+            write(path, load_ledgers(source))
+        return read(path, source_name(source))
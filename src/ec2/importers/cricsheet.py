@@ -0,0 +1,193 @@
+"""
+Import of Cricsheet (https://cricsheet.org) JSON match files.
+
+Deliveries are turned straight into Balls from the decoded JSON, without the dataclasses-json model used in the
+tests. Whole directories or zip archives can be loaded across a pool of processes.
+"""
+
+import os
+import zipfile
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from ec2.scorebook import Ball, Extra, HowOut, Ledger, ScoreCard, Scorer
+
+try:
+    from orjson import loads
+except ImportError:  # pragma: no cover
+    from json import loads
+
+# checked in this order, as a no-ball can also have byes or leg-byes run off it
+EXTRA_KEYS = (
+    ("noballs", Extra.NOBALL),
+    ("wides", Extra.WIDE),
+    ("byes", Extra.BYE),
+    ("legbyes", Extra.LEGBYE),
+)
+
+HOW_OUTS = {
+    "caught": HowOut.CAUGHT,
+    "caught and bowled": HowOut.CAUGHT,
+    "bowled": HowOut.BOWLED,
+    "lbw": HowOut.LBW,
+    "stumped": HowOut.STUMPED,
+    "run out": HowOut.RUN_OUT,
+}
+
+Source = str | Path | tuple[str, str]
+
+
+@dataclass
+class ImportedMatch:
+    source: str
+    info: dict[str, Any] = field(default_factory=dict)
+    innings: list[ScoreCard] | list[Ledger] = field(default_factory=list)
+
+
+def to_ball(delivery: dict[str, Any]) -> Ball:
+    extra_type = Extra.NO_EXTRA
+    penalty_runs = 0
+    extras = delivery.get("extras")
+    if extras:
+        for key, extra in EXTRA_KEYS:
+            if key in extras:
+                extra_type = extra
+                break
+        penalty_runs = extras.get("penalty", 0)
+    runs = delivery["runs"]
+    wickets = delivery.get("wickets")
+    if not wickets:
+        return Ball(
+            striker=delivery["batter"],
+            non_striker=delivery["non_striker"],
+            bowler=delivery["bowler"],
+            batter_runs=runs["batter"],
+            extra_type=extra_type,
+            extra_runs=runs["extras"],
+            penalty_runs=penalty_runs,
+        )
+    wicket = wickets[0]
+    fielders = wicket.get("fielders")
+    return Ball(
+        striker=delivery["batter"],
+        non_striker=delivery["non_striker"],
+        bowler=delivery["bowler"],
+        batter_runs=runs["batter"],
+        extra_type=extra_type,
+        extra_runs=runs["extras"],
+        penalty_runs=penalty_runs,
+        player_out=wicket["player_out"],
+        how_out=HOW_OUTS.get(wicket["kind"], HowOut.OTHER),
+        fielder=fielders[0].get("name", "") if fielders else "",
+    )
+
+
+@lru_cache(maxsize=4)
+def open_archive(path: str) -> zipfile.ZipFile:
+    # kept open, so that each worker reads an archive's directory once
+    return zipfile.ZipFile(path)
+
+
+def read_bytes(source: Source) -> bytes:
+    if isinstance(source, tuple):
+        archive, member = source
+        return open_archive(archive).read(member)
+    return Path(source).read_bytes()
+
+
+def read(source: Source) -> dict[str, Any]:
+    return loads(read_bytes(source))
+
+
+def overs(innings: dict[str, Any]) -> Iterator[list[Ball]]:
+    for over in innings.get("overs", ()):
+        yield [to_ball(delivery) for delivery in over["deliveries"]]
+
+
+def balls(innings: dict[str, Any]) -> Iterator[Ball]:
+    for over in overs(innings):
+        yield from over
+
+
+def innings_overs(match: dict[str, Any]) -> Iterator[Iterator[list[Ball]]]:
+    for innings in match.get("innings", ()):
+        yield overs(innings)
+
+
+def innings_ledger(innings: dict[str, Any]) -> Ledger:
+    ledger = Ledger()
+    for over in innings.get("overs", ()):
+        number = over["over"]
+        for delivery in over["deliveries"]:
+            ledger.append(to_ball(delivery), number)
+    return ledger
+
+
+def score_ledger(ledger: Ledger, balls_per_over: int = 6) -> ScoreCard:
+    scorer = Scorer(undoable=False)
+    scorer.replay(ledger)
+    if scorer.card.ball >= balls_per_over:
+        scorer.over_bowled()
+    return scorer.card
+
+
+def load_ledgers(source: Source) -> ImportedMatch:
+    match = read(source)
+    return ImportedMatch(
+        source=source_name(source),
+        info=match.get("info", {}),
+        innings=[innings_ledger(innings) for innings in match.get("innings", ())],
+    )
+
+
+def to_cards(imported: ImportedMatch) -> ImportedMatch:
+    balls_per_over = imported.info.get("balls_per_over", 6)
+    imported.innings = [
+        score_ledger(ledger, balls_per_over) for ledger in imported.innings
+    ]
+    return imported
+
+
+def load(source: Source) -> ImportedMatch:
+    return to_cards(load_ledgers(source))
+
+
+def source_name(source: Source) -> str:
+    return "!".join(source) if isinstance(source, tuple) else str(source)
+
+
+def sources(path: str | Path) -> list[Source]:
+    path = Path(path)
+    if path.is_dir():
+        return sorted(str(p) for p in path.glob("*.json"))
+    with zipfile.ZipFile(path) as zf:
+        return [
+            (str(path), name)
+            for name in sorted(zf.namelist())
+            if name.endswith(".json")
+        ]
+
+
+def ingest(
+    path: str | Path,
+    processes: int | None = None,
+    ledgers: bool = False,
+    chunksize: int = 16,
+) -> Iterator[ImportedMatch]:
+    """
+    Load every match file in a directory or zip archive, in file name order.
+
+    Files are decoded and scored in a pool of `processes` workers (all CPUs if None, in this process if 0).
+    Score cards can't be pickled, so workers send back ledgers, which are scored here unless `ledgers` is set.
+    """
+    files = sources(path)
+    if processes == 0:
+        yield from map(load_ledgers if ledgers else load, files)
+        return
+    with ProcessPoolExecutor(processes or os.cpu_count()) as pool:
+        for imported in pool.map(load_ledgers, files, chunksize=chunksize):
+            yield imported if ledgers else to_cards(imported)
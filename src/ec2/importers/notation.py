@@ -0,0 +1,297 @@
+"""
+Scoring from a compact text notation, as piped to cli.py.
+
+Each line holds either a command or one or more deliveries separated by spaces:
+
+    striker NAME, non_striker NAME, bowler NAME     set the players; the bowler is needed again every over
+    in NAME                                         a new batter, at the end left empty by a dismissal
+    swap                                            the batters change ends
+    over                                            the over is done, and the batters change ends
+    innings                                         the innings is done
+    # ...                                           a comment
+
+A delivery is the runs off the bat, "." or 0 to 6, followed by any of:
+
+    extras      "1w", "2lb", "1b" or "4+1nb", the count including the wide or no-ball itself
+    penalty     "+5p"
+    dismissal   "/b", "/c:Fielder", "/lbw", "/st:Fielder", "/ro", "/ro:Fielder" or "/other", of the striker, or
+                "/ro-ns:Fielder" for the non-striker
+
+so "./b", "1lb", "4+1nb" and "1/ro-ns:Smith". A fielder's name runs to the end of the line. The batters change ends
+after an odd number of runs are run.
+
+Deliveries are written to a ledger as they are read, and only scored, through Scorer.update_ledger, when a score is
+to be reported: an over at a time for reports every over, otherwise an innings at a time.
+`transcript` goes the other way, from a ledger to notation.
+"""
+
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TextIO
+
+from ec2.scorebook import Extra, HowOut, Ledger, Scorer
+from ec2.scorebook.ledger import EXTRA_CODES, EXTRAS, HOW_OUT_CODES, HOW_OUTS
+
+REPORTS = ("over", "innings", "end")
+PLAYERS = ("striker", "non_striker", "bowler", "in")
+KNOWN_LINES = 4096
+DELIVERY = re.compile(
+    r"(?P<runs>\.|[0-6])?(?:\+?(?P<extra_runs>\d)(?P<extra>w|nb|lb|b))?(?:\+(?P<penalty>\d+)p)?"
+    r"(?:/(?P<how_out>b|c|lbw|st|ro|other)(?P<non_striker>-ns)?(?::(?P<fielder>.+))?)?"
+)
+
+
+@lru_cache(maxsize=1024)
+def delivery(token: str) -> tuple[int, int, int, int, int, bool, str, int]:
+    """
+    The batter's runs, extra code and runs, penalty runs, how-out code, whether the non-striker is out, the fielder
+    and the runs run for a delivery token.
+    """
+    match = DELIVERY.fullmatch(token)
+    if not match:
+        raise ValueError(f"not a delivery: {token!r}")
+    runs = int(match["runs"]) if match["runs"] not in (None, ".") else 0
+    extra = Extra(match["extra"] or "")
+    extra_runs = int(match["extra_runs"] or 0)
+    if extra != Extra.NO_EXTRA and extra_runs == 0:
+        raise ValueError(f"no runs for the extra in {token!r}")
+    if runs and extra in (Extra.BYE, Extra.LEGBYE, Extra.WIDE):
+        raise ValueError(f"runs off the bat with {extra.name.lower()}s in {token!r}")
+    how_out = HowOut(match["how_out"] or HowOut.NOTOUT)
+    if match["non_striker"] and how_out != HowOut.RUN_OUT:
+        raise ValueError(f"only a run out can dismiss the non-striker in {token!r}")
+    ran = runs + extra_runs - (extra in (Extra.WIDE, Extra.NOBALL))
+    return (
+        runs,
+        EXTRA_CODES[extra],
+        extra_runs,
+        int(match["penalty"] or 0),
+        HOW_OUT_CODES[how_out],
+        bool(match["non_striker"]),
+        match["fielder"] or "",
+        ran,
+    )
+
+
+@dataclass
+class Reader:
+    """
+    Scores innings from lines of notation, writing each innings' score to `out` at the end of every over, every
+    innings or only once everything has been read, as `report` says.
+    """
+
+    report: str = "innings"
+    out: TextIO | None = None
+    scorers: list[Scorer] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if self.report not in REPORTS:
+            raise ValueError(f"unknown report {self.report!r}")
+        self.line = 0
+        self.known: dict[str, tuple] = {}
+        self.start_innings()
+
+    def start_innings(self) -> None:
+        self.scorers.append(Scorer(undoable=False))
+        # formatted once the innings is done, as Scorer.replay does
+        self.scorer.card.history.enabled = False
+        self.ledger = Ledger()
+        # ledger ids of the batters at each end and the bowler, 0 while there's none
+        self.striker = self.non_striker = self.bowler = 0
+        self.over = 0
+        self.scored = 0
+
+    @property
+    def scorer(self) -> Scorer:
+        return self.scorers[-1]
+
+    def read(self, lines: Iterable[str]) -> "Reader":
+        # lines holding a single delivery, as read, and what it parsed to
+        known = self.known
+        for number, text in enumerate(lines, self.line + 1):
+            self.line = number
+            parsed = known.get(text)
+            if parsed is not None:
+                self.deliver(parsed)
+                continue
+            words = text.split(None, 1)
+            if not words or words[0].startswith("#"):
+                continue
+            if not words[0][0].isdigit() and words[0][0] not in "./+":
+                self.command(words[0], words[1].strip() if len(words) > 1 else "")
+                continue
+            tokens = text.split()
+            if ":" in text:
+                # the fielder's name runs to the end of the line
+                before, fielder = text.split(":", 1)
+                tokens = before.split()
+                tokens[-1] += f":{fielder.strip()}"
+            for token in tokens:
+                try:
+                    parsed = delivery(token)
+                except ValueError as error:
+                    raise self.error(str(error)) from None
+                self.deliver(parsed)
+            if len(tokens) == 1 and len(known) < KNOWN_LINES:
+                known[text] = parsed
+        return self
+
+    def deliver(self, parsed: tuple[int, int, int, int, int, bool, str, int]) -> None:
+        (
+            runs,
+            extra_type,
+            extra_runs,
+            penalty_runs,
+            how_out,
+            non_striker,
+            fielder,
+            ran,
+        ) = parsed
+        striker = self.striker
+        if not (striker and self.non_striker and self.bowler):
+            raise self.error("a delivery with no striker, non-striker or bowler")
+        ledger = self.ledger
+        ledger.striker.append(striker)
+        ledger.non_striker.append(self.non_striker)
+        ledger.bowler.append(self.bowler)
+        ledger.batter_runs.append(runs)
+        ledger.extra_type.append(extra_type)
+        ledger.extra_runs.append(extra_runs)
+        ledger.penalty_runs.append(penalty_runs)
+        ledger.how_out.append(how_out)
+        ledger.over.append(self.over)
+        if not how_out:
+            ledger.player_out.append(0)
+            ledger.fielder.append(0)
+            if ran % 2:
+                self.striker, self.non_striker = self.non_striker, striker
+            return
+        out = self.non_striker if non_striker else striker
+        ledger.player_out.append(out)
+        ledger.fielder.append(ledger.intern(fielder) if fielder else 0)
+        if ran % 2:
+            self.striker, self.non_striker = self.non_striker, self.striker
+        if out == self.striker:
+            self.striker = 0
+        else:
+            self.non_striker = 0
+
+    def command(self, name: str, argument: str) -> None:
+        if name in PLAYERS:
+            if not argument:
+                raise self.error(f"{name} needs a player's name")
+            player = self.ledger.intern(argument)
+            if name == "in":
+                if self.striker and self.non_striker:
+                    raise self.error(f"{argument} can't come in with both batters in")
+                name = "non_striker" if self.striker else "striker"
+            setattr(self, name, player)
+            return
+        match name:
+            case "swap":
+                self.striker, self.non_striker = self.non_striker, self.striker
+            case "over":
+                self.over += 1
+                self.striker, self.non_striker = self.non_striker, self.striker
+                self.bowler = 0
+                if self.report == "over":
+                    self.score()
+                    self.write(len(self.scorers) - 1)
+            case "innings":
+                self.end_innings()
+                self.start_innings()
+            case _:
+                raise self.error(f"unknown command {name!r}")
+
+    def score(self) -> None:
+        """Score everything read since last time, in one batch."""
+        self.scorer.update_ledger(self.ledger, self.scored)
+        self.scored = len(self.ledger)
+        while self.scorer.card.over < self.over:
+            self.scorer.bowl_over()
+
+    def end_innings(self) -> None:
+        pending = len(self.ledger) > self.scored
+        self.score()
+        self.scorer.card.history.enabled = True
+        self.scorer.card.history.refill()
+        if self.report == "innings" or self.report == "over" and pending:
+            self.write(len(self.scorers) - 1)
+
+    def close(self) -> list[Scorer]:
+        """Score what's left, write the outstanding reports and drop an innings that was never started."""
+        if not len(self.ledger) and len(self.scorers) > 1:
+            self.scorers.pop()
+        else:
+            self.end_innings()
+        if self.report == "end":
+            for innings in range(len(self.scorers)):
+                self.write(innings)
+        return self.scorers
+
+    def write(self, innings: int) -> None:
+        if self.out is not None:
+            self.out.write(f"{innings + 1} {self.scorers[innings].card.score}\n")
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"line {self.line}: {message}")
+
+
+def token(ledger: Ledger, index: int) -> str:
+    """The notation for the delivery at `index` in a ledger."""
+    runs = ledger.batter_runs[index]
+    extra = EXTRAS[ledger.extra_type[index]]
+    text = str(runs) if runs or extra == Extra.NO_EXTRA else ""
+    if text == "0":
+        text = "."
+    if extra != Extra.NO_EXTRA:
+        text += f"{'+' if text else ''}{ledger.extra_runs[index]}{extra}"
+    if ledger.penalty_runs[index]:
+        text += f"+{ledger.penalty_runs[index]}p"
+    if ledger.player_out[index]:
+        text += f"/{HOW_OUTS[ledger.how_out[index]]}"
+        if ledger.player_out[index] == ledger.non_striker[index]:
+            text += "-ns"
+        if ledger.fielder[index]:
+            text += f":{ledger.names[ledger.fielder[index]]}"
+    return text
+
+
+def transcript(ledger: Ledger) -> Iterator[str]:
+    """Lines of notation for an innings' ledger, naming the players whenever Reader would have them wrong."""
+    names = ledger.names
+    striker = non_striker = bowler = 0
+    over = ledger.over[0] if len(ledger) else 0
+    for index in range(len(ledger)):
+        for _ in range(ledger.over[index] - over):
+            yield "over"
+            striker, non_striker, bowler = non_striker, striker, 0
+        over = ledger.over[index]
+        if (
+            ledger.striker[index] == non_striker
+            and ledger.non_striker[index] == striker
+        ):
+            yield "swap"
+            striker, non_striker = non_striker, striker
+        for command, player in (
+            ("striker", striker),
+            ("non_striker", non_striker),
+            ("bowler", bowler),
+        ):
+            if getattr(ledger, command)[index] != player:
+                yield f"{command} {names[getattr(ledger, command)[index]]}"
+        striker, non_striker, bowler = (
+            ledger.striker[index],
+            ledger.non_striker[index],
+            ledger.bowler[index],
+        )
+        text = token(ledger, index)
+        yield text
+        if delivery(text)[-1] % 2:
+            striker, non_striker = non_striker, striker
+        if ledger.player_out[index] == striker:
+            striker = 0
+        elif ledger.player_out[index] == non_striker:
+            non_striker = 0
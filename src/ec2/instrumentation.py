@@ -0,0 +1,272 @@
+"""
+Opt-in instrumentation of the scoring and rendering hot paths.
+
+Nothing is measured until `Instrumentation.enable`, which wraps the methods named in HOOKS on their classes (and the
+`html` properties of batters and bowlers) and `disable` puts the originals back, so while it's off there's no cost at
+all and the scorebook's API is unchanged either way. Enabled, it keeps:
+
+    histograms      latency per call of each hook: ball applied, card rendered, frame drawn and so on
+    counters        balls scored, html property evaluations and how many of them were cache hits, player renders
+    allocations     with `enable(allocations=True)`, the lines under ec2 allocating most, sampled by tracemalloc
+
+`report()` gives all of it as a dict, `dump(path)` writes that as JSON and `start_reporting(path, interval)` dumps
+it every `interval` seconds from a background thread. Hooks into modules not yet imported, such as the NiceGUI
+views, are left out, so enable after importing what's to be measured.
+"""
+
+import functools
+import importlib
+import json
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from datetime import UTC, datetime
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any
+
+# "module:Class.attribute" or "module:function" -> the histogram its calls are timed in
+HOOKS = {
+    "ec2.scorebook.scorer:Scorer.update": "ball applied",
+    "ec2.scorebook.scorer:Scorer.update_many": "balls applied",
+    "ec2.scorebook.scorer:Scorer.update_ledger": "ledger applied",
+    "ec2.scorebook.scorer:Scorer.undo": "ball undone",
+    "ec2.scorebook.batter:Batter.render": "batter rendered",
+    "ec2.scorebook.bowler:Bowler.render": "bowler rendered",
+    "ec2.ui.display:InningsCard.refresh": "card rendered",
+    "ec2.live.scoring:ScoringQueue.render": "frame drawn",
+    "ec2.scorebook.score_card:ScoreCard.to_json": "snapshot serialized",
+    "ec2.scorebook.snapshot:to_json": "snapshot serialized",
+    "ec2.scorebook.snapshot:dumps": "snapshot serialized",
+    "ec2.scorebook.delta:Delta.snapshot": "delta built",
+}
+# the cached html of each kind of player, counted as evaluations and cache hits
+HTML_PROPERTIES = (
+    "ec2.scorebook.batter:Batter.html",
+    "ec2.scorebook.bowler:Bowler.html",
+)
+ALLOCATION_SITES = 10
+MISSING = object()
+
+
+class Histogram:
+    """Latencies in power-of-two buckets of nanoseconds: cheap to record, and percentiles good to a factor of two."""
+
+    __slots__ = ("buckets", "count", "max", "total")
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.buckets = [0] * 64
+        self.count = self.total = self.max = 0
+
+    def record(self, nanoseconds: int) -> None:
+        self.buckets[nanoseconds.bit_length()] += 1
+        self.count += 1
+        self.total += nanoseconds
+        self.max = max(self.max, nanoseconds)
+
+    def percentile(self, fraction: float) -> int:
+        """The upper bound, in nanoseconds, of the bucket holding the given fraction of the calls."""
+        wanted = fraction * self.count
+        seen = 0
+        for bits, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= wanted:
+                return min((1 << bits) - 1, self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_us": self.total / self.count / 1000 if self.count else 0.0,
+            "p50_us": self.percentile(0.5) / 1000,
+            "p90_us": self.percentile(0.9) / 1000,
+            "p99_us": self.percentile(0.99) / 1000,
+            "max_us": self.max / 1000,
+        }
+
+
+class Instrumentation:
+    def __init__(self) -> None:
+        self.histograms: dict[str, Histogram] = {}
+        self.counters: Counter[str] = Counter()
+        # held while counting, so the reporter thread copies the counters whole rather than mid-update
+        self.counting = threading.Lock()
+        # (owner, attribute, what owner.__dict__ held before) for each hook installed, to put back
+        self.patched: list[tuple[Any, str, Any]] = []
+        self.tracing = False
+        self.scoring = 0  # scoring calls in progress: update_ledger and update_many may call the others
+        self.reporter: threading.Thread | None = None
+        self.stopping = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.patched)
+
+    def enable(self, allocations: bool = False, frames: int = 1) -> "Instrumentation":
+        if not self.enabled:
+            for target, name in HOOKS.items():
+                self.hook(
+                    target, lambda original, name=name: self.timed(original, name)
+                )
+            for target in HTML_PROPERTIES:
+                self.hook(target, self.counted)
+        if allocations and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self.tracing = True
+        return self
+
+    def disable(self) -> None:
+        while self.patched:
+            owner, attribute, before = self.patched.pop()
+            if before is MISSING:
+                delattr(owner, attribute)
+            else:
+                setattr(owner, attribute, before)
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+
+    def reset(self) -> None:
+        # the hooks installed hold on to their histograms, so they're emptied rather than replaced
+        for histogram in self.histograms.values():
+            histogram.clear()
+        with self.counting:
+            self.counters.clear()
+        if self.tracing:
+            tracemalloc.clear_traces()
+
+    def hook(self, target: str, wrap) -> None:
+        module_name, path = target.split(":")
+        if module_name not in sys.modules and module_name.startswith("ec2.ui"):
+            return  # not importing NiceGUI for the sake of measuring it
+        owner = importlib.import_module(module_name)
+        *classes, attribute = path.split(".")
+        for name in classes:
+            owner = getattr(owner, name)
+        before = vars(owner).get(attribute, MISSING)
+        original = getattr(owner, attribute) if before is MISSING else before
+        if isinstance(original, classmethod):
+            wrapped = classmethod(wrap(original.__func__))
+        elif isinstance(original, property):
+            wrapped = property(
+                wrap(original.fget), original.fset, original.fdel, original.__doc__
+            )
+        else:
+            wrapped = wrap(original)
+        setattr(owner, attribute, wrapped)
+        self.patched.append((owner, attribute, before))
+
+    def timed(self, original, name: str):
+        histogram = self.histograms.setdefault(name, Histogram())
+        counters, counting = self.counters, self.counting
+        scoring = name in ("ball applied", "balls applied", "ledger applied")
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            if scoring:
+                before = len(args[0].card.ledger)
+                self.scoring += 1
+            start = perf_counter_ns()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                histogram.record(perf_counter_ns() - start)
+                if scoring:
+                    self.scoring -= 1
+                    if not self.scoring:
+                        with counting:
+                            counters["balls"] += len(args[0].card.ledger) - before
+                elif name.endswith(" rendered") and name != "card rendered":
+                    with counting:
+                        counters["player renders"] += 1
+
+        return timed
+
+    def counted(self, getter):
+        counters, counting = self.counters, self.counting
+
+        @functools.wraps(getter)
+        def counted(player):
+            with counting:
+                counters["html evaluations"] += 1
+                if (
+                    player.rendered is not None
+                    and player.rendered[0] == player.revision
+                ):
+                    counters["html cache hits"] += 1
+            return getter(player)
+
+        return counted
+
+    def allocations(self, limit: int = ALLOCATION_SITES) -> list[dict[str, Any]]:
+        """The lines in ec2 holding the most memory allocated since tracing started, largest first."""
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(True, "*/ec2/*")]
+        )
+        return [
+            {
+                "where": str(stat.traceback[0]),
+                "kib": round(stat.size / 1024, 1),
+                "blocks": stat.count,
+            }
+            for stat in snapshot.statistics("lineno")[:limit]
+        ]
+
+    def report(self) -> dict[str, Any]:
+        with self.counting:
+            counters = dict(self.counters)
+        report = {
+            "created": datetime.now(UTC).isoformat(timespec="seconds"),
+            "enabled": self.enabled,
+            "histograms": {
+                name: histogram.summary()
+                for name, histogram in self.histograms.items()
+                if histogram.count
+            },
+            "counters": counters,
+        }
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            report["traced_kib"] = {
+                "current": round(current / 1024, 1),
+                "peak": round(peak / 1024, 1),
+            }
+            report["allocations"] = self.allocations()
+        return report
+
+    def dump(self, path: str | Path) -> None:
+        # written alongside then renamed, so a reader never sees half a report
+        path = Path(path)
+        partial = path.with_name(path.name + ".partial")
+        partial.write_text(json.dumps(self.report(), indent=2))
+        partial.replace(path)
+
+    def start_reporting(self, path: str | Path, interval: float = 10.0) -> None:
+        """Dump a report to `path` every `interval` seconds, and once more on stop_reporting."""
+        self.stop_reporting()
+        self.stopping.clear()
+
+        def run() -> None:
+            while not self.stopping.wait(interval):
+                self.dump(path)
+            self.dump(path)
+
+        self.reporter = threading.Thread(
+            target=run, name="ec2-instrumentation", daemon=True
+        )
+        self.reporter.start()
+
+    def stop_reporting(self) -> None:
+        if self.reporter is not None:
+            self.stopping.set()
+            self.reporter.join()
+            self.reporter = None
+
+
+instruments = Instrumentation()
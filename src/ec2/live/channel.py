@@ -0,0 +1,43 @@
+"""
+Fan-out of messages from one publisher to many asyncio subscribers.
+
+Each subscriber has its own bounded queue, so a slow spectator only ever falls behind itself: when its queue is full
+the oldest message is dropped to make room.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+
+class Channel:
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self.subscribers: set[asyncio.Queue] = set()
+
+    def subscribe(self, *initial: Any) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(self.maxsize)
+        for message in initial:
+            queue.put_nowait(message)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+
+    def publish(self, message: Any) -> None:
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    async def listen(self, *initial: Any) -> AsyncIterator[Any]:
+        queue = self.subscribe(*initial)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.unsubscribe(queue)
+
+    def __len__(self) -> int:
+        return len(self.subscribers)
@@ -0,0 +1,214 @@
+"""
+The matches being scored by one server process, each with its own scorers, journal and spectator channel.
+"""
+
+import logging
+import re
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ec2.scorebook import Ball, Delta, Scorer
+from ec2.scorebook.scorer import Entry
+from ec2.storage.journal import Event, Journal, encode, recover
+
+from .channel import Channel
+from .scoring import FRAME_RATE, ScoringQueue
+
+MATCH_ID = re.compile(r"[A-Za-z0-9_-]{1,64}")
+# overs a side by format; an innings in any other, such as a Test, isn't limited
+OVERS = {"T20": 20, "ODI": 50}
+EVENTS = {event: encode(event) for event in Event}
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class Match:
+    match_id: str
+    scorers: list[Scorer] = field(default_factory=lambda: [Scorer(), Scorer()])
+    innings: int = 0  # the innings in progress
+    journal: Journal | None = None
+    channel: Channel = field(default_factory=Channel)
+    # how often the scoring page redraws at most, however fast events come through `scoring`
+    frame_rate: float = FRAME_RATE
+    # limits each innings to its OVERS, which with the target gives the required run rate
+    format: str = "T20"
+
+    def __post_init__(self) -> None:
+        for scorer in self.scorers:
+            analytics = scorer.card.analytics
+            analytics.balls_limit = OVERS.get(self.format, 0) * analytics.balls_per_over
+        self.set_target()
+        self.scoring = ScoringQueue(self, self.frame_rate)
+
+    @classmethod
+    def open(
+        cls,
+        match_id: str,
+        path: str | Path,
+        frame_rate: float = FRAME_RATE,
+        format: str = "T20",
+    ) -> "Match":
+        recovered = recover(path)
+        return cls(
+            match_id,
+            recovered.scorers,
+            recovered.innings,
+            Journal(path),
+            frame_rate=frame_rate,
+            format=format,
+        )
+
+    @property
+    def scorer(self) -> Scorer:
+        return self.scorers[self.innings]
+
+    def update(self, ball: Ball) -> None:
+        # encoded first, so that a ball the journal can't hold is refused before it changes the card
+        data = encode(ball)
+        self.record(data, self.scorer.update(ball))
+
+    def over_bowled(self) -> None:
+        self.record(EVENTS[Event.OVER_BOWLED], self.scorer.over_bowled())
+
+    def innings_closed(self) -> None:
+        self.innings = min(self.innings + 1, len(self.scorers) - 1)
+        self.set_target()
+        self.record(EVENTS[Event.INNINGS_CLOSED], Delta.snapshot(self.scorer.card))
+
+    def undo(self) -> Entry | None:
+        entry = self.scorer.undo()
+        if entry is not None:
+            self.record(
+                EVENTS[Event.UNDO],
+                self.scorer.changes(entry.ball, len(self.scorer.card.history)),
+            )
+        return entry
+
+    def redo(self) -> Entry | None:
+        history = len(self.scorer.card.history)
+        entry = self.scorer.redo()
+        if entry is not None:
+            self.record(EVENTS[Event.REDO], self.scorer.changes(entry.ball, history))
+        return entry
+
+    def set_target(self) -> None:
+        if self.innings:
+            self.scorer.card.analytics.target = (
+                self.scorers[self.innings - 1].card.runs + 1
+            )
+
+    def record(self, data: bytes, delta: Delta) -> None:
+        if self.journal:
+            self.journal.write(data)
+        # encoded once here and shared by every subscriber
+        if self.channel:
+            self.channel.publish(self.message(self.innings, delta))
+
+    def message(self, innings: int, delta: Delta) -> dict[str, Any]:
+        # with each player's cached html, so that spectators needn't render rows themselves
+        card = self.scorers[innings].card
+        data = delta.to_dict()
+        data["batters"] = [
+            row | {"html": card.batting_order.batter(row["position"]).html}
+            for row in delta.batters
+        ]
+        data["bowlers"] = [
+            row | {"html": card.bowling_order.bowler(row["position"]).html}
+            for row in delta.bowlers
+        ]
+        return {"innings": innings, "current": self.innings, "delta": data}
+
+    def snapshot(self, innings: int) -> dict[str, Any]:
+        return self.message(innings, Delta.snapshot(self.scorers[innings].card))
+
+    def state(self) -> list[dict[str, Any]]:
+        return [self.snapshot(innings) for innings in range(len(self.scorers))]
+
+    async def follow(self) -> AsyncIterator[dict[str, Any]]:
+        """
+        A full snapshot of each innings, then a delta per event. A subscriber that fell behind and lost deltas is sent a
+        fresh snapshot of the innings instead, and deltas it already covers are skipped.
+        """
+        revisions: dict[int, int] = {}
+        async for message in self.channel.listen(*self.state()):
+            innings = message["innings"]
+            delta = message["delta"]
+            revision = revisions.get(innings, -1)
+            if delta["full"] or delta["revision"] == revision + 1:
+                revisions[innings] = delta["revision"]
+                yield message
+            elif delta["revision"] > revision:
+                message = self.snapshot(innings)
+                revisions[innings] = message["delta"]["revision"]
+                yield message
+
+    def close(self) -> None:
+        self.scoring.close()
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+
+
+class MatchRegistry:
+    """
+    Matches by id, journalled to `directory` when one is given and recovered from it on start-up, and all played to
+    `format`.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        frame_rate: float = FRAME_RATE,
+        format: str = "T20",
+    ):
+        self.directory = Path(directory) if directory else None
+        self.frame_rate = frame_rate
+        self.format = format
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.matches: dict[str, Match] = {}
+
+    def open(self, match_id: str) -> Match:
+        if not MATCH_ID.fullmatch(match_id):
+            raise ValueError(f"invalid match id {match_id!r}")
+        match = self.matches.get(match_id)
+        if match is None:
+            if self.directory:
+                match = Match.open(
+                    match_id,
+                    self.directory / f"{match_id}.journal",
+                    self.frame_rate,
+                    self.format,
+                )
+            else:
+                match = Match(match_id, frame_rate=self.frame_rate, format=self.format)
+            self.matches[match_id] = match
+        return match
+
+    def recover(self) -> None:
+        # a file that only has the name of a journal is skipped, rather than keeping the server from starting
+        if self.directory:
+            for path in sorted(self.directory.glob("*.journal")):
+                try:
+                    self.open(path.stem)
+                except ValueError as e:
+                    log.warning("not recovering %s: %s", path, e)
+
+    def close(self) -> None:
+        for match in self.matches.values():
+            match.close()
+
+    def __getitem__(self, match_id: str) -> Match:
+        return self.matches[match_id]
+
+    def __contains__(self, match_id: object) -> bool:
+        return match_id in self.matches
+
+    def __iter__(self) -> Iterator[Match]:
+        return iter(self.matches.values())
+
+    def __len__(self) -> int:
+        return len(self.matches)
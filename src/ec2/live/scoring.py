@@ -0,0 +1,151 @@
+"""
+A match's scoring events, applied in order by one consumer task and drawn at most once a display frame.
+
+Scoring input, whether a click handler or a replayed feed, only puts its event on the queue. The consumer applies
+every event waiting through the Match, so the scorer, journal and spectators see each one in turn, then calls the
+renderers once for all of them, and no sooner than a frame after they last ran: a burst of taps costs one redraw
+rather than one each. `close()` applies and draws whatever is left before the consumer stops, and `report()` gives the
+queue depth and how long events waited to be drawn.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any
+
+from ec2.instrumentation import Histogram
+from ec2.scorebook import Ball
+from ec2.storage.journal import Event, Record
+
+if TYPE_CHECKING:
+    from .registry import Match
+
+FRAME_RATE = 20.0
+
+# an event, and what applying it returned (the entry undone or redone) or the exception it raised
+Applied = tuple[Record, Any]
+Renderer = Callable[[list[Applied]], None]
+# queued by close() to end a consumer waiting for events
+STOP = None
+
+log = logging.getLogger(__name__)
+
+
+class ScoringQueue:
+    def __init__(self, match: "Match", frame_rate: float = FRAME_RATE):
+        self.match = match
+        self.frame = 1 / frame_rate
+        self.queue: asyncio.Queue[tuple[Record | None, int]] = asyncio.Queue()
+        self.renderers: list[Renderer] = []
+        self.task: asyncio.Task | None = None
+        # the batch for the next frame: events taken off the queue, with the time each was queued, and what applying
+        # them gave; held here rather than by the consumer so that close() can finish it
+        self.waiting: list[tuple[Record, int]] = []
+        self.batch: list[Applied] = []
+        self.stopping = False
+        self.drawn = float("-inf")  # event loop time of the last frame
+        # from an event being queued to the frame that drew it
+        self.lag = Histogram()
+        self.applied = self.frames = self.errors = 0
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def put(self, event: Record) -> None:
+        """Queue an event, from the event loop, starting the consumer if it isn't running."""
+        self.queue.put_nowait((event, perf_counter_ns()))
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(
+                self.run(), name=f"score {self.match.match_id}"
+            )
+
+    async def join(self) -> None:
+        """Wait until everything queued so far has been applied and drawn."""
+        await self.queue.join()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self.stopping:
+            self.take(await self.queue.get())
+            # what comes in before the frame is due is applied now and drawn with it
+            while self.waiting:
+                while not self.queue.empty():
+                    self.take(self.queue.get_nowait())
+                delay = self.drawn + self.frame - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    self.draw()
+                    self.drawn = loop.time()
+
+    def take(self, item: tuple[Record | None, int]) -> None:
+        if item[0] is STOP:
+            self.queue.task_done()
+        else:
+            self.waiting.append(item)
+            self.batch.append(self.apply(item[0]))
+
+    def draw(self) -> None:
+        if not self.waiting:
+            return
+        self.render(self.batch)
+        drawn = perf_counter_ns()
+        for _, queued in self.waiting:
+            self.lag.record(drawn - queued)
+            self.queue.task_done()
+        self.waiting, self.batch = [], []
+
+    def apply(self, event: Record) -> Applied:
+        # a bad event is logged and passed on to the renderers to report, rather than stopping the ones after it
+        self.applied += 1
+        try:
+            if isinstance(event, Ball):
+                return event, self.match.update(event)
+            actions = {
+                Event.OVER_BOWLED: self.match.over_bowled,
+                Event.INNINGS_CLOSED: self.match.innings_closed,
+                Event.UNDO: self.match.undo,
+                Event.REDO: self.match.redo,
+            }
+            return event, actions[event]()
+        except Exception as e:
+            log.exception("%s: applying %r failed", self.match.match_id, event)
+            self.errors += 1
+            return event, e
+
+    def render(self, applied: list[Applied]) -> None:
+        self.frames += 1
+        for renderer in list(self.renderers):
+            try:
+                renderer(applied)
+            except Exception:
+                log.exception("%s: renderer %r failed", self.match.match_id, renderer)
+                self.errors += 1
+
+    def close(self) -> None:
+        """
+        Stop the consumer, first applying whatever is still queued and drawing it with the batch the consumer holds, so
+        that nothing is lost or left unfinished for join(). A consumer waiting out a frame then finds its batch drawn,
+        and one waiting for events is sent STOP; either ends the next time the loop runs it.
+
+        Synchronous, for NiceGUI's on_shutdown, which only schedules coroutines without waiting for them.
+        """
+        self.stopping = True
+        idle = not self.waiting
+        while not self.queue.empty():
+            self.take(self.queue.get_nowait())
+        self.draw()
+        if idle and self.task is not None and not self.task.done():
+            self.queue.put_nowait((STOP, perf_counter_ns()))
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "applied": self.applied,
+            "frames": self.frames,
+            "errors": self.errors,
+            "frame_rate": 1 / self.frame,
+            "render_lag": self.lag.summary(),
+        }
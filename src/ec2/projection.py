@@ -0,0 +1,327 @@
+"""
+Projected totals and chase win probabilities from a live ScoreCard, by Monte Carlo simulation in NumPy.
+
+A Model is fitted for each format from historical deliveries. Every ball is classed by its runs (7 or more as 7),
+whether it was legal and whether a wicket fell, and the classes counted for each over of the innings and number of
+wickets down, smoothed towards the same over at any wickets. An over is six legal balls, each after any number of
+wides and no-balls, so the distribution of the runs and wickets an over brings is the sixth power of one such step,
+taken for every over and wickets down at once with a 2-D FFT over (runs, wickets). Wickets falling partway through an
+over use the rates of the wickets down at its start, and runs after a tenth wicket in the same over are kept.
+
+`Projector.project` then plays out the rest of the innings an over at a time for every simulation together, drawing
+each over from its distribution with a guide table, so a step costs a handful of array gathers whatever the number of
+outcomes. The recent run rate nudges the runs of each simulated over towards the current form by FORM_WEIGHT.
+
+numpy is only needed here: `pip install ec2[projection]`.
+"""
+
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from ec2.scorebook import Ledger, ScoreCard
+from ec2.scorebook.ledger import BOWLER_EXTRA_CODES
+
+# the overs of an innings in each format
+FORMATS = {"T20": 20, "ODI": 50}
+WICKETS = 10
+# ball classes: runs 0 to 7+, by legal or not, by wicket or not
+BALL_RUNS = 8
+CLASSES = BALL_RUNS * 4
+# over outcomes: runs by wickets, wickets the faster-varying so that an outcome's index is runs * OVER_WICKETS + wickets
+OVER_RUNS = 64
+OVER_WICKETS = 16
+OUTCOMES = OVER_RUNS * OVER_WICKETS
+# outcome tables have a row for each wickets down, and one more with nothing to come once all out
+ROWS = WICKETS + 1
+# deliveries' worth of the same over at any wickets added to each (over, wickets) before normalising
+PRIOR = 30.0
+# how far the runs of each simulated over move towards the recent run rate, and the bounds on that scaling
+FORM_WEIGHT = 0.35
+FORM_LIMITS = (0.6, 1.6)
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+# steps walked on from a guide table before searching instead
+WALK = 2
+
+
+def ball_classes(ledger: Ledger, overs: int) -> np.ndarray:
+    """Each ball's index into a flattened (over, wickets down, class) array, for the balls of the first `overs`."""
+    over = np.frombuffer(ledger.over, np.uint16).astype(np.intp)
+    out = np.frombuffer(ledger.player_out, np.uint16) != 0
+    wickets = np.cumsum(out) - out
+    runs = (
+        np.frombuffer(ledger.batter_runs, np.uint8).astype(np.intp)
+        + np.frombuffer(ledger.extra_runs, np.uint8)
+        + np.frombuffer(ledger.penalty_runs, np.uint8)
+    )
+    legal = ~np.isin(
+        np.frombuffer(ledger.extra_type, np.uint8), list(BOWLER_EXTRA_CODES)
+    )
+    classes = np.minimum(runs, BALL_RUNS - 1) * 4 + legal * 2 + out
+    keep = (over < overs) & (wickets < WICKETS)
+    return (over[keep] * WICKETS + wickets[keep]) * CLASSES + classes[keep]
+
+
+def count_ledgers(ledgers: Iterable[Ledger], overs: int) -> np.ndarray:
+    """Ball classes counted by over and wickets down, from the ledgers of whole innings."""
+    indices = [ball_classes(ledger, overs) for ledger in ledgers if len(ledger)]
+    flat = np.concatenate(indices) if indices else np.zeros(0, np.intp)
+    return (
+        np.bincount(flat, minlength=overs * WICKETS * CLASSES)
+        .reshape(overs, WICKETS, CLASSES)
+        .astype(float)
+    )
+
+
+def count_warehouse(warehouse, format: str, overs: int) -> np.ndarray:
+    """As count_ledgers, for the first two innings of every match of a format in a statistics Warehouse."""
+    bowler_extras = ", ".join(map(str, sorted(BOWLER_EXTRA_CODES)))
+    rows = warehouse.connection.execute(
+        f"""
+        SELECT over, wickets,
+            min(batter_runs + extra_runs + penalty_runs, {BALL_RUNS - 1}) * 4
+            + (extra_type NOT IN ({bowler_extras})) * 2 + (player_out != 0) AS class,
+            count(*)
+        FROM (
+            SELECT d.*, sum(player_out != 0) OVER (PARTITION BY match, innings ORDER BY ball) - (player_out != 0)
+                AS wickets
+            FROM deliveries AS d JOIN matches AS m ON m.id = d.match WHERE m.format = ? AND d.innings < 2
+        )
+        WHERE over < ? AND wickets < {WICKETS}
+        GROUP BY over, wickets, class
+        """,
+        (format, overs),
+    ).fetchall()
+    counts = np.zeros((overs, WICKETS, CLASSES))
+    if rows:
+        over, wickets, classes, count = np.array(rows, dtype=np.intp).T
+        counts[over, wickets, classes] = count
+    return counts
+
+
+@dataclass
+class Model:
+    """For each over and wickets down, the guide tables to draw the over's outcome from."""
+
+    format: str
+    counts: np.ndarray = field(repr=False)
+
+    def __post_init__(self) -> None:
+        self.overs = len(self.counts)
+        if not self.counts.sum():
+            raise ValueError(f"no {self.format} deliveries to fit")
+        self.balls = self.smoothed()
+        self.steps = self.legal_steps(self.balls)
+        outcomes = np.zeros((self.overs, ROWS, OUTCOMES))
+        outcomes[:, :WICKETS] = over_outcomes(self.steps, 6).reshape(
+            self.overs, WICKETS, OUTCOMES
+        )
+        outcomes[:, WICKETS, 0] = 1.0
+        self.tables = guide_tables(outcomes.reshape(-1, OUTCOMES))
+        # runs per legal ball of each over, to judge the recent run rate by
+        classes = np.arange(CLASSES)
+        runs = (self.balls * (classes // 4)).sum(axis=2)
+        legal = (self.balls * ((classes // 2) % 2)).sum(axis=2)
+        self.run_rate = (runs / legal).mean(axis=1)
+
+    def smoothed(self) -> np.ndarray:
+        """Per-ball class probabilities by over and wickets down, shrunk towards the over's and then the format's."""
+        overall = self.counts.sum(axis=(0, 1))
+        overall /= overall.sum()
+        by_over = self.counts.sum(axis=1) + PRIOR * overall
+        by_over /= by_over.sum(axis=1, keepdims=True)
+        balls = self.counts + PRIOR * by_over[:, None, :]
+        return balls / balls.sum(axis=2, keepdims=True)
+
+    @staticmethod
+    def legal_steps(balls: np.ndarray) -> np.ndarray:
+        """The spectrum of one legal ball and the wides and no-balls before it, over the (runs, wickets) grid."""
+        classes = np.arange(CLASSES)
+        runs, legal, wicket = classes // 4, (classes // 2) % 2, classes % 2
+        grids = np.zeros((2, *balls.shape[:2], OVER_RUNS, OVER_WICKETS))
+        np.add.at(
+            grids,
+            (legal, slice(None), slice(None), runs, wicket),
+            np.moveaxis(balls, 2, 0),
+        )
+        illegal, legal_balls = np.fft.rfft2(grids[0]), np.fft.rfft2(grids[1])
+        return legal_balls / (1 - illegal)
+
+    def partial_over(
+        self, over: int, wickets: int, balls: int
+    ) -> tuple[np.ndarray, ...]:
+        """The guide tables of the last `balls` legal balls of an over."""
+        return guide_tables(
+            over_outcomes(self.steps[over, wickets][None], balls).reshape(1, OUTCOMES)
+        )
+
+
+def over_outcomes(steps: np.ndarray, balls: int) -> np.ndarray:
+    grid = np.fft.irfft2(steps**balls, s=(OVER_RUNS, OVER_WICKETS))
+    np.maximum(grid, 0, out=grid)
+    return grid / grid.sum(axis=(-2, -1), keepdims=True)
+
+
+def guide_tables(probabilities: np.ndarray) -> tuple[np.ndarray, ...]:
+    """
+    Tables to draw from each row of outcome probabilities, all flattened: the outcomes most likely first, their
+    cumulative distribution, that plus the row number, so that one search covers every row, and for each 1/OUTCOMES
+    slice of [0, 1) the first of them a uniform number in it can draw. Most likely first leaves the many impossible
+    outcomes together at the end, where they're searched rather than walked past.
+    """
+    rows = np.arange(len(probabilities))[:, None]
+    order = np.argsort(-probabilities, axis=1, kind="stable")
+    cdf = np.cumsum(np.take_along_axis(probabilities, order, axis=1), axis=1)
+    cdf[:, -1] = 1.0
+    shifted = (cdf + rows).ravel()
+    starts = rows + np.arange(OUTCOMES) / OUTCOMES
+    guide = np.minimum(
+        np.searchsorted(shifted, starts.ravel(), side="right"), shifted.size - 1
+    )
+    return order.ravel(), cdf.ravel(), shifted, guide
+
+
+def draw(
+    tables: tuple[np.ndarray, ...], rows: np.ndarray | int, uniform: np.ndarray
+) -> np.ndarray:
+    """Each simulation's outcome, drawn from its row of the tables: a short walk on from the guide, then a search."""
+    order, cdf, shifted, guide = tables
+    drawn = guide[rows * OUTCOMES + (uniform * OUTCOMES).astype(np.intp)]
+    for _ in range(WALK):
+        behind = cdf[drawn] <= uniform
+        if not behind.any():
+            return order[drawn]
+        drawn += behind
+    behind = np.flatnonzero(cdf[drawn] <= uniform)
+    wanted = uniform[behind] + (rows[behind] if isinstance(rows, np.ndarray) else rows)
+    drawn[behind] = np.searchsorted(shifted, wanted, side="right")
+    return order[drawn]
+
+
+@dataclass
+class Projection:
+    simulations: int
+    mean: float
+    # QUANTILES of the final total
+    quantiles: dict[float, int]
+    # for a chase, the chances of winning and of a tie
+    win: float | None = None
+    tie: float | None = None
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        low, high = self.quantiles[QUANTILES[0]], self.quantiles[QUANTILES[-1]]
+        text = f"Projected {self.quantiles[0.5]} ({low}-{high})"
+        return text + (f" · win {self.win:.0%}" if self.win is not None else "")
+
+
+@dataclass
+class Projector:
+    """Fitted Models by format, and the simulation of the rest of an innings from a card."""
+
+    simulations: int = 10_000
+    seed: int | None = None
+    models: dict[str, Model] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.rng = np.random.default_rng(self.seed)
+
+    def fit(self, format: str, ledgers: Iterable[Ledger]) -> Model:
+        """Fit and keep the model for a format from the ledgers of whole innings, not super overs."""
+        self.models[format] = Model(format, count_ledgers(ledgers, FORMATS[format]))
+        return self.models[format]
+
+    def fit_warehouse(self, warehouse, format: str) -> Model:
+        self.models[format] = Model(
+            format, count_warehouse(warehouse, format, FORMATS[format])
+        )
+        return self.models[format]
+
+    def project(
+        self, card: ScoreCard, format: str = "T20", target: int | None = None
+    ) -> Projection:
+        """
+        Simulate the rest of an innings from the card. `target`, by default the card's analytics target when set,
+        makes it a chase.
+        """
+        start = time.perf_counter()
+        model = self.models.get(format)
+        if model is None:
+            raise ValueError(f"no model fitted for {format}")
+        analytics = card.analytics
+        target = target if target is not None else analytics.target or None
+        balls_per_over = analytics.balls_per_over
+        overs = min(analytics.balls_limit // balls_per_over or model.overs, model.overs)
+        count = self.simulations
+        runs = np.full(count, card.runs, np.intp)
+        wickets = np.full(count, card.wickets, np.intp)
+        over, ball = card.over, card.ball
+        if ball >= balls_per_over:
+            over, ball = over + 1, 0
+        done = (
+            card.wickets >= WICKETS
+            or over >= overs
+            or (target is not None and card.runs >= target)
+        )
+        if not done:
+            form = self.form(card, model)
+            # a row for each over to draw its outcome, and another to round its runs when they're scaled by form
+            uniform = iter(
+                self.rng.random(
+                    ((1 + (form != 1.0)) * (overs - over), count), np.float32
+                )
+            )
+            if ball:
+                tables = model.partial_over(over, card.wickets, balls_per_over - ball)
+                self.add_over(
+                    runs, wickets, draw(tables, 0, next(uniform)), form, uniform
+                )
+                over += 1
+            for number in range(over, overs):
+                rows = np.minimum(wickets, WICKETS) + number * ROWS
+                self.add_over(
+                    runs,
+                    wickets,
+                    draw(model.tables, rows, next(uniform)),
+                    form,
+                    uniform,
+                )
+        totals = np.bincount(runs)
+        cumulative = np.cumsum(totals) / count
+        quantiles = {q: int(np.searchsorted(cumulative, q)) for q in QUANTILES}
+        projection = Projection(count, float(runs.mean()), quantiles)
+        if target is not None:
+            projection.win = float((runs >= target).mean())
+            projection.tie = float((runs == target - 1).mean())
+        projection.seconds = time.perf_counter() - start
+        return projection
+
+    @staticmethod
+    def form(card: ScoreCard, model: Model) -> float:
+        """How much to scale the runs of each simulated over by, from the recent run rate against the model's."""
+        overs = card.recent_overs()
+        rate = card.recent_run_rate
+        if not overs or not rate:
+            return 1.0
+        expected = (
+            model.run_rate[overs.start : min(overs.stop, model.overs)].mean()
+            * card.analytics.balls_per_over
+        )
+        return float(np.clip(1 + FORM_WEIGHT * (rate / expected - 1), *FORM_LIMITS))
+
+    @staticmethod
+    def add_over(
+        runs: np.ndarray,
+        wickets: np.ndarray,
+        outcomes: np.ndarray,
+        form: float,
+        uniform,
+    ) -> None:
+        # all out is its own row of the tables, with nothing to come, so it needs no masking here
+        over_runs = outcomes // OVER_WICKETS
+        if form != 1.0:
+            over_runs = (over_runs * form + next(uniform)).astype(np.intp)
+        runs += over_runs
+        wickets += outcomes % OVER_WICKETS
@@ -1,21 +1,34 @@
-from .ball import Ball
-from .extra import Extra
-from .how_out import HowOut
-from .score_card import ScoreCard
-from .scorer import Scorer
+from . import snapshot
+from .analytics import Analytics
+from .ball import Ball, CompactBall, FrozenBall
 from .batter import Batter
 from .batting_order import BattingOrder
 from .bowler import Bowler
 from .bowling_order import BowlingOrder
+from .delta import Delta
+from .extra import Extra
+from .how_out import HowOut
+from .ledger import Ledger
+from .matchups import Matchup, Matchups
+from .score_card import ScoreCard
+from .scorer import Scorer
 
 __all__ = [
+    "Analytics",
     "Ball",
-    "Extra",
-    "HowOut",
-    "ScoreCard",
-    "Scorer",
     "Batter",
     "BattingOrder",
     "Bowler",
     "BowlingOrder",
+    "CompactBall",
+    "Delta",
+    "Extra",
+    "FrozenBall",
+    "HowOut",
+    "Ledger",
+    "Matchup",
+    "Matchups",
+    "ScoreCard",
+    "Scorer",
+    "snapshot",
 ]
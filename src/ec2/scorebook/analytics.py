@@ -0,0 +1,243 @@
+from array import array
+from dataclasses import dataclass, field
+from itertools import groupby
+
+from .ledger import BOWLER_EXTRA_CODES, Ledger
+
+# one entry per over so far, the last being the over in progress
+OVER_ARRAYS = {
+    "over_runs": "H",  # Manhattan
+    "over_wickets": "B",
+    "worm": "H",  # the total at the end of each over
+    "conceded": "H",  # runs against the bowler
+    "over_balls": "B",  # legal deliveries
+    "over_bowler": "H",  # ledger name ids
+    "maiden": "B",
+}
+# one entry per wicket
+WICKET_ARRAYS = {"fow_runs": "H", "fow_over": "H", "fow_ball": "B", "fow_player": "H"}
+# one entry per partnership, the last being the current one
+PARTNERSHIP_ARRAYS = {
+    "partnership_runs": "H",
+    "partnership_balls": "H",
+    "partnership_start": "I",
+}
+ARRAYS = OVER_ARRAYS | WICKET_ARRAYS | PARTNERSHIP_ARRAYS
+
+
+def arrays() -> dict[str, array]:
+    return {name: array(typecode) for name, typecode in ARRAYS.items()}
+
+
+# identity equality, as for Ledger: held in a bindable field
+@dataclass(eq=False)
+class Analytics:
+    """
+    Per-over, per-wicket and per-partnership figures for an innings, kept current by the Scorer in constant time for
+    each ball, over and undo, as arrays ready to plot.
+
+    `target` and `balls_limit` are only known from the match, and give the required run rate when set.
+    """
+
+    ledger: Ledger = field(default_factory=Ledger, repr=False)
+    target: int = 0
+    balls_limit: int = 0
+    balls_per_over: int = 6
+
+    def __post_init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        for name, values in arrays().items():
+            setattr(self, name, values)
+        self.deliveries = 0
+        self.balls = 0
+        self.maidens = 0
+        self.bowler_maidens: dict[str, int] = {}
+        self.new_over()
+        self.new_partnership(0)
+
+    def attach(self, ledger: Ledger, over: int) -> None:
+        """Use `ledger`, rebuilding from it unless already up to date with it and with `over`."""
+        self.ledger = ledger
+        if self.deliveries == len(ledger) and len(self.over_runs) == over + 1:
+            return
+        self.reset()
+        for number, indices in groupby(range(len(ledger)), key=ledger.over.__getitem__):
+            while len(self.over_runs) <= number:
+                self.over_bowled()
+            indices = list(indices)
+            self.extend(indices[0], indices[-1] + 1)
+        while len(self.over_runs) <= over:
+            self.over_bowled()
+
+    def copy(self, ledger: Ledger) -> "Analytics":
+        copy = Analytics(ledger, self.target, self.balls_limit, self.balls_per_over)
+        for name, typecode in ARRAYS.items():
+            setattr(copy, name, array(typecode, getattr(self, name)))
+        copy.deliveries = self.deliveries
+        copy.balls = self.balls
+        copy.maidens = self.maidens
+        copy.bowler_maidens = dict(self.bowler_maidens)
+        return copy
+
+    def new_over(self) -> None:
+        for name in OVER_ARRAYS:
+            getattr(self, name).append(0)
+        if len(self.worm) > 1:
+            self.worm[-1] = self.worm[-2]
+
+    def new_partnership(self, start: int) -> None:
+        self.partnership_runs.append(0)
+        self.partnership_balls.append(0)
+        self.partnership_start.append(start)
+
+    def add(self, index: int) -> None:
+        """The ball at `index` in the ledger was scored."""
+        ledger = self.ledger
+        extra_type = ledger.extra_type[index]
+        extra_runs = ledger.extra_runs[index] if extra_type else 0
+        runs = ledger.batter_runs[index] + extra_runs + ledger.penalty_runs[index]
+        legal = extra_type not in BOWLER_EXTRA_CODES
+        self.deliveries += 1
+        self.over_runs[-1] += runs
+        self.worm[-1] += runs
+        self.conceded[-1] += ledger.batter_runs[index] + (0 if legal else extra_runs)
+        self.over_bowler[-1] = ledger.bowler[index]
+        self.partnership_runs[-1] += runs
+        if legal:
+            self.balls += 1
+            self.over_balls[-1] += 1
+            self.partnership_balls[-1] += 1
+        if ledger.player_out[index]:
+            self.over_wickets[-1] += 1
+            self.fow_runs.append(self.worm[-1])
+            self.fow_over.append(len(self.over_runs) - 1)
+            self.fow_ball.append(self.over_balls[-1])
+            self.fow_player.append(ledger.player_out[index])
+            self.new_partnership(index + 1)
+
+    def extend(self, start: int, stop: int) -> None:
+        """
+        The balls from `start` to `stop` in the ledger, all in the over in progress, were scored: as add() for each,
+        but with the balls between wickets summed together.
+        """
+        player_out = self.ledger.player_out
+        if player_out[start:stop].count(0) == stop - start:
+            self.add_run(start, stop)
+            return
+        for index in range(start, stop):
+            if player_out[index]:
+                self.add_run(start, index)
+                self.add(index)
+                start = index + 1
+        self.add_run(start, stop)
+
+    def add_run(self, start: int, stop: int) -> None:
+        """The balls from `start` to `stop`, none of them wickets, were scored."""
+        if start >= stop:
+            return
+        ledger = self.ledger
+        extra_types = ledger.extra_type[start:stop]
+        runs = conceded = sum(ledger.batter_runs[start:stop])
+        legal = stop - start
+        if extra_types.count(0) != stop - start:
+            for extra, extra_runs in zip(extra_types, ledger.extra_runs[start:stop]):
+                if extra:
+                    runs += extra_runs
+                    if extra in BOWLER_EXTRA_CODES:
+                        conceded += extra_runs
+                        legal -= 1
+        runs += sum(ledger.penalty_runs[start:stop])
+        self.deliveries += stop - start
+        self.over_runs[-1] += runs
+        self.worm[-1] += runs
+        self.conceded[-1] += conceded
+        self.over_bowler[-1] = ledger.bowler[stop - 1]
+        self.partnership_runs[-1] += runs
+        self.balls += legal
+        self.over_balls[-1] += legal
+        self.partnership_balls[-1] += legal
+
+    def remove(self, index: int) -> None:
+        """The ball at `index`, the last in the ledger, is being undone: the reverse of add()."""
+        ledger = self.ledger
+        extra_type = ledger.extra_type[index]
+        extra_runs = ledger.extra_runs[index] if extra_type else 0
+        runs = ledger.batter_runs[index] + extra_runs + ledger.penalty_runs[index]
+        legal = extra_type not in BOWLER_EXTRA_CODES
+        if ledger.player_out[index]:
+            for name in WICKET_ARRAYS | PARTNERSHIP_ARRAYS:
+                getattr(self, name).pop()
+            self.over_wickets[-1] -= 1
+        if legal:
+            self.balls -= 1
+            self.over_balls[-1] -= 1
+            self.partnership_balls[-1] -= 1
+        self.partnership_runs[-1] -= runs
+        same_over = index > 0 and ledger.over[index - 1] == ledger.over[index]
+        self.over_bowler[-1] = ledger.bowler[index - 1] if same_over else 0
+        self.conceded[-1] -= ledger.batter_runs[index] + (0 if legal else extra_runs)
+        self.worm[-1] -= runs
+        self.over_runs[-1] -= runs
+        self.deliveries -= 1
+
+    def over_bowled(self) -> None:
+        if self.over_balls[-1] and not self.conceded[-1]:
+            self.maiden[-1] = 1
+            self.maidens += 1
+            bowler = self.ledger.names[self.over_bowler[-1]]
+            self.bowler_maidens[bowler] = self.bowler_maidens.get(bowler, 0) + 1
+        self.new_over()
+
+    def over_reverted(self) -> None:
+        """The end of the last over is being undone."""
+        for name in OVER_ARRAYS:
+            getattr(self, name).pop()
+        if self.maiden[-1]:
+            self.maiden[-1] = 0
+            self.maidens -= 1
+            bowler = self.ledger.names[self.over_bowler[-1]]
+            self.bowler_maidens[bowler] -= 1
+            if not self.bowler_maidens[bowler]:
+                del self.bowler_maidens[bowler]
+
+    @property
+    def run_rate(self) -> float:
+        return self.worm[-1] * self.balls_per_over / self.balls if self.balls else 0.0
+
+    @property
+    def required_rate(self) -> float | None:
+        remaining = self.balls_limit - self.balls
+        if not self.target or remaining <= 0:
+            return None
+        return max(self.target - self.worm[-1], 0) * self.balls_per_over / remaining
+
+    @property
+    def fall_of_wickets(self) -> list[tuple[int, str, str]]:
+        """(score, over.ball, player out) at each wicket."""
+        names = self.ledger.names
+        return [
+            (runs, f"{over}.{ball}", names[player])
+            for runs, over, ball, player in zip(
+                self.fow_runs, self.fow_over, self.fow_ball, self.fow_player
+            )
+        ]
+
+    @property
+    def partnerships(self) -> list[tuple[str, str, int, int]]:
+        """(batter, batter, runs, balls) for each partnership that has faced a ball."""
+        ledger = self.ledger
+        names = ledger.names
+        return [
+            (
+                names[ledger.striker[start]],
+                names[ledger.non_striker[start]],
+                runs,
+                balls,
+            )
+            for runs, balls, start in zip(
+                self.partnership_runs, self.partnership_balls, self.partnership_start
+            )
+            if start < len(ledger)
+        ]
@@ -1,10 +1,36 @@
 from dataclasses import dataclass
+from sys import intern
+
 from dataclasses_json import DataClassJsonMixin
-from .extra import Extra
+
+from .extra import BOWLER_EXTRAS, Extra
 from .how_out import HowOut
 
+
+class BallFigures:
+    __slots__ = ()
+
+    @property
+    def total_runs(self) -> int:
+        return (
+            self.batter_runs
+            + (self.extra_runs if self.is_extra else 0)
+            + self.penalty_runs
+        )
+
+    @property
+    def bowler_runs(self) -> int:
+        return self.batter_runs + (
+            self.extra_runs if self.extra_type in BOWLER_EXTRAS else 0
+        )
+
+    @property
+    def is_extra(self) -> bool:
+        return self.extra_type != Extra.NO_EXTRA
+
+
 @dataclass
-class Ball(DataClassJsonMixin):
+class Ball(BallFigures, DataClassJsonMixin):
     striker: str = ""
     non_striker: str = ""
 
@@ -22,14 +48,51 @@ class Ball(DataClassJsonMixin):
     how_out: HowOut = HowOut.NOTOUT
     fielder: str = ""
 
-    @property
-    def total_runs(self) -> int:
-        return self.batter_runs + (self.extra_runs if self.is_extra else 0) + self.penalty_runs
 
-    @property
-    def bowler_runs(self) -> int:
-        return self.batter_runs + (self.extra_runs if self.extra_type in [Extra.WIDE, Extra.NOBALL] else 0)
+@dataclass(slots=True)
+class CompactBall(BallFigures):
+    """Same fields and figures as Ball, without a per-instance __dict__ or the JSON mixin."""
 
-    @property
-    def is_extra(self) -> bool:
-        return self.extra_type != Extra.NO_EXTRA
+    striker: str = ""
+    non_striker: str = ""
+    bowler: str = ""
+    batter_runs: int = 0
+    extra_type: Extra = Extra.NO_EXTRA
+    extra_runs: int = 0
+    penalty_runs: int = 0
+    player_out: str = ""
+    how_out: HowOut = HowOut.NOTOUT
+    fielder: str = ""
+
+    def __post_init__(self) -> None:
+        self.striker = intern(self.striker)
+        self.non_striker = intern(self.non_striker)
+        self.bowler = intern(self.bowler)
+        if self.player_out:
+            self.player_out = intern(self.player_out)
+            self.fielder = intern(self.fielder)
+
+
+@dataclass(slots=True, frozen=True)
+class FrozenBall(BallFigures):
+    """An immutable, hashable CompactBall."""
+
+    striker: str = ""
+    non_striker: str = ""
+    bowler: str = ""
+    batter_runs: int = 0
+    extra_type: Extra = Extra.NO_EXTRA
+    extra_runs: int = 0
+    penalty_runs: int = 0
+    player_out: str = ""
+    how_out: HowOut = HowOut.NOTOUT
+    fielder: str = ""
+
+    def __post_init__(self) -> None:
+        setattr = object.__setattr__
+        setattr(self, "striker", intern(self.striker))
+        setattr(self, "non_striker", intern(self.non_striker))
+        setattr(self, "bowler", intern(self.bowler))
+        if self.player_out:
+            setattr(self, "player_out", intern(self.player_out))
+            setattr(self, "fielder", intern(self.fielder))
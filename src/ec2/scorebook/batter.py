@@ -1,42 +1,147 @@
-from dataclasses import field
-from nicegui import binding
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from typing import ClassVar
+
+from dataclasses_json import config
+
 from .ball import Ball
+from .ledger import UNSTORED, Ledger, LedgerView, index_column
+from .window import Window
 
-@binding.bindable_dataclass
+
+@dataclass
 class Batter:
     position: int = 0
     name: str = ""
-    balls: list[Ball] = field(default_factory=list)
+    deliveries: array = field(
+        default_factory=index_column,
+        metadata=config(encoder=list, decoder=index_column),
+    )
     how_out: str = ""
     fielder: str = ""
+    runs: int = 0
+    balls_faced: int = 0
+    dots: int = 0
+    fours: int = 0
+    sixes: int = 0
+    ledger: Ledger = field(
+        default_factory=Ledger, repr=False, compare=False, metadata=UNSTORED
+    )
+    # balls faced covered by the recent_ figures
+    window_size: ClassVar[int] = 10
+
+    def __post_init__(self) -> None:
+        # bumped by every change to the figures, so that views can skip unchanged players
+        self.revision = 0
+        self.rendered: tuple[int, str] | None = None
+        # runs off each of the last balls faced, up to date with this many deliveries, or -1 when it needs refilling
+        self.window = Window(self.window_size)
+        self.windowed = -1 if self.deliveries else 0
 
-    def add(self, ball: Ball) -> None:
-        self.balls.append(ball)
+    @property
+    def balls(self) -> LedgerView:
+        return self.ledger.view(self.deliveries)
+
+    def add(self, ball: Ball, index: int | None = None) -> None:
+        self.revision += 1
+        self.deliveries.append(self.ledger.append(ball) if index is None else index)
+        if self.windowed == len(self.deliveries) - 1:
+            self.window.push(ball.batter_runs)
+            self.windowed += 1
+        self.balls_faced += 1
+        if ball.batter_runs:
+            self.runs += ball.batter_runs
+            if ball.batter_runs == 4:
+                self.fours += 1
+            elif ball.batter_runs == 6:
+                self.sixes += 1
+        else:
+            self.dots += 1
         if ball.player_out == self.name:
             self.record_out(ball)
 
+    def extend(self, indices: Sequence[int]) -> None:
+        self.revision += 1
+        self.deliveries.extend(indices)
+        self.windowed = -1
+        batter_runs = self.ledger.batter_runs
+        runs = [batter_runs[i] for i in indices]
+        self.balls_faced += len(runs)
+        self.runs += sum(runs)
+        self.dots += runs.count(0)
+        self.fours += runs.count(4)
+        self.sixes += runs.count(6)
+
+    def remove(self, ball: Ball) -> None:
+        self.revision += 1
+        self.deliveries.pop()
+        self.windowed = -1
+        self.balls_faced -= 1
+        if ball.batter_runs:
+            self.runs -= ball.batter_runs
+            if ball.batter_runs == 4:
+                self.fours -= 1
+            elif ball.batter_runs == 6:
+                self.sixes -= 1
+        else:
+            self.dots -= 1
+        if ball.player_out == self.name:
+            self.clear_out()
+
     def record_out(self, ball: Ball) -> None:
+        self.revision += 1
         self.how_out = ball.how_out
         self.fielder = ball.fielder
 
-    @property
-    def balls_faced(self) -> int:
-        return len(self.balls)
+    def clear_out(self) -> None:
+        self.revision += 1
+        self.how_out = ""
+        self.fielder = ""
+
+    def copy(self, ledger: Ledger) -> "Batter":
+        return replace(self, deliveries=index_column(self.deliveries), ledger=ledger)
 
     @property
-    def runs(self) -> int:
-        return sum(ball.batter_runs for ball in self.balls)
+    def recent(self) -> Window:
+        if self.windowed != len(self.deliveries):
+            batter_runs = self.ledger.batter_runs
+            self.window.fill(
+                batter_runs[i] for i in self.deliveries[-self.window_size :]
+            )
+            self.windowed = len(self.deliveries)
+        return self.window
 
     @property
-    def fours(self) -> int:
-        return sum(ball.batter_runs == 4 for ball in self.balls)
+    def recent_runs(self) -> int:
+        return self.recent.total
 
     @property
-    def sixes(self) -> int:
-        return sum(ball.batter_runs == 6 for ball in self.balls)
+    def recent_strike_rate(self) -> float:
+        recent = self.recent
+        return 100 * recent.total / len(recent) if recent else 0.0
+
+    def recount(self) -> dict[str, int]:
+        return {
+            "runs": sum(ball.batter_runs for ball in self.balls),
+            "balls_faced": len(self.balls),
+            "dots": sum(ball.batter_runs == 0 for ball in self.balls),
+            "fours": sum(ball.batter_runs == 4 for ball in self.balls),
+            "sixes": sum(ball.batter_runs == 6 for ball in self.balls),
+        }
+
+    def is_consistent(self) -> bool:
+        return all(
+            getattr(self, name) == value for name, value in self.recount().items()
+        )
 
     @property
     def html(self) -> str:
+        if self.rendered is None or self.rendered[0] != self.revision:
+            self.rendered = (self.revision, self.render())
+        return self.rendered[1]
+
+    def render(self) -> str:
         return (
             (
                 f"""<div style='display: flex; justify-content: space-between; width: 300px;'>"""
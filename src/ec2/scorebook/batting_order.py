@@ -1,27 +1,68 @@
-from dataclasses import field
-from nicegui import binding
+from dataclasses import dataclass, field
+from functools import partial
+from typing import ClassVar
+
 from .batter import Batter
+from .ledger import UNSTORED, Ledger
+
+# returned for every unfilled position, never added to
+EMPTY_BATTER = Batter()
+
 
-@binding.bindable_dataclass
+@dataclass
 class BattingOrder:
     next_position: int = 1
     batters: dict[str, Batter] = field(default_factory=dict)
+    ledger: Ledger = field(
+        default_factory=Ledger, repr=False, compare=False, metadata=UNSTORED
+    )
+    batter_class: ClassVar[type[Batter]] = Batter
 
     def __post_init__(self) -> None:
-        for i in range(1, 12):
-            setattr(self, f"batter_{i}", self.make_batter_lookup_func(i))
+        self.slots: list[Batter] = sorted(
+            self.batters.values(), key=lambda batter: batter.position
+        )
+
+    def __getattr__(self, name: str):
+        prefix, _, position = name.partition("_")
+        if prefix == "batter" and position.isdigit():
+            # kept on the instance, so the next lookup of this slot doesn't come through here
+            lookup = self.make_batter_lookup_func(int(position))
+            setattr(self, name, lookup)
+            return lookup
+        raise AttributeError(name)
+
+    def attach(self, ledger: Ledger) -> None:
+        self.ledger = ledger
+        for player in self.batters.values():
+            player.ledger = ledger
 
     def add(self, name: str) -> Batter:
-        if not self.batters.get(name, None):
-            self.batters[name] = Batter(name=name, position=self.next_position)
+        batter = self.batters.get(name)
+        if batter is None:
+            batter = self.batters[name] = self.batter_class(
+                name=name, position=self.next_position, ledger=self.ledger
+            )
+            self.slots.append(batter)
             self.next_position += 1
-        return self.batters[name]
+        return batter
 
-    def make_batter_lookup_func(self, index: int):
-        def batter_lookup() -> Batter:
-            for p in self.batters.values():
-                if p.position == index:
-                    return p
-            return Batter()
+    def truncate(self, next_position: int) -> None:
+        for batter in self.slots[next_position - 1 :]:
+            del self.batters[batter.name]
+        del self.slots[next_position - 1 :]
+        self.next_position = next_position
+
+    def copy(self, ledger: Ledger) -> "BattingOrder":
+        batters = {name: batter.copy(ledger) for name, batter in self.batters.items()}
+        return type(self)(
+            next_position=self.next_position, batters=batters, ledger=ledger
+        )
 
-        return batter_lookup
+    def batter(self, position: int) -> Batter:
+        if 0 < position <= len(self.slots):
+            return self.slots[position - 1]
+        return EMPTY_BATTER
+
+    def make_batter_lookup_func(self, index: int):
+        return partial(self.batter, index)
@@ -1,35 +1,176 @@
-from dataclasses import field
-from nicegui import binding
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from typing import ClassVar
+
+from dataclasses_json import config
+
 from .ball import Ball
-from .how_out import HowOut
+from .extra import BOWLER_EXTRAS
+from .how_out import BOWLER_WICKETS
+from .ledger import (
+    BOWLER_EXTRA_CODES,
+    BOWLER_WICKET_CODES,
+    UNSTORED,
+    Ledger,
+    LedgerView,
+    index_column,
+)
+from .window import Window
+
 
-@binding.bindable_dataclass
+@dataclass
 class Bowler:
     position: int = 0
     name: str = ""
-    balls: list[Ball] = field(default_factory=list)
+    deliveries: array = field(
+        default_factory=index_column,
+        metadata=config(encoder=list, decoder=index_column),
+    )
     wickets: int = 0
+    runs: int = 0
+    balls_bowled: int = 0
+    dots: int = 0
+    extras: int = 0
+    ledger: Ledger = field(
+        default_factory=Ledger, repr=False, compare=False, metadata=UNSTORED
+    )
+    # balls bowled covered by the recent_ figures
+    window_size: ClassVar[int] = 12
 
-    @property
-    def runs(self) -> int:
-        return sum(ball.bowler_runs for ball in self.balls)
+    def __post_init__(self) -> None:
+        # bumped by every change to the figures, so that views can skip unchanged players
+        self.revision = 0
+        self.rendered: tuple[int, str] | None = None
+        # runs and dots off each of the last balls bowled, up to date with this many deliveries, or -1 when they need
+        # refilling
+        self.window = Window(self.window_size)
+        self.dot_window = Window(self.window_size)
+        self.windowed = -1 if self.deliveries else 0
 
     @property
-    def balls_bowled(self) -> int:
-        return len(self.balls)
-
-    def add(self, ball: Ball) -> None:
-        self.balls.append(ball)
-        if ball.player_out and ball.how_out in [
-            HowOut.BOWLED,
-            HowOut.CAUGHT,
-            HowOut.LBW,
-            HowOut.STUMPED,
-        ]:
+    def balls(self) -> LedgerView:
+        return self.ledger.view(self.deliveries)
+
+    def add(self, ball: Ball, index: int | None = None) -> None:
+        self.revision += 1
+        self.deliveries.append(self.ledger.append(ball) if index is None else index)
+        self.balls_bowled += 1
+        runs = ball.bowler_runs
+        if self.windowed == len(self.deliveries) - 1:
+            self.window.push(runs)
+            self.dot_window.push(not runs)
+            self.windowed += 1
+        if runs:
+            self.runs += runs
+        else:
+            self.dots += 1
+        if ball.extra_type in BOWLER_EXTRAS:
+            self.extras += ball.extra_runs
+        if ball.player_out and ball.how_out in BOWLER_WICKETS:
             self.wickets += 1
 
+    def extend(self, indices: Sequence[int]) -> None:
+        self.revision += 1
+        self.deliveries.extend(indices)
+        self.windowed = -1
+        ledger = self.ledger
+        extra_type = ledger.extra_type
+        extra_runs = ledger.extra_runs
+        batter_runs = ledger.batter_runs
+        player_out = ledger.player_out
+        extras = [
+            extra_runs[i] if extra_type[i] in BOWLER_EXTRA_CODES else 0 for i in indices
+        ]
+        runs = [batter_runs[i] + extra for i, extra in zip(indices, extras)]
+        self.balls_bowled += len(runs)
+        self.runs += sum(runs)
+        self.dots += runs.count(0)
+        self.extras += sum(extras)
+        self.wickets += sum(
+            1
+            for i in indices
+            if player_out[i] and ledger.how_out[i] in BOWLER_WICKET_CODES
+        )
+
+    def remove(self, ball: Ball) -> None:
+        self.revision += 1
+        self.deliveries.pop()
+        self.windowed = -1
+        self.balls_bowled -= 1
+        runs = ball.bowler_runs
+        if runs:
+            self.runs -= runs
+        else:
+            self.dots -= 1
+        if ball.extra_type in BOWLER_EXTRAS:
+            self.extras -= ball.extra_runs
+        if ball.player_out and ball.how_out in BOWLER_WICKETS:
+            self.wickets -= 1
+
+    def copy(self, ledger: Ledger) -> "Bowler":
+        return replace(self, deliveries=index_column(self.deliveries), ledger=ledger)
+
+    @property
+    def recent(self) -> Window:
+        if self.windowed != len(self.deliveries):
+            ledger = self.ledger
+            runs = [
+                ledger.batter_runs[i]
+                + (
+                    ledger.extra_runs[i]
+                    if ledger.extra_type[i] in BOWLER_EXTRA_CODES
+                    else 0
+                )
+                for i in self.deliveries[-self.window_size :]
+            ]
+            self.window.fill(runs)
+            self.dot_window.fill(not r for r in runs)
+            self.windowed = len(self.deliveries)
+        return self.window
+
+    @property
+    def recent_runs(self) -> int:
+        return self.recent.total
+
+    @property
+    def recent_economy(self) -> float:
+        recent = self.recent
+        return 6 * recent.total / len(recent) if recent else 0.0
+
+    @property
+    def recent_dot_percentage(self) -> float:
+        recent = self.recent
+        return 100 * self.dot_window.total / len(recent) if recent else 0.0
+
+    def recount(self) -> dict[str, int]:
+        return {
+            "runs": sum(ball.bowler_runs for ball in self.balls),
+            "balls_bowled": len(self.balls),
+            "dots": sum(ball.bowler_runs == 0 for ball in self.balls),
+            "extras": sum(
+                ball.extra_runs
+                for ball in self.balls
+                if ball.extra_type in BOWLER_EXTRAS
+            ),
+            "wickets": sum(
+                bool(ball.player_out) and ball.how_out in BOWLER_WICKETS
+                for ball in self.balls
+            ),
+        }
+
+    def is_consistent(self) -> bool:
+        return all(
+            getattr(self, name) == value for name, value in self.recount().items()
+        )
+
     @property
     def html(self) -> str:
+        if self.rendered is None or self.rendered[0] != self.revision:
+            self.rendered = (self.revision, self.render())
+        return self.rendered[1]
+
+    def render(self) -> str:
         return (
             (
                 f"""<div style='display: flex; justify-content: space-between; width: 300px;'>"""
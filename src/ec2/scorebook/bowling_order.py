@@ -1,27 +1,68 @@
-from dataclasses import field
-from nicegui import binding
+from dataclasses import dataclass, field
+from functools import partial
+from typing import ClassVar
+
 from .bowler import Bowler
+from .ledger import UNSTORED, Ledger
+
+# returned for every unfilled position, never added to
+EMPTY_BOWLER = Bowler()
+
 
-@binding.bindable_dataclass
+@dataclass
 class BowlingOrder:
     next_position: int = 1
     bowlers: dict[str, Bowler] = field(default_factory=dict)
+    ledger: Ledger = field(
+        default_factory=Ledger, repr=False, compare=False, metadata=UNSTORED
+    )
+    bowler_class: ClassVar[type[Bowler]] = Bowler
 
     def __post_init__(self) -> None:
-        for i in range(1, 12):
-            setattr(self, f"bowler_{i}", self.make_bowler_lookup_func(i))
+        self.slots: list[Bowler] = sorted(
+            self.bowlers.values(), key=lambda bowler: bowler.position
+        )
+
+    def __getattr__(self, name: str):
+        prefix, _, position = name.partition("_")
+        if prefix == "bowler" and position.isdigit():
+            # kept on the instance, so the next lookup of this slot doesn't come through here
+            lookup = self.make_bowler_lookup_func(int(position))
+            setattr(self, name, lookup)
+            return lookup
+        raise AttributeError(name)
+
+    def attach(self, ledger: Ledger) -> None:
+        self.ledger = ledger
+        for player in self.bowlers.values():
+            player.ledger = ledger
 
     def add(self, name: str) -> Bowler:
-        if not self.bowlers.get(name, None):
-            self.bowlers[name] = Bowler(name=name, position=self.next_position)
+        bowler = self.bowlers.get(name)
+        if bowler is None:
+            bowler = self.bowlers[name] = self.bowler_class(
+                name=name, position=self.next_position, ledger=self.ledger
+            )
+            self.slots.append(bowler)
             self.next_position += 1
-        return self.bowlers[name]
+        return bowler
 
-    def make_bowler_lookup_func(self, index: int):
-        def bowler_lookup() -> Bowler:
-            for p in self.bowlers.values():
-                if p.position == index:
-                    return p
-            return Bowler()
+    def truncate(self, next_position: int) -> None:
+        for bowler in self.slots[next_position - 1 :]:
+            del self.bowlers[bowler.name]
+        del self.slots[next_position - 1 :]
+        self.next_position = next_position
+
+    def copy(self, ledger: Ledger) -> "BowlingOrder":
+        bowlers = {name: bowler.copy(ledger) for name, bowler in self.bowlers.items()}
+        return type(self)(
+            next_position=self.next_position, bowlers=bowlers, ledger=ledger
+        )
 
-        return bowler_lookup
+    def bowler(self, position: int) -> Bowler:
+        if 0 < position <= len(self.slots):
+            return self.slots[position - 1]
+        return EMPTY_BOWLER
+
+    def make_bowler_lookup_func(self, index: int):
+        return partial(self.bowler, index)
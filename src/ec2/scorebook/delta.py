@@ -0,0 +1,83 @@
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+from .batter import Batter
+from .bowler import Bowler
+from .score_card import ScoreCard
+
+UNSENT_FIELDS = frozenset({"deliveries", "ledger"})
+BATTER_FIGURES = tuple(f.name for f in fields(Batter) if f.name not in UNSENT_FIELDS)
+BOWLER_FIGURES = tuple(f.name for f in fields(Bowler) if f.name not in UNSENT_FIELDS)
+
+
+def figures(player: Batter | Bowler) -> dict[str, Any]:
+    """A player's row on the card."""
+    names = BATTER_FIGURES if isinstance(player, Batter) else BOWLER_FIGURES
+    return {name: getattr(player, name) for name in names}
+
+
+@dataclass
+class Delta:
+    """
+    What one scoring event changed on a card, or with `full` set, the whole card.
+
+    To apply one: replace the totals and extras, replace the players listed by position, drop any players beyond
+    `batting_count`/`bowling_count`, then cut the history to `history_from` entries and append `history`.
+    """
+
+    revision: int = 0
+    runs: int = 0
+    wickets: int = 0
+    over: int = 0
+    ball: int = 0
+    fours: int = 0
+    sixes: int = 0
+    extras: dict[str, int] = field(default_factory=dict)
+    batters: list[dict[str, Any]] = field(default_factory=list)
+    bowlers: list[dict[str, Any]] = field(default_factory=list)
+    batting_count: int = 0
+    bowling_count: int = 0
+    history_from: int = 0
+    history: list[str] = field(default_factory=list)
+    full: bool = False
+
+    @classmethod
+    def of(
+        cls,
+        card: ScoreCard,
+        batters: list[Batter],
+        bowlers: list[Bowler],
+        history_from: int,
+        full: bool = False,
+    ) -> "Delta":
+        return cls(
+            revision=card.revision,
+            runs=card.runs,
+            wickets=card.wickets,
+            over=card.over,
+            ball=card.ball,
+            fours=card.fours,
+            sixes=card.sixes,
+            extras=dict(card.extras),
+            batters=[figures(batter) for batter in batters],
+            bowlers=[figures(bowler) for bowler in bowlers],
+            batting_count=len(card.batting_order.slots),
+            bowling_count=len(card.bowling_order.slots),
+            history_from=history_from,
+            history=card.history[history_from:],
+            full=full,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        # every field already holds plain JSON types, so no encoding pass is needed
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Delta":
+        return cls(**data)
+
+    @classmethod
+    def snapshot(cls, card: ScoreCard) -> "Delta":
+        return cls.of(
+            card, card.batting_order.slots, card.bowling_order.slots, 0, full=True
+        )
@@ -1,8 +1,13 @@
 from enum import StrEnum
 
+
 class Extra(StrEnum):
     NO_EXTRA = ""
     WIDE = "w"
     NOBALL = "nb"
     BYE = "b"
     LEGBYE = "lb"
+
+
+# extras that count against the bowler and don't count as a ball of the over
+BOWLER_EXTRAS = frozenset({Extra.WIDE, Extra.NOBALL})
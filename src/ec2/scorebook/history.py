@@ -0,0 +1,86 @@
+from collections import deque
+from collections.abc import Iterator, Sequence
+
+from .ball import Ball
+from .extra import Extra
+from .ledger import BOWLER_EXTRA_CODES, Ledger
+
+
+def describe(over: int, ball_no: int, ball: Ball) -> str:
+    extras = (
+        ""
+        if ball.extra_type == Extra.NO_EXTRA
+        else f"+{ball.extra_runs}{ball.extra_type}"
+    )
+    return f"{over}.{ball_no} {ball.bowler} to {ball.striker}: {ball.batter_runs} runs {extras}"
+
+
+class History(Sequence[str]):
+    """
+    A description of each delivery in an innings, formatted from the ledger only when asked for.
+
+    The last `size` descriptions are kept ready in a ring buffer for the recent view. With `enabled` off the history
+    is empty and nothing is formatted at all, for bulk replays that don't need it.
+    """
+
+    def __init__(
+        self, ledger: Ledger | None = None, size: int = 6, enabled: bool = True
+    ):
+        self.ledger = Ledger() if ledger is None else ledger
+        self.enabled = enabled
+        self.recent: deque[str] = deque(maxlen=size)
+        self.refill()
+
+    def attach(self, ledger: Ledger) -> None:
+        self.ledger = ledger
+        self.refill()
+
+    def copy(self) -> "History":
+        return History(self.ledger, self.recent.maxlen or 0, self.enabled)
+
+    def describe(self, index: int) -> str:
+        ledger = self.ledger
+        over = ledger.over[index]
+        # the ball's number within its over, as the Scorer counted it
+        ball_no = 0
+        start = index
+        while start >= 0 and ledger.over[start] == over:
+            if ledger.extra_type[start] not in BOWLER_EXTRA_CODES:
+                ball_no += 1
+            start -= 1
+        return describe(over, ball_no, ledger.ball(index))
+
+    def added(self, count: int = 1) -> None:
+        """Deliveries were appended to the ledger."""
+        if self.enabled:
+            length = len(self.ledger)
+            start = max(length - count, length - (self.recent.maxlen or 0), 0)
+            self.recent.extend(map(self.describe, range(start, length)))
+
+    def refill(self) -> None:
+        """Deliveries were removed from the ledger, or it was replaced."""
+        self.recent.clear()
+        if self.enabled:
+            length = len(self.ledger)
+            self.recent.extend(
+                map(
+                    self.describe,
+                    range(max(length - (self.recent.maxlen or 0), 0), length),
+                )
+            )
+
+    def __len__(self) -> int:
+        return len(self.ledger) if self.enabled else 0
+
+    def text(self, index: int) -> str:
+        # the latest deliveries are already formatted in the ring buffer
+        offset = index - len(self) + len(self.recent)
+        return self.recent[offset] if offset >= 0 else self.describe(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.text(i) for i in range(len(self))[index]]
+        return self.text(range(len(self))[index])
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self.text, range(len(self)))
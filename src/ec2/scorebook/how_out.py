@@ -1,5 +1,6 @@
 from enum import StrEnum
 
+
 class HowOut(StrEnum):
     NOTOUT = "no"
     BOWLED = "b"
@@ -8,3 +9,7 @@ class HowOut(StrEnum):
     STUMPED = "st"
     RUN_OUT = "ro"
     OTHER = "other"
+
+
+# dismissals credited to the bowler
+BOWLER_WICKETS = frozenset({HowOut.BOWLED, HowOut.CAUGHT, HowOut.LBW, HowOut.STUMPED})
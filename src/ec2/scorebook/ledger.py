@@ -0,0 +1,162 @@
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from dataclasses_json import config
+
+from .ball import Ball
+from .extra import BOWLER_EXTRAS, Extra
+from .how_out import BOWLER_WICKETS, HowOut
+
+EXTRAS = tuple(Extra)
+EXTRA_CODES = {extra: code for code, extra in enumerate(EXTRAS)}
+HOW_OUTS = tuple(HowOut)
+HOW_OUT_CODES = {how_out: code for code, how_out in enumerate(HOW_OUTS)}
+BOWLER_EXTRA_CODES = frozenset(EXTRA_CODES[extra] for extra in BOWLER_EXTRAS)
+BOWLER_WICKET_CODES = frozenset(HOW_OUT_CODES[how_out] for how_out in BOWLER_WICKETS)
+
+NAME_COLUMNS = ("striker", "non_striker", "bowler", "player_out", "fielder")
+COUNT_COLUMNS = ("batter_runs", "extra_type", "extra_runs", "penalty_runs", "how_out")
+COLUMNS = NAME_COLUMNS + COUNT_COLUMNS + ("over",)
+TYPECODES = {column: "B" if column in COUNT_COLUMNS else "H" for column in COLUMNS}
+
+# field metadata leaving a value out of to_dict/to_json: the encoder is never called, but without one dataclasses-json
+# walks the whole value, ledger arrays and all, before dropping it
+UNSTORED = config(encoder=id, exclude=lambda _: True)
+
+
+def name_column() -> array:
+    return array("H")
+
+
+def count_column() -> array:
+    return array("B")
+
+
+# identity equality: bindable fields ignore assignments of an "equal" value
+@dataclass(eq=False)
+class Ledger:
+    """
+    All deliveries of an innings held as parallel typed arrays, one entry per ball.
+
+    Player names are interned to small ints, with 0 reserved for "no player".
+    """
+
+    names: list[str] = field(default_factory=lambda: [""])
+    striker: array = field(default_factory=name_column)
+    non_striker: array = field(default_factory=name_column)
+    bowler: array = field(default_factory=name_column)
+    player_out: array = field(default_factory=name_column)
+    fielder: array = field(default_factory=name_column)
+    batter_runs: array = field(default_factory=count_column)
+    extra_type: array = field(default_factory=count_column)
+    extra_runs: array = field(default_factory=count_column)
+    penalty_runs: array = field(default_factory=count_column)
+    how_out: array = field(default_factory=count_column)
+    # the over each ball was bowled in, as ScoreCard.over
+    over: array = field(default_factory=name_column)
+
+    def __post_init__(self) -> None:
+        self.ids: dict[str, int] = {
+            name: player_id for player_id, name in enumerate(self.names)
+        }
+
+    def intern(self, name: str) -> int:
+        player_id = self.ids.get(name)
+        if player_id is None:
+            player_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return player_id
+
+    def append(self, ball: Ball, over: int = 0) -> int:
+        intern = self.intern
+        self.striker.append(intern(ball.striker))
+        self.non_striker.append(intern(ball.non_striker))
+        self.bowler.append(intern(ball.bowler))
+        self.player_out.append(intern(ball.player_out))
+        self.fielder.append(intern(ball.fielder))
+        self.batter_runs.append(ball.batter_runs)
+        self.extra_type.append(EXTRA_CODES[ball.extra_type])
+        self.extra_runs.append(ball.extra_runs)
+        self.penalty_runs.append(ball.penalty_runs)
+        self.how_out.append(HOW_OUT_CODES[ball.how_out])
+        self.over.append(over)
+        return len(self.striker) - 1
+
+    def truncate(self, length: int, names: int | None = None) -> None:
+        for column in COLUMNS:
+            del getattr(self, column)[length:]
+        if names is not None:
+            for name in self.names[names:]:
+                del self.ids[name]
+            del self.names[names:]
+
+    def copy(self) -> "Ledger":
+        columns = {
+            column: array(TYPECODES[column], getattr(self, column))
+            for column in COLUMNS
+        }
+        return Ledger(names=list(self.names), **columns)
+
+    def ball(self, index: int) -> Ball:
+        names = self.names
+        return Ball(
+            striker=names[self.striker[index]],
+            non_striker=names[self.non_striker[index]],
+            bowler=names[self.bowler[index]],
+            batter_runs=self.batter_runs[index],
+            extra_type=EXTRAS[self.extra_type[index]],
+            extra_runs=self.extra_runs[index],
+            penalty_runs=self.penalty_runs[index],
+            player_out=names[self.player_out[index]],
+            how_out=HOW_OUTS[self.how_out[index]],
+            fielder=names[self.fielder[index]],
+        )
+
+    def view(self, indices: Sequence[int]) -> "LedgerView":
+        return LedgerView(self, indices)
+
+    def __len__(self) -> int:
+        return len(self.striker)
+
+    def __getitem__(self, index: int) -> Ball:
+        return self.ball(range(len(self))[index])
+
+    def __iter__(self) -> Iterator[Ball]:
+        return map(self.ball, range(len(self)))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"names": self.names} | {
+            column: getattr(self, column).tolist() for column in COLUMNS
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Ledger":
+        ledger = cls(names=list(data["names"]))
+        for column in COLUMNS:
+            getattr(ledger, column).extend(data[column])
+        return ledger
+
+
+class LedgerView(Sequence[Ball]):
+    """A read-only sequence of Balls, built on demand from selected ledger entries."""
+
+    def __init__(self, ledger: Ledger, indices: Sequence[int]):
+        self.ledger = ledger
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.ledger.ball(i) for i in self.indices[index]]
+        return self.ledger.ball(self.indices[index])
+
+    def __iter__(self) -> Iterator[Ball]:
+        return map(self.ledger.ball, self.indices)
+
+
+def index_column(indices: Iterable[int] = ()) -> array:
+    return array("I", indices)
@@ -0,0 +1,193 @@
+from collections.abc import Iterable, Iterator
+from dataclasses import astuple, dataclass, field, fields
+from typing import Any
+
+from .extra import Extra
+from .ledger import BOWLER_WICKET_CODES, EXTRA_CODES, Ledger
+
+WIDE_CODE = EXTRA_CODES[Extra.WIDE]
+
+
+@dataclass(slots=True)
+class Matchup:
+    """One batter's figures against one bowler. Balls don't count wides, and dismissals only the bowler's wickets."""
+
+    balls: int = 0
+    runs: int = 0
+    dots: int = 0
+    fours: int = 0
+    sixes: int = 0
+    dismissals: int = 0
+
+    def add(self, other: "Matchup", sign: int = 1) -> None:
+        for name in MATCHUP_FIELDS:
+            setattr(self, name, getattr(self, name) + sign * getattr(other, name))
+
+    @property
+    def strike_rate(self) -> float:
+        return 100 * self.runs / self.balls if self.balls else 0.0
+
+
+MATCHUP_FIELDS = tuple(f.name for f in fields(Matchup))
+
+
+# identity equality, as for Ledger: held in a bindable field
+@dataclass(eq=False)
+class Matchups:
+    """
+    Sparse batter-against-bowler figures keyed by (batter, bowler) name, kept current by the Scorer in constant time
+    for each ball and undo.
+
+    Keyed by name rather than ledger id so that matrices from different innings and matches can be merged, to build
+    season figures without replaying deliveries.
+    """
+
+    ledger: Ledger = field(default_factory=Ledger, repr=False)
+    pairs: dict[tuple[str, str], Matchup] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.deliveries = 0
+
+    def attach(self, ledger: Ledger) -> None:
+        """Use `ledger`, rebuilding from it unless already up to date with it."""
+        self.ledger = ledger
+        if self.deliveries != len(ledger):
+            self.pairs.clear()
+            self.deliveries = 0
+            self.extend(0, len(ledger))
+
+    def copy(self, ledger: Ledger) -> "Matchups":
+        copy = Matchups(
+            ledger,
+            {pair: Matchup(*astuple(matchup)) for pair, matchup in self.pairs.items()},
+        )
+        copy.deliveries = self.deliveries
+        return copy
+
+    def count(self, index: int, sign: int) -> tuple[tuple[str, str], Matchup]:
+        ledger = self.ledger
+        names = ledger.names
+        striker = ledger.striker[index]
+        pair = (names[striker], names[ledger.bowler[index]])
+        matchup = self.pairs.get(pair)
+        if matchup is None:
+            matchup = self.pairs[pair] = Matchup()
+        runs = ledger.batter_runs[index]
+        if ledger.extra_type[index] != WIDE_CODE:
+            matchup.balls += sign
+        if runs:
+            matchup.runs += sign * runs
+            if runs == 4:
+                matchup.fours += sign
+            elif runs == 6:
+                matchup.sixes += sign
+        else:
+            matchup.dots += sign
+        if (
+            ledger.player_out[index] == striker
+            and ledger.how_out[index] in BOWLER_WICKET_CODES
+        ):
+            matchup.dismissals += sign
+        self.deliveries += sign
+        return pair, matchup
+
+    def add(self, index: int) -> None:
+        """The ball at `index` in the ledger was scored."""
+        self.count(index, 1)
+
+    def extend(self, start: int, stop: int) -> None:
+        """The balls from `start` to `stop` in the ledger were scored, as add() for each."""
+        ledger = self.ledger
+        strikers = ledger.striker
+        bowlers = ledger.bowler
+        batter_runs = ledger.batter_runs
+        extra_types = ledger.extra_type
+        player_out = ledger.player_out
+        pair = matchup = None
+        for index in range(start, stop):
+            striker = strikers[index]
+            # consecutive balls are mostly to the same batter from the same bowler
+            if pair != (striker, bowlers[index]):
+                pair = (striker, bowlers[index])
+                names = (ledger.names[striker], ledger.names[bowlers[index]])
+                matchup = self.pairs.get(names)
+                if matchup is None:
+                    matchup = self.pairs[names] = Matchup()
+            runs = batter_runs[index]
+            if extra_types[index] != WIDE_CODE:
+                matchup.balls += 1
+            if runs:
+                matchup.runs += runs
+                if runs == 4:
+                    matchup.fours += 1
+                elif runs == 6:
+                    matchup.sixes += 1
+            else:
+                matchup.dots += 1
+            if (
+                player_out[index] == striker
+                and ledger.how_out[index] in BOWLER_WICKET_CODES
+            ):
+                matchup.dismissals += 1
+        self.deliveries += stop - start
+
+    def remove(self, index: int) -> None:
+        """The ball at `index`, the last in the ledger, is being undone."""
+        pair, matchup = self.count(index, -1)
+        if not any(astuple(matchup)):
+            del self.pairs[pair]
+
+    def merge(self, other: "Matchups") -> "Matchups":
+        """Add another matrix's figures into this one."""
+        for pair, counts in other.pairs.items():
+            matchup = self.pairs.get(pair)
+            if matchup is None:
+                self.pairs[pair] = Matchup(*astuple(counts))
+            else:
+                matchup.add(counts)
+        return self
+
+    @classmethod
+    def total(cls, matrices: Iterable["Matchups"]) -> "Matchups":
+        total = cls()
+        for matrix in matrices:
+            total.merge(matrix)
+        return total
+
+    def batter(self, name: str) -> dict[str, Matchup]:
+        return {
+            bowler: matchup
+            for (batter, bowler), matchup in self.pairs.items()
+            if batter == name
+        }
+
+    def bowler(self, name: str) -> dict[str, Matchup]:
+        return {
+            batter: matchup
+            for (batter, bowler), matchup in self.pairs.items()
+            if bowler == name
+        }
+
+    def __getitem__(self, pair: tuple[str, str]) -> Matchup:
+        return self.pairs.get(pair) or Matchup()
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        return iter(self.pairs)
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "fields": MATCHUP_FIELDS,
+            "pairs": [
+                [*pair, *astuple(matchup)] for pair, matchup in self.pairs.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Matchups":
+        pairs = {}
+        for batter, bowler, *counts in data["pairs"]:
+            pairs[batter, bowler] = Matchup(**dict(zip(data["fields"], counts)))
+        return cls(pairs=pairs)
@@ -1,22 +1,63 @@
-from dataclasses import field
-from dataclasses_json import DataClassJsonMixin
-from nicegui import binding
+from dataclasses import dataclass, field, replace
+from typing import ClassVar
+
+from dataclasses_json import DataClassJsonMixin, config
+
+from .analytics import Analytics
+from .batter import Batter
 from .batting_order import BattingOrder
+from .bowler import Bowler
 from .bowling_order import BowlingOrder
 from .extra import Extra
-from .batter import Batter
-from .bowler import Bowler
+from .history import History
+from .ledger import UNSTORED, Ledger
+from .matchups import Matchups
+
 
-@binding.bindable_dataclass
+@dataclass
 class ScoreCard(DataClassJsonMixin):
     runs: int = 0
     wickets: int = 0
     batting_order: BattingOrder = field(default_factory=BattingOrder)
     bowling_order: BowlingOrder = field(default_factory=BowlingOrder)
     extras: dict[Extra, int] = field(default_factory=dict)
-    history: list[str] = field(default_factory=list)
+    # formatted from the ledger on demand, so not stored
+    history: History = field(default_factory=History, metadata=UNSTORED)
     over: int = 0
     ball: int = 0
+    fours: int = 0
+    sixes: int = 0
+    ledger: Ledger = field(
+        default_factory=Ledger,
+        metadata=config(encoder=Ledger.to_dict, decoder=Ledger.from_dict),
+    )
+    # derived from the ledger, so not stored
+    analytics: Analytics = field(default_factory=Analytics, metadata=UNSTORED)
+    matchups: Matchups = field(default_factory=Matchups, metadata=UNSTORED)
+    # overs covered by the recent_ figures
+    window_overs: ClassVar[int] = 5
+
+    def __post_init__(self) -> None:
+        # bumped by the Scorer after every change
+        self.revision = 0
+        self.batting_order.attach(self.ledger)
+        self.bowling_order.attach(self.ledger)
+        self.history.attach(self.ledger)
+        self.analytics.attach(self.ledger, self.over)
+        self.matchups.attach(self.ledger)
+
+    def copy(self) -> "ScoreCard":
+        ledger = self.ledger.copy()
+        return replace(
+            self,
+            batting_order=self.batting_order.copy(ledger),
+            bowling_order=self.bowling_order.copy(ledger),
+            extras=dict(self.extras),
+            history=self.history.copy(),
+            analytics=self.analytics.copy(ledger),
+            matchups=self.matchups.copy(ledger),
+            ledger=ledger,
+        )
 
     def add_batter(self, name: str) -> Batter:
         return self.batting_order.add(name)
@@ -32,13 +73,14 @@ class ScoreCard(DataClassJsonMixin):
     def bowlers(self) -> dict[str, Bowler]:
         return self.bowling_order.bowlers
 
-    @property
-    def fours(self) -> int:
-        return sum(batter.fours for batter in self.batting_order.batters.values())
-
-    @property
-    def sixes(self) -> int:
-        return sum(batter.sixes for batter in self.batting_order.batters.values())
+    def is_consistent(self) -> bool:
+        batters = self.batters.values()
+        return (
+            all(batter.is_consistent() for batter in batters)
+            and all(bowler.is_consistent() for bowler in self.bowlers.values())
+            and self.fours == sum(batter.fours for batter in batters)
+            and self.sixes == sum(batter.sixes for batter in batters)
+        )
 
     @property
     def score(self) -> str:
@@ -46,4 +88,28 @@ class ScoreCard(DataClassJsonMixin):
 
     @property
     def last_6(self) -> str:
-        return "\n".join(self.history[:-7:-1])
+        return "\n".join(reversed(self.history.recent))
+
+    def recent_overs(self) -> range:
+        """The last window_overs overs, counting the one in progress once anything has been scored in it."""
+        analytics = self.analytics
+        end = len(analytics.worm) - (
+            0 if analytics.over_balls[-1] or analytics.over_runs[-1] else 1
+        )
+        return range(max(end - self.window_overs, 0), end)
+
+    @property
+    def recent_runs(self) -> int:
+        overs = self.recent_overs()
+        worm = self.analytics.worm
+        return (
+            (worm[overs[-1]] - (worm[overs[0] - 1] if overs[0] else 0)) if overs else 0
+        )
+
+    @property
+    def recent_run_rate(self) -> float:
+        overs = self.recent_overs()
+        balls = sum(self.analytics.over_balls[overs.start : overs.stop])
+        return (
+            self.recent_runs * self.analytics.balls_per_over / balls if balls else 0.0
+        )
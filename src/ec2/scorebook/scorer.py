@@ -1,25 +1,125 @@
+from collections.abc import Iterable
 from dataclasses import dataclass, field
-from .score_card import ScoreCard
+from itertools import accumulate, chain, groupby, repeat
+
 from .ball import Ball
-from .extra import Extra
+from .delta import Delta
+from .extra import BOWLER_EXTRAS
+from .ledger import (
+    BOWLER_EXTRA_CODES,
+    COUNT_COLUMNS,
+    EXTRA_CODES,
+    EXTRAS,
+    HOW_OUT_CODES,
+    NAME_COLUMNS,
+    Ledger,
+)
+from .score_card import ScoreCard
+
+
+@dataclass(slots=True)
+class Entry:
+    """An event in the scorer's log, with what's needed to undo it."""
+
+    ball: Ball | None = None  # None for the end of an over
+    batters: int = 0  # the card's next batting and bowling positions, ledger names and balls in the over beforehand
+    bowlers: int = 0
+    names: int = 0
+    balls: int = 0
+
+
+def counted(first: int, met: list[int], balls: int) -> list[int]:
+    """
+    Before each of `balls` balls, a count that starts at `first` and goes up by one after each ball in `met`, such as
+    the next batting position, given the balls at which new batters came in.
+    """
+    values: list[int] = []
+    for value, ball in enumerate(met, first):
+        values += repeat(value, ball + 1 - len(values))
+    values += repeat(first + len(met), balls - len(values))
+    return values
+
 
 @dataclass
 class Scorer:
     card: ScoreCard = field(default_factory=ScoreCard)
+    checkpoint_interval: int = 60
+    log: list[Entry] = field(default_factory=list)
+    undone: list[Entry] = field(default_factory=list)
+    # with this off nothing is logged, so there's no undo or state_at, and update_ledger can score in bulk
+    undoable: bool = True
+
+    def __post_init__(self) -> None:
+        # copies of the card after every checkpoint_interval events, made as state_at() passes them, and before the
+        # first, made the first time it's called
+        self.checkpoints: dict[int, ScoreCard] = {}
 
-    def over_bowled(self):
+    def entry(self, ball: Ball | None = None) -> Entry:
+        card = self.card
+        return Entry(
+            ball,
+            card.batting_order.next_position,
+            card.bowling_order.next_position,
+            len(card.ledger.names),
+            card.ball,
+        )
+
+    def record(self, entry: Entry) -> None:
+        if self.undoable:
+            self.log.append(entry)
+
+    def over_bowled(self) -> Delta:
+        self.record(self.entry())
+        self.undone.clear()
+        self.bowl_over()
+        return self.changes(None, len(self.card.history))
+
+    def bowl_over(self):
         self.card.over += 1
         self.card.ball = 0
+        self.card.analytics.over_bowled()
+        self.card.revision += 1
+
+    def update(self, ball: Ball) -> Delta:
+        self.record(self.entry(ball))
+        self.undone.clear()
+        self.apply(ball)
+        return self.changes(ball, len(self.card.history) - 1)
+
+    def changes(self, ball: Ball | None, history_from: int) -> Delta:
+        """The delta for an event on `ball`, or an over ending, that left the history as it was up to `history_from`."""
+        card = self.card
+        if ball is None:
+            return Delta.of(card, [], [], history_from)
+        batters = card.batters
+        bowlers = card.bowlers
+        return Delta.of(
+            card,
+            [
+                batters[name]
+                for name in (ball.striker, ball.non_striker)
+                if name in batters
+            ],
+            [bowlers[ball.bowler]] if ball.bowler in bowlers else [],
+            history_from,
+        )
 
-    def update(self, ball: Ball):
+    def apply(self, ball: Ball):
         striker = self.card.add_batter(ball.striker)
         non_striker = self.card.add_batter(ball.non_striker)
         bowler = self.card.add_bowler(ball.bowler)
 
         self.card.runs += ball.total_runs
 
-        striker.add(ball)
-        bowler.add(ball)
+        index = self.card.ledger.append(ball, self.card.over)
+        self.card.analytics.add(index)
+        self.card.matchups.add(index)
+        striker.add(ball, index)
+        if ball.batter_runs == 4:
+            self.card.fours += 1
+        elif ball.batter_runs == 6:
+            self.card.sixes += 1
+        bowler.add(ball, index)
 
         if ball.player_out:
             self.card.wickets += 1
@@ -27,10 +127,367 @@ class Scorer:
                 non_striker.record_out(ball)
 
         if ball.extra_runs > 0:
-            self.card.extras[ball.extra_type] = self.card.extras.get(ball.extra_type, 0) + ball.extra_runs
+            self.card.extras[ball.extra_type] = (
+                self.card.extras.get(ball.extra_type, 0) + ball.extra_runs
+            )
 
-        if ball.extra_type not in [Extra.WIDE, Extra.NOBALL]:
+        if ball.extra_type not in BOWLER_EXTRAS:
             self.card.ball += 1
-        extras = "" if ball.extra_type == Extra.NO_EXTRA else f"+{ball.extra_runs}{ball.extra_type}"
-        desc = f"{self.card.over}.{self.card.ball} {ball.bowler} to {ball.striker}: {ball.batter_runs} runs {extras}"
-        self.card.history.append(desc)
+        self.card.history.added()
+        self.card.revision += 1
+
+    def update_many(self, balls: Iterable[Ball]):
+        """
+        Score a run of deliveries with no over_bowled in between, leaving the card as update() would.
+
+        One pass over the balls interns names and adds players, noting the ball each was first met at; the ledger's
+        columns are then extended whole, the players, analytics, matchups and card totals brought up to date once each,
+        and the undo entries for the whole batch built from what the pass noted.
+        """
+        balls = balls if isinstance(balls, list) else list(balls)
+        if not balls:
+            return
+        card = self.card
+        ledger = card.ledger
+        names = ledger.names
+        intern = ledger.intern
+        extras = card.extras
+        self.undone.clear()
+        # as they were before the batch, for the undo entries
+        first_batter = card.batting_order.next_position
+        first_bowler = card.bowling_order.next_position
+        first_name = len(names)
+        # name -> (player, ledger indices, ledger id, the ball it was first met at), in order of first appearance
+        batting: dict[str, tuple] = {}
+        bowling: dict[str, tuple] = {}
+        # ledger id -> the ball its name was first met at
+        named: dict[int, int] = {}
+        strikers, non_strikers, bowlers, players_out, fielders = columns = (
+            [],
+            [],
+            [],
+            [],
+            [],
+        )
+        wickets = 0
+        start = index = len(ledger)
+
+        for offset, ball in enumerate(balls):
+            striker_name, non_striker_name, bowler_name = (
+                ball.striker,
+                ball.non_striker,
+                ball.bowler,
+            )
+            # players are added, and names interned, in the order update() would meet them
+            striker = batting.get(striker_name)
+            if striker is None:
+                striker = batting[striker_name] = (
+                    card.add_batter(striker_name),
+                    [],
+                    intern(striker_name),
+                    offset,
+                )
+                named.setdefault(striker[2], offset)
+            non_striker = batting.get(non_striker_name)
+            if non_striker is None:
+                non_striker = (
+                    card.add_batter(non_striker_name),
+                    [],
+                    intern(non_striker_name),
+                    offset,
+                )
+                batting[non_striker_name] = non_striker
+                named.setdefault(non_striker[2], offset)
+            bowler = bowling.get(bowler_name)
+            if bowler is None:
+                bowler = bowling[bowler_name] = (
+                    card.add_bowler(bowler_name),
+                    [],
+                    intern(bowler_name),
+                    offset,
+                )
+                named.setdefault(bowler[2], offset)
+            strikers.append(striker[2])
+            non_strikers.append(non_striker[2])
+            bowlers.append(bowler[2])
+            player_out = fielder = 0
+            if ball.player_out:
+                player_out = intern(ball.player_out)
+                named.setdefault(player_out, offset)
+            if ball.fielder:
+                fielder = intern(ball.fielder)
+                named.setdefault(fielder, offset)
+            players_out.append(player_out)
+            fielders.append(fielder)
+
+            striker[1].append(index)
+            bowler[1].append(index)
+            index += 1
+            if ball.player_out:
+                wickets += 1
+                if ball.player_out == striker_name:
+                    striker[0].record_out(ball)
+                elif ball.player_out == non_striker_name:
+                    non_striker[0].record_out(ball)
+            if ball.extra_runs > 0:
+                extras[ball.extra_type] = (
+                    extras.get(ball.extra_type, 0) + ball.extra_runs
+                )
+
+        for column, values in zip(NAME_COLUMNS, columns):
+            getattr(ledger, column).extend(values)
+        batter_runs = [ball.batter_runs for ball in balls]
+        extra_types = [EXTRA_CODES[ball.extra_type] for ball in balls]
+        extra_runs = [ball.extra_runs for ball in balls]
+        penalty_runs = [ball.penalty_runs for ball in balls]
+        ledger.batter_runs.extend(batter_runs)
+        ledger.extra_type.extend(extra_types)
+        ledger.extra_runs.extend(extra_runs)
+        ledger.penalty_runs.extend(penalty_runs)
+        ledger.how_out.extend([HOW_OUT_CODES[ball.how_out] for ball in balls])
+        ledger.over.extend([card.over] * len(balls))
+        card.analytics.extend(start, index)
+        card.matchups.extend(start, index)
+
+        for batter, indices, _, _ in batting.values():
+            if indices:
+                batter.extend(indices)
+        for bowler, indices, _, _ in bowling.values():
+            bowler.extend(indices)
+        card.runs += sum(batter_runs) + sum(penalty_runs)
+        card.runs += sum(
+            runs for extra_type, runs in zip(extra_types, extra_runs) if extra_type
+        )
+        card.wickets += wickets
+        card.fours += batter_runs.count(4)
+        card.sixes += batter_runs.count(6)
+        # the balls so far in the over before each ball, and after the last: wides and no-balls don't count
+        ball_nos = list(
+            accumulate(
+                (code not in BOWLER_EXTRA_CODES for code in extra_types),
+                initial=card.ball,
+            )
+        )
+        card.ball = ball_nos[-1]
+        card.history.added(index - start)
+        card.revision += 1
+
+        if self.undoable:
+            # update() logs the next positions and names as they stood before each ball, which only the batch's new
+            # players and names moved on
+            new_batters = [
+                met
+                for batter, _, _, met in batting.values()
+                if batter.position >= first_batter
+            ]
+            new_bowlers = [
+                met
+                for bowler, _, _, met in bowling.values()
+                if bowler.position >= first_bowler
+            ]
+            new_names = [
+                named[player_id] for player_id in range(first_name, len(names))
+            ]
+            count = len(balls)
+            self.log.extend(
+                map(
+                    Entry,
+                    balls,
+                    counted(first_batter, new_batters, count),
+                    counted(first_bowler, new_bowlers, count),
+                    counted(first_name, new_names, count),
+                    ball_nos,
+                )
+            )
+
+    def update_ledger(self, source: Ledger, start: int = 0, stop: int | None = None):
+        """
+        Score the deliveries `start` to `stop` of another ledger, ending overs as its `over` column moves on, as
+        over_bowled and update_many would.
+
+        Unless the scorer is undoable, no Balls are built: the columns are copied across and the figures worked out
+        from them a player, or an over, at a time.
+        """
+        stop = len(source) if stop is None else stop
+        if self.undoable:
+            for over, indices in groupby(
+                range(start, stop), key=source.over.__getitem__
+            ):
+                while self.card.over < over:
+                    self.over_bowled()
+                self.update_many(map(source.ball, indices))
+            return
+        if start >= stop:
+            return
+        card = self.card
+        ledger = card.ledger
+        base = len(ledger)
+        columns = [getattr(source, column)[start:stop] for column in NAME_COLUMNS]
+        # interned in the order update_many would meet them
+        ids = {
+            i: ledger.intern(source.names[i])
+            for i in dict.fromkeys(chain.from_iterable(zip(*columns)))
+        }
+        # as they are whenever the source's names were interned in that same order too
+        same_ids = all(i == j for i, j in ids.items())
+        for column, values in zip(NAME_COLUMNS, columns):
+            getattr(ledger, column).extend(
+                values if same_ids else map(ids.__getitem__, values)
+            )
+        for column in COUNT_COLUMNS + ("over",):
+            getattr(ledger, column).extend(getattr(source, column)[start:stop])
+        stop = len(ledger)
+
+        names = ledger.names
+        # player id -> ledger indices of the balls faced and bowled
+        faced: dict[int, list[int]] = {}
+        bowled: dict[int, list[int]] = {}
+        for index, striker, bowler in zip(
+            range(base, stop), ledger.striker[base:], ledger.bowler[base:]
+        ):
+            indices = faced.get(striker)
+            if indices is None:
+                indices = faced[striker] = []
+            indices.append(index)
+            indices = bowled.get(bowler)
+            if indices is None:
+                indices = bowled[bowler] = []
+            indices.append(index)
+        batting = {}
+        for player_id in dict.fromkeys(
+            chain.from_iterable(zip(ledger.striker[base:], ledger.non_striker[base:]))
+        ):
+            batting[player_id] = batter = card.add_batter(names[player_id])
+            if player_id in faced:
+                batter.extend(faced[player_id])
+        for player_id, indices in bowled.items():
+            card.add_bowler(names[player_id]).extend(indices)
+        card.matchups.extend(base, stop)
+
+        for over, group in groupby(range(base, stop), key=ledger.over.__getitem__):
+            while card.over < over:
+                self.bowl_over()
+            indices = list(group)
+            first, last = indices[0], indices[-1] + 1
+            card.analytics.extend(first, last)
+            extra_types = ledger.extra_type[first:last]
+            card.ball += len(extra_types) - sum(
+                extra_types.count(code) for code in BOWLER_EXTRA_CODES
+            )
+
+        batter_runs = ledger.batter_runs[base:]
+        extra_runs = ledger.extra_runs[base:]
+        player_out = ledger.player_out[base:]
+        if player_out.count(0) != len(player_out):
+            card.wickets += len(player_out) - player_out.count(0)
+            for index, out in enumerate(player_out, base):
+                if out and out in (ledger.striker[index], ledger.non_striker[index]):
+                    batting[out].record_out(ledger.ball(index))
+        if any(extra_runs):
+            for extra_type, runs in zip(ledger.extra_type[base:], extra_runs):
+                if runs:
+                    extra = EXTRAS[extra_type]
+                    card.extras[extra] = card.extras.get(extra, 0) + runs
+                    if extra_type:
+                        card.runs += runs
+        card.runs += sum(batter_runs) + sum(ledger.penalty_runs[base:])
+        card.fours += batter_runs.count(4)
+        card.sixes += batter_runs.count(6)
+        card.history.added(stop - base)
+        card.revision += 1
+
+    def replay(self, ledger: Ledger, history: bool = True):
+        """
+        Score every delivery in a ledger. The recent history is formatted once at the end, or with `history` off not
+        at all, and the card then keeps none.
+        """
+        enabled = self.card.history.enabled
+        self.card.history.enabled = False
+        self.update_ledger(ledger)
+        self.card.history.enabled = enabled and history
+        self.card.history.refill()
+
+    def revert(self, entry: Entry):
+        card = self.card
+        card.revision += 1
+        if entry.ball is None:
+            card.over -= 1
+            card.ball = entry.balls
+            card.analytics.over_reverted()
+            return
+
+        ball = entry.ball
+        card.batters[ball.striker].remove(ball)
+        card.bowlers[ball.bowler].remove(ball)
+        card.runs -= ball.total_runs
+        if ball.batter_runs == 4:
+            card.fours -= 1
+        elif ball.batter_runs == 6:
+            card.sixes -= 1
+        if ball.player_out:
+            card.wickets -= 1
+            if ball.player_out == ball.non_striker:
+                card.batters[ball.non_striker].clear_out()
+        if ball.extra_runs > 0:
+            card.extras[ball.extra_type] -= ball.extra_runs
+            if not card.extras[ball.extra_type]:
+                del card.extras[ball.extra_type]
+        card.ball = entry.balls
+        card.analytics.remove(len(card.ledger) - 1)
+        card.matchups.remove(len(card.ledger) - 1)
+        card.ledger.truncate(len(card.ledger) - 1, entry.names)
+        card.history.refill()
+        card.batting_order.truncate(entry.batters)
+        card.bowling_order.truncate(entry.bowlers)
+
+    def undo(self) -> Entry | None:
+        if not self.log:
+            return None
+        entry = self.log.pop()
+        self.revert(entry)
+        self.undone.append(entry)
+        for events in [events for events in self.checkpoints if events > len(self.log)]:
+            del self.checkpoints[events]
+        return entry
+
+    def redo(self) -> Entry | None:
+        if not self.undone:
+            return None
+        entry = self.undone.pop()
+        self.record(self.entry(entry.ball))
+        if entry.ball is None:
+            self.bowl_over()
+        else:
+            self.apply(entry.ball)
+        return entry
+
+    def state_at(self, events: int) -> ScoreCard:
+        """
+        A copy of the card as it stood after the first `events` logged events.
+
+        Replays from the nearest checkpoint before it, so costs at most checkpoint_interval events once the
+        checkpoints up to that point have been made. The first call undoes a copy of the card to the start, for the
+        checkpoint before the first event.
+        """
+        if not self.log:
+            return self.card.copy()
+        if not self.checkpoints:
+            # the card before the first event, from undoing a copy of it all the way back
+            unwinder = Scorer(self.card.copy(), log=list(self.log))
+            while unwinder.undo():
+                pass
+            self.checkpoints[0] = unwinder.card
+        events = max(0, min(events, len(self.log)))
+        start = max(n for n in self.checkpoints if n <= events)
+        replayer = Scorer(self.checkpoints[start].copy())
+        for n in range(start, events):
+            ball = self.log[n].ball
+            if ball is None:
+                replayer.bowl_over()
+            else:
+                replayer.apply(ball)
+            if (
+                n + 1
+            ) % self.checkpoint_interval == 0 and n + 1 not in self.checkpoints:
+                self.checkpoints[n + 1] = replayer.card.copy()
+        return replayer.card
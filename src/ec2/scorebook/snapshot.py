@@ -0,0 +1,240 @@
+"""
+Snapshots of a ScoreCard, as JSON or a compact binary form.
+
+Only the card's totals, the batting and bowling orders, what it knows of the match (the target, the balls an innings
+is limited to and whether it keeps a history) and its ledger are written; each player's deliveries and figures and
+dismissals are rebuilt from the ledger on loading, and the analytics and history are worked out from it as ever.
+
+The binary form is the one to store and send: JSON costs parsing every ledger column as a list of ints and copying it
+into its array, and is kept for when a readable snapshot is wanted.
+"""
+
+import json
+import struct
+import sys
+from array import array
+from itertools import groupby
+from typing import Any
+
+from .analytics import Analytics
+from .extra import Extra
+from .history import History
+from .ledger import COLUMNS, EXTRA_CODES, EXTRAS, TYPECODES, Ledger
+from .score_card import ScoreCard
+
+VERSION = 2
+MAGIC = b"EC2S"
+HEADER = struct.Struct("<4sHIHHHHHIIHHBIIBB")
+EXTRA = struct.Struct("<BH")
+BIG_ENDIAN = sys.byteorder == "big"
+
+
+def to_dict(card: ScoreCard) -> dict[str, Any]:
+    ledger = card.ledger
+    return {
+        "version": VERSION,
+        "runs": card.runs,
+        "wickets": card.wickets,
+        "over": card.over,
+        "ball": card.ball,
+        "fours": card.fours,
+        "sixes": card.sixes,
+        "extras": {str(extra): runs for extra, runs in card.extras.items()},
+        "target": card.analytics.target,
+        "balls_limit": card.analytics.balls_limit,
+        "balls_per_over": card.analytics.balls_per_over,
+        "history": card.history.enabled,
+        "batting": [ledger.ids[batter.name] for batter in card.batting_order.slots],
+        "bowling": [ledger.ids[bowler.name] for bowler in card.bowling_order.slots],
+        "ledger": ledger.to_dict(),
+    }
+
+
+def from_dict(data: dict[str, Any]) -> ScoreCard:
+    if data["version"] != VERSION:
+        raise ValueError(f"unsupported snapshot version {data['version']}")
+    return rebuild(
+        Ledger.from_dict(data["ledger"]),
+        data["batting"],
+        data["bowling"],
+        {Extra(extra): runs for extra, runs in data["extras"].items()},
+        Analytics(
+            target=data["target"],
+            balls_limit=data["balls_limit"],
+            balls_per_over=data["balls_per_over"],
+        ),
+        data["history"],
+        runs=data["runs"],
+        wickets=data["wickets"],
+        over=data["over"],
+        ball=data["ball"],
+        fours=data["fours"],
+        sixes=data["sixes"],
+    )
+
+
+def to_json(card: ScoreCard) -> str:
+    return json.dumps(to_dict(card), separators=(",", ":"))
+
+
+def from_json(text: str | bytes) -> ScoreCard:
+    return from_dict(json.loads(text))
+
+
+def little_endian(values: array) -> bytes:
+    if BIG_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def from_little_endian(typecode: str, data: bytes | memoryview) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if BIG_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def dumps(card: ScoreCard) -> bytes:
+    ledger = card.ledger
+    names = "\n".join(ledger.names).encode()
+    batting = array(
+        "H", (ledger.ids[batter.name] for batter in card.batting_order.slots)
+    )
+    bowling = array(
+        "H", (ledger.ids[bowler.name] for bowler in card.bowling_order.slots)
+    )
+    parts = [
+        HEADER.pack(
+            MAGIC,
+            VERSION,
+            card.runs,
+            card.wickets,
+            card.over,
+            card.ball,
+            card.fours,
+            card.sixes,
+            len(ledger),
+            len(names),
+            len(batting),
+            len(bowling),
+            len(card.extras),
+            card.analytics.target,
+            card.analytics.balls_limit,
+            card.analytics.balls_per_over,
+            card.history.enabled,
+        ),
+        *(EXTRA.pack(EXTRA_CODES[extra], runs) for extra, runs in card.extras.items()),
+        names,
+        little_endian(batting),
+        little_endian(bowling),
+        *(
+            little_endian(array(TYPECODES[column], getattr(ledger, column)))
+            for column in COLUMNS
+        ),
+    ]
+    return b"".join(parts)
+
+
+def loads(data: bytes) -> ScoreCard:
+    view = memoryview(data)
+    (
+        magic,
+        version,
+        runs,
+        wickets,
+        over,
+        ball,
+        fours,
+        sixes,
+        deliveries,
+        names_length,
+        batters,
+        bowlers,
+        extras,
+        target,
+        balls_limit,
+        balls_per_over,
+        history,
+    ) = HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} score card snapshot")
+    offset = HEADER.size
+    card_extras = {}
+    for _ in range(extras):
+        code, extra_runs = EXTRA.unpack_from(view, offset)
+        card_extras[EXTRAS[code]] = extra_runs
+        offset += EXTRA.size
+
+    def take(typecode: str, count: int) -> array:
+        nonlocal offset
+        size = count * array(typecode).itemsize
+        values = from_little_endian(typecode, view[offset : offset + size])
+        offset += size
+        return values
+
+    names = bytes(view[offset : offset + names_length]).decode().split("\n")
+    offset += names_length
+    batting = take("H", batters)
+    bowling = take("H", bowlers)
+    ledger = Ledger(
+        names=names,
+        **{column: take(TYPECODES[column], deliveries) for column in COLUMNS},
+    )
+    return rebuild(
+        ledger,
+        batting,
+        bowling,
+        card_extras,
+        Analytics(
+            target=target, balls_limit=balls_limit, balls_per_over=balls_per_over
+        ),
+        bool(history),
+        runs=runs,
+        wickets=wickets,
+        over=over,
+        ball=ball,
+        fours=fours,
+        sixes=sixes,
+    )
+
+
+def rebuild(
+    ledger: Ledger,
+    batting,
+    bowling,
+    extras: dict[Extra, int],
+    analytics: Analytics,
+    history: bool,
+    **totals: int,
+) -> ScoreCard:
+    card = ScoreCard(
+        ledger=ledger,
+        extras=extras,
+        history=History(enabled=history),
+        analytics=analytics,
+        **totals,
+    )
+    faced = group(ledger.striker)
+    bowled = group(ledger.bowler)
+    for player_id in batting:
+        card.add_batter(ledger.names[player_id]).extend(faced.get(player_id, ()))
+    for player_id in bowling:
+        card.add_bowler(ledger.names[player_id]).extend(bowled.get(player_id, ()))
+    for index, player_id in enumerate(ledger.player_out):
+        if player_id and player_id in (
+            ledger.striker[index],
+            ledger.non_striker[index],
+        ):
+            card.batters[ledger.names[player_id]].record_out(ledger.ball(index))
+    return card
+
+
+def group(column) -> dict[int, list[int]]:
+    """The indices of each player's balls in a ledger column, sorted by player rather than walked a ball at a time."""
+    key = column.__getitem__
+    return {
+        player_id: list(indices)
+        for player_id, indices in groupby(sorted(range(len(column)), key=key), key)
+    }
@@ -0,0 +1,26 @@
+from collections import deque
+from collections.abc import Iterable
+
+
+class Window:
+    """The last `size` values pushed and their sum, in a fixed-size ring so that each push costs the same."""
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError(f"window size must be at least 1, not {size}")
+        self.values: deque[int] = deque(maxlen=size)
+        self.total = 0
+
+    def push(self, value: int) -> None:
+        if len(self.values) == self.values.maxlen:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+
+    def fill(self, values: Iterable[int]) -> None:
+        self.values.clear()
+        self.values.extend(values)
+        self.total = sum(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
@@ -0,0 +1,231 @@
+"""
+Append-only journal of the scoring events of a match, so that a live session can be recovered after a crash.
+
+The file starts with a magic number and version, followed by one record per event:
+
+    length      uint32, of the payload
+    checksum    uint32, CRC-32 of the payload
+    payload     event kind, then for a ball its counts and player names, each UTF-8 after its length as a varint
+
+Writes go straight to the operating system; fsync is done by a background thread every `sync_every` events or
+`sync_ms` milliseconds, whichever comes first, so scoring never waits on the disk. `sync_every=1` has the thread sync
+as soon as each event is written, and `sync_every=0` leaves flushing to the operating system.
+"""
+
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from typing import Self
+
+from ec2.scorebook import Ball, Scorer
+from ec2.scorebook.ledger import EXTRA_CODES, EXTRAS, HOW_OUT_CODES, HOW_OUTS
+
+MAGIC = b"EC2J\x01\x00\x00\x00"
+RECORD = struct.Struct("<II")
+COUNTS = struct.Struct("<BBBBBB")
+NAME_FIELDS = ("striker", "non_striker", "bowler", "player_out", "fielder")
+
+
+class Event(IntEnum):
+    BALL = 1
+    OVER_BOWLED = 2
+    INNINGS_CLOSED = 3
+    UNDO = 4
+    REDO = 5
+
+
+Record = Ball | Event
+
+
+def encode(record: Record) -> bytes:
+    if isinstance(record, Event):
+        payload = bytes([record])
+    else:
+        payload = bytearray([Event.BALL])
+        payload += COUNTS.pack(
+            record.batter_runs,
+            EXTRA_CODES[record.extra_type],
+            record.extra_runs,
+            record.penalty_runs,
+            HOW_OUT_CODES[record.how_out],
+            0,
+        )
+        for name in NAME_FIELDS:
+            encoded = getattr(record, name).encode()
+            length = len(encoded)
+            # 7 bits a byte, low first, the top bit set on all but the last: a single byte for any usual name
+            while length >= 0x80:
+                payload.append(length & 0x7F | 0x80)
+                length >>= 7
+            payload.append(length)
+            payload += encoded
+    return RECORD.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode(payload: bytes) -> Record:
+    if payload[0] != Event.BALL:
+        return Event(payload[0])
+    batter_runs, extra_type, extra_runs, penalty_runs, how_out, _ = COUNTS.unpack_from(
+        payload, 1
+    )
+    names = {}
+    offset = 1 + COUNTS.size
+    for name in NAME_FIELDS:
+        length = shift = 0
+        while True:
+            byte = payload[offset]
+            offset += 1
+            length |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        names[name] = payload[offset : offset + length].decode()
+        offset += length
+    return Ball(
+        batter_runs=batter_runs,
+        extra_type=EXTRAS[extra_type],
+        extra_runs=extra_runs,
+        penalty_runs=penalty_runs,
+        how_out=HOW_OUTS[how_out],
+        **names,
+    )
+
+
+def scan(data: bytes) -> Iterator[tuple[int, Record]]:
+    """The records in a journal's contents with the offset after each, stopping at the first incomplete or
+    corrupt one."""
+    if data[: len(MAGIC)] != MAGIC:
+        return
+    offset = len(MAGIC)
+    while offset + RECORD.size <= len(data):
+        length, checksum = RECORD.unpack_from(data, offset)
+        payload = data[offset + RECORD.size : offset + RECORD.size + length]
+        if length == 0 or len(payload) < length or zlib.crc32(payload) != checksum:
+            return
+        offset += RECORD.size + length
+        yield offset, decode(payload)
+
+
+def read(path: str | Path) -> list[Record]:
+    return [record for _, record in scan(Path(path).read_bytes())]
+
+
+class Journal:
+    def __init__(self, path: str | Path, sync_every: int = 32, sync_ms: float = 50.0):
+        self.path = Path(path)
+        self.sync_every = sync_every
+        self.sync_ms = sync_ms
+        data = self.path.read_bytes() if self.path.exists() else b""
+        # a new file, or one a crash left with only part of the magic number, is started afresh; anything else is
+        # left alone
+        if not data.startswith(MAGIC) and not MAGIC.startswith(data):
+            raise ValueError(f"{self.path} is not a journal")
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT)
+        # drop anything after the last good record, left by a crash part way through a write
+        end = len(MAGIC)
+        for end, _ in scan(data):
+            pass
+        if not data.startswith(MAGIC):
+            os.ftruncate(self.fd, 0)
+            os.write(self.fd, MAGIC)
+        elif end < len(data):
+            os.ftruncate(self.fd, end)
+        os.lseek(self.fd, 0, os.SEEK_END)
+
+        self.pending = 0
+        self.closed = False
+        self.lock = threading.Condition()
+        self.syncer = None
+        if sync_every:
+            self.syncer = threading.Thread(
+                target=self.sync_in_background, name="journal-sync", daemon=True
+            )
+            self.syncer.start()
+
+    def append(self, record: Record) -> None:
+        self.write(encode(record))
+
+    def write(self, data: bytes) -> None:
+        """Append a record already encoded."""
+        with self.lock:
+            os.write(self.fd, data)
+            self.pending += 1
+            if self.sync_every and self.pending >= self.sync_every:
+                self.lock.notify()
+
+    def extend(self, records: Iterable[Record]) -> None:
+        for record in records:
+            self.append(record)
+
+    def sync(self) -> None:
+        with self.lock:
+            self.pending = 0
+        os.fsync(self.fd)
+
+    def sync_in_background(self) -> None:
+        while True:
+            with self.lock:
+                self.lock.wait_for(
+                    lambda: self.closed or self.pending >= self.sync_every,
+                    timeout=self.sync_ms / 1000,
+                )
+                if self.closed:
+                    return
+                pending, self.pending = self.pending, 0
+            if pending:
+                os.fsync(self.fd)
+
+    def close(self) -> None:
+        with self.lock:
+            self.closed = True
+            self.lock.notify()
+        if self.syncer:
+            self.syncer.join()
+        if self.sync_every:
+            os.fsync(self.fd)
+        os.close(self.fd)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+@dataclass
+class Recovered:
+    scorers: list[Scorer] = field(default_factory=lambda: [Scorer(), Scorer()])
+    innings: int = 0  # the innings in progress
+
+
+def recover(path: str | Path) -> Recovered:
+    """Rebuild both innings by replaying a journal, with runs of balls scored through Scorer.update_many."""
+    recovered = Recovered()
+    if not Path(path).exists():
+        return recovered
+    balls: list[Ball] = []
+    for record in read(path):
+        if isinstance(record, Ball):
+            balls.append(record)
+            continue
+        scorer = recovered.scorers[recovered.innings]
+        scorer.update_many(balls)
+        balls.clear()
+        match record:
+            case Event.OVER_BOWLED:
+                scorer.over_bowled()
+            case Event.INNINGS_CLOSED:
+                recovered.innings = min(
+                    recovered.innings + 1, len(recovered.scorers) - 1
+                )
+            case Event.UNDO:
+                scorer.undo()
+            case Event.REDO:
+                scorer.redo()
+    recovered.scorers[recovered.innings].update_many(balls)
+    return recovered
@@ -0,0 +1,453 @@
+"""
+A SQLite warehouse of finished matches, for career, season and venue figures without replaying every match.
+
+    matches             one row per match: its source, format, season, venue and date
+    players             every player name, once
+    deliveries          every ball of every innings, as Ledger columns with names as player ids (0 for none)
+    batting, bowling    each player's figures for each innings, worked out from the deliveries as the scorebook does
+    *_seasons           batting and bowling rolled up by player, format and season
+    *_careers           and by player and format
+
+`add` stores a batch of matches in one transaction: the deliveries and each innings' figures, counted from the ledger
+columns, go in with executemany, and the rollups are then folded together by SQL over just the new matches, so they
+stay current as matches arrive without ever being rebuilt. Matches are keyed by their source, and one already stored
+is skipped.
+"""
+
+import sqlite3
+from collections import Counter
+from collections.abc import Iterable
+from itertools import chain, repeat
+from pathlib import Path
+from typing import Any, Self
+
+from ec2.importers.cricsheet import ImportedMatch
+from ec2.scorebook import ScoreCard
+from ec2.scorebook.ledger import (
+    BOWLER_EXTRA_CODES,
+    BOWLER_WICKET_CODES,
+    COUNT_COLUMNS,
+    HOW_OUTS,
+    Ledger,
+)
+
+BOWLER_WICKETS_SQL = ", ".join(map(str, sorted(BOWLER_WICKET_CODES)))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL UNIQUE,
+    format TEXT NOT NULL,
+    season TEXT NOT NULL,
+    venue TEXT NOT NULL,
+    date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS matches_venue ON matches (venue);
+CREATE TABLE IF NOT EXISTS players (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS deliveries (
+    match INTEGER NOT NULL,
+    innings INTEGER NOT NULL,
+    ball INTEGER NOT NULL,
+    over INTEGER NOT NULL,
+    striker INTEGER NOT NULL,
+    non_striker INTEGER NOT NULL,
+    bowler INTEGER NOT NULL,
+    player_out INTEGER NOT NULL,
+    fielder INTEGER NOT NULL,
+    batter_runs INTEGER NOT NULL,
+    extra_type INTEGER NOT NULL,
+    extra_runs INTEGER NOT NULL,
+    penalty_runs INTEGER NOT NULL,
+    how_out INTEGER NOT NULL,
+    PRIMARY KEY (match, innings, ball)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS deliveries_matchup ON deliveries (striker, bowler);
+CREATE TABLE IF NOT EXISTS batting (
+    match INTEGER NOT NULL,
+    innings INTEGER NOT NULL,
+    player INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    runs INTEGER NOT NULL,
+    balls INTEGER NOT NULL,
+    dots INTEGER NOT NULL,
+    fours INTEGER NOT NULL,
+    sixes INTEGER NOT NULL,
+    how_out INTEGER NOT NULL,
+    PRIMARY KEY (match, innings, player)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS batting_player ON batting (player);
+CREATE TABLE IF NOT EXISTS bowling (
+    match INTEGER NOT NULL,
+    innings INTEGER NOT NULL,
+    player INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    balls INTEGER NOT NULL,
+    runs INTEGER NOT NULL,
+    dots INTEGER NOT NULL,
+    extras INTEGER NOT NULL,
+    wickets INTEGER NOT NULL,
+    PRIMARY KEY (match, innings, player)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS bowling_player ON bowling (player);
+"""
+
+# rollup table -> its figures, each as the aggregate over one batch's innings and how it's folded into the totals
+BATTING_FIGURES = {
+    "matches": "count(DISTINCT b.match)",
+    "innings": "count(*)",
+    "not_outs": "sum(b.how_out = 0)",
+    "runs": "sum(b.runs)",
+    "balls": "sum(b.balls)",
+    "fours": "sum(b.fours)",
+    "sixes": "sum(b.sixes)",
+    "fifties": "sum(b.runs >= 50 AND b.runs < 100)",
+    "hundreds": "sum(b.runs >= 100)",
+    "high": "max(b.runs)",
+}
+BOWLING_FIGURES = {
+    "matches": "count(DISTINCT b.match)",
+    "innings": "count(*)",
+    "balls": "sum(b.balls)",
+    "runs": "sum(b.runs)",
+    "dots": "sum(b.dots)",
+    "extras": "sum(b.extras)",
+    "wickets": "sum(b.wickets)",
+    "five_wickets": "sum(b.wickets >= 5)",
+    "best": "max(b.wickets)",
+}
+ROLLUPS = {
+    "batting_seasons": ("batting", ("format", "season"), BATTING_FIGURES),
+    "batting_careers": ("batting", ("format",), BATTING_FIGURES),
+    "bowling_seasons": ("bowling", ("format", "season"), BOWLING_FIGURES),
+    "bowling_careers": ("bowling", ("format",), BOWLING_FIGURES),
+}
+# figures kept as the best of any innings rather than summed
+BEST = ("high", "best")
+
+
+def rollup_schema(table: str, keys: tuple[str, ...], figures: dict[str, str]) -> str:
+    columns = ", ".join(f"{key} TEXT NOT NULL" for key in keys)
+    counts = ", ".join(f"{figure} INTEGER NOT NULL" for figure in figures)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table} (player INTEGER NOT NULL, {columns}, {counts}, "
+        f"PRIMARY KEY (player, {', '.join(keys)})) WITHOUT ROWID;"
+        # for leaders, which read a season across players
+        + (
+            f"\nCREATE INDEX IF NOT EXISTS {table}_season ON {table} (season);"
+            if "season" in keys
+            else ""
+        )
+    )
+
+
+def rollup_sql(
+    table: str, source: str, keys: tuple[str, ...], figures: dict[str, str]
+) -> str:
+    """Fold the figures of every match from :first on into a rollup table."""
+    columns = ", ".join(("player", *keys, *figures))
+    grouping = ", ".join(("b.player", *(f"m.{key}" for key in keys)))
+    folds = ", ".join(
+        f"{figure} = max({figure}, excluded.{figure})"
+        if figure in BEST
+        else f"{figure} = {figure} + excluded.{figure}"
+        for figure in figures
+    )
+    return (
+        f"INSERT INTO {table} ({columns}) SELECT {grouping}, {', '.join(figures.values())} "
+        f"FROM {source} AS b JOIN matches AS m ON m.id = b.match WHERE b.match >= :first GROUP BY {grouping} "
+        f"ON CONFLICT (player, {', '.join(keys)}) DO UPDATE SET {folds}"
+    )
+
+
+INSERT_DELIVERY = (
+    "INSERT INTO deliveries (match, innings, ball, over, striker, non_striker, bowler, player_out, fielder, "
+    f"{', '.join(COUNT_COLUMNS)}) VALUES ({', '.join('?' * (9 + len(COUNT_COLUMNS)))})"
+)
+INSERT_BATTING = "INSERT INTO batting VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+INSERT_BOWLING = "INSERT INTO bowling VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+
+class Warehouse:
+    def __init__(self, path: str | Path = ":memory:"):
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        if str(path) != ":memory:":
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(
+            SCHEMA
+            + "\n".join(
+                rollup_schema(table, keys, figures)
+                for table, (_, keys, figures) in ROLLUPS.items()
+            )
+        )
+        self.players: dict[str, int] = {
+            name: player
+            for player, name in self.connection.execute("SELECT id, name FROM players")
+        }
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT count(*) FROM matches").fetchone()[0]
+
+    def add(self, matches: Iterable[ImportedMatch]) -> int:
+        """Store a batch of matches, with their innings as score cards or ledgers, and return how many were new."""
+        added = 0
+        with self.connection:
+            first = self.connection.execute(
+                "SELECT coalesce(max(id), 0) + 1 FROM matches"
+            ).fetchone()[0]
+            for imported in matches:
+                added += self.insert(imported)
+            if added:
+                for table, (source, keys, figures) in ROLLUPS.items():
+                    self.connection.execute(
+                        rollup_sql(table, source, keys, figures), {"first": first}
+                    )
+        return added
+
+    def insert(self, imported: ImportedMatch) -> bool:
+        info = imported.info
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO matches (source, format, season, venue, date) VALUES (?, ?, ?, ?, ?)",
+            (
+                imported.source,
+                info.get("match_type", ""),
+                str(info.get("season", "")),
+                info.get("venue", ""),
+                str((info.get("dates") or [""])[0]),
+            ),
+        )
+        if not cursor.rowcount:
+            return False
+        for number, innings in enumerate(imported.innings):
+            self.insert_ledger(
+                cursor.lastrowid,
+                number,
+                innings.ledger if isinstance(innings, ScoreCard) else innings,
+            )
+        return True
+
+    def insert_ledger(self, match: int, innings: int, ledger: Ledger) -> None:
+        ids = [0] + [self.player(name) for name in ledger.names[1:]]
+        player = ids.__getitem__
+        count = len(ledger)
+        self.connection.executemany(
+            INSERT_DELIVERY,
+            zip(
+                repeat(match, count),
+                repeat(innings, count),
+                range(count),
+                ledger.over,
+                map(player, ledger.striker),
+                map(player, ledger.non_striker),
+                map(player, ledger.bowler),
+                map(player, ledger.player_out),
+                map(player, ledger.fielder),
+                *(getattr(ledger, column) for column in COUNT_COLUMNS),
+            ),
+        )
+        self.connection.executemany(
+            INSERT_BATTING, batting(match, innings, ledger, ids)
+        )
+        self.connection.executemany(
+            INSERT_BOWLING, bowling(match, innings, ledger, ids)
+        )
+
+    def player(self, name: str) -> int:
+        player = self.players.get(name)
+        if player is None:
+            player = self.players[name] = self.connection.execute(
+                "INSERT INTO players (name) VALUES (?)", (name,)
+            ).lastrowid
+        return player
+
+    def totals(
+        self, table: str, name: str, where: str = "", parameters: tuple = ()
+    ) -> dict[str, Any]:
+        figures = BATTING_FIGURES if table.startswith("batting") else BOWLING_FIGURES
+        columns = ", ".join(
+            f"coalesce({'max' if figure in BEST else 'sum'}({figure}), 0) AS {figure}"
+            for figure in figures
+        )
+        row = self.connection.execute(
+            f"SELECT {columns} FROM {table} WHERE player = ?{where}",
+            (self.players.get(name, 0), *parameters),
+        ).fetchone()
+        return dict(row)
+
+    def batting(
+        self, name: str, season: str | None = None, format: str | None = None
+    ) -> dict[str, Any]:
+        """A player's batting for their career, or one season, in one format or all of them."""
+        return with_rates(self.rollup("batting", name, season, format))
+
+    def bowling(
+        self, name: str, season: str | None = None, format: str | None = None
+    ) -> dict[str, Any]:
+        return with_rates(self.rollup("bowling", name, season, format))
+
+    def rollup(
+        self, kind: str, name: str, season: str | None, format: str | None
+    ) -> dict[str, Any]:
+        where, parameters = "", ()
+        if season is not None:
+            where, parameters = " AND season = ?", (season,)
+        if format is not None:
+            where, parameters = where + " AND format = ?", (*parameters, format)
+        return self.totals(
+            f"{kind}_{'seasons' if season is not None else 'careers'}",
+            name,
+            where,
+            parameters,
+        )
+
+    def batting_at(
+        self, name: str, venue: str, format: str | None = None
+    ) -> dict[str, Any]:
+        """A player's batting at one venue, from their innings there."""
+        figures = ", ".join(
+            f"coalesce({aggregate}, 0) AS {figure}"
+            for figure, aggregate in BATTING_FIGURES.items()
+        )
+        where, parameters = "", ()
+        if format is not None:
+            where, parameters = " AND m.format = ?", (format,)
+        row = self.connection.execute(
+            f"SELECT {figures} FROM batting AS b JOIN matches AS m ON m.id = b.match "
+            f"WHERE b.player = ? AND m.venue = ?{where}",
+            (self.players.get(name, 0), venue, *parameters),
+        ).fetchone()
+        return with_rates(dict(row))
+
+    def leaders(
+        self,
+        kind: str = "batting",
+        figure: str = "runs",
+        season: str | None = None,
+        format: str | None = None,
+        limit: int = 10,
+    ) -> list[tuple[str, int]]:
+        """The players with the most of a batting or bowling figure, for a season or careers, most first."""
+        figures = {"batting": BATTING_FIGURES, "bowling": BOWLING_FIGURES}[kind]
+        if figure not in figures:
+            raise ValueError(f"no {kind} figure {figure!r}")
+        table = f"{kind}_{'seasons' if season is not None else 'careers'}"
+        aggregate = "max" if figure in BEST else "sum"
+        where, parameters = [], []
+        if season is not None:
+            where.append("season = ?")
+            parameters.append(season)
+        if format is not None:
+            where.append("format = ?")
+            parameters.append(format)
+        rows = self.connection.execute(
+            f"SELECT p.name, {aggregate}(r.{figure}) AS total FROM {table} AS r JOIN players AS p ON p.id = r.player "
+            f"{'WHERE ' + ' AND '.join(where) if where else ''} GROUP BY r.player ORDER BY total DESC, p.name LIMIT ?",
+            (*parameters, limit),
+        )
+        return [(name, total) for name, total in rows]
+
+    def matchup(self, batter: str, bowler: str) -> dict[str, int]:
+        """Every ball a batter has faced from a bowler: balls, runs off the bat and the bowler's dismissals of them."""
+        row = self.connection.execute(
+            "SELECT count(*) AS balls, coalesce(sum(batter_runs), 0) AS runs, "
+            f"coalesce(sum(player_out = striker AND how_out IN ({BOWLER_WICKETS_SQL})), 0) AS dismissals "
+            "FROM deliveries WHERE striker = ? AND bowler = ?",
+            (self.players.get(batter, 0), self.players.get(bowler, 0)),
+        ).fetchone()
+        return dict(row)
+
+    def innings(self, source: str, innings: int) -> list[dict[str, Any]]:
+        """The batting card of one innings of a stored match, in batting order."""
+        rows = self.connection.execute(
+            "SELECT p.name, b.position, b.runs, b.balls, b.dots, b.fours, b.sixes, b.how_out "
+            "FROM batting AS b JOIN matches AS m ON m.id = b.match JOIN players AS p ON p.id = b.player "
+            "WHERE m.source = ? AND b.innings = ? ORDER BY b.position",
+            (source, innings),
+        )
+        return [dict(row) | {"how_out": HOW_OUTS[row["how_out"]]} for row in rows]
+
+
+def batting(
+    match: int, innings: int, ledger: Ledger, ids: list[int]
+) -> list[tuple[int, ...]]:
+    """
+    Rows of the batting table for an innings, in the order the batters came in, striker before non-striker, as
+    BattingOrder numbers them. Counting (batter, runs) pairs leaves the work per ball to Counter.
+    """
+    order = dict.fromkeys(chain.from_iterable(zip(ledger.striker, ledger.non_striker)))
+    faced = Counter(zip(ledger.striker, ledger.batter_runs))
+    figures = {
+        player: [0, 0, 0, 0, 0, 0] for player in order
+    }  # runs, balls, dots, fours, sixes, how out
+    for (player, runs), count in faced.items():
+        figure = figures[player]
+        figure[0] += runs * count
+        figure[1] += count
+        if runs == 0:
+            figure[2] += count
+        elif runs == 4:
+            figure[3] += count
+        elif runs == 6:
+            figure[4] += count
+    how_out = ledger.how_out
+    for index, player in enumerate(ledger.player_out):
+        # someone out who never came to the crease, timed out say, has no row, as on the scorebook's card
+        if player in figures:
+            figures[player][5] = how_out[index]
+    return [
+        (match, innings, ids[player], position, *figures[player])
+        for position, player in enumerate(order, start=1)
+    ]
+
+
+def bowling(
+    match: int, innings: int, ledger: Ledger, ids: list[int]
+) -> list[tuple[int, ...]]:
+    """Rows of the bowling table for an innings, in the order the bowlers came on, figured as Bowler does."""
+    figures = {
+        player: [0, 0, 0, 0, 0] for player in dict.fromkeys(ledger.bowler)
+    }  # balls, runs, dots, extras, wickets
+    deliveries = Counter(
+        zip(ledger.bowler, ledger.batter_runs, ledger.extra_type, ledger.extra_runs)
+    )
+    for (player, runs, extra_type, extra_runs), count in deliveries.items():
+        figure = figures[player]
+        extras = extra_runs if extra_type in BOWLER_EXTRA_CODES else 0
+        figure[0] += count
+        figure[1] += (runs + extras) * count
+        if not runs + extras:
+            figure[2] += count
+        figure[3] += extras * count
+    how_out = ledger.how_out
+    for index, player in enumerate(ledger.player_out):
+        if player and how_out[index] in BOWLER_WICKET_CODES:
+            figures[ledger.bowler[index]][4] += 1
+    return [
+        (match, innings, ids[player], position, *figure)
+        for position, (player, figure) in enumerate(figures.items(), 1)
+    ]
+
+
+def with_rates(figures: dict[str, Any]) -> dict[str, Any]:
+    """Batting average and strike rate, or bowling average, economy and strike rate, alongside the totals."""
+    runs, balls = figures["runs"], figures["balls"]
+    if "wickets" in figures:
+        wickets = figures["wickets"]
+        figures["average"] = runs / wickets if wickets else None
+        figures["economy"] = runs * 6 / balls if balls else None
+        figures["strike_rate"] = balls / wickets if wickets else None
+    else:
+        outs = figures["innings"] - figures["not_outs"]
+        figures["average"] = runs / outs if outs else None
+        figures["strike_rate"] = runs * 100 / balls if balls else None
+    return figures
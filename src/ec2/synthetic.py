@@ -0,0 +1,433 @@
+"""
+Seeded synthetic matches for load and scale testing, as ledgers or Cricsheet JSON files.
+
+A Generator plays a batch of innings in step, one delivery of every innings in the batch at a time, with NumPy. Each
+delivery's kind (a dot, runs off the bat, a wide, no-ball, bye or leg-bye, or a wicket) is drawn from the format's
+PROFILES, and then a detail for it: how many wides or byes, the runs off a no-ball, or whether a run was completed
+before a run out. The batters change ends on odd runs run and at the end of each six-legal-ball over, the new batter
+takes the dismissed one's end, and the bowler changes every over among the last five of the fielding side, so no one
+bowls two in a row or more than their share of a limited-overs innings. Catches, stumpings and run outs name a
+fielder (the wicket-keeper for stumpings, the bowler for caught and bowled), and a run out can be of either batter.
+
+Innings end all out, at the format's overs, or once a chase passes its target. Limited-overs matches have two
+innings; Tests four, the last chasing what the others leave, or none if the side batting second already leads by an
+innings. The same seed, format and batch size give the same matches.
+
+    python -m ec2.synthetic DIRECTORY [--format T20|ODI|Test] [--matches N] [--seed N]
+
+writes them as DIRECTORY/<n>.json, for cricsheet.ingest. numpy is needed: `pip install ec2[synthetic]`.
+"""
+
+import argparse
+import json
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ec2.importers.cricsheet import ImportedMatch
+from ec2.scorebook import Extra, HowOut, Ledger
+from ec2.scorebook.ledger import (
+    COLUMNS,
+    EXTRA_CODES,
+    EXTRAS,
+    HOW_OUT_CODES,
+    HOW_OUTS,
+    TYPECODES,
+)
+
+# overs per innings, None for unlimited, and the innings per match
+FORMATS = {"T20": (20, 2), "ODI": (50, 2), "Test": (None, 4)}
+# an unlimited innings is cut off here, drawn
+MAX_OVERS = 200
+BALLS_PER_OVER = 6
+PLAYERS = 11
+# fielding positions: the keeper, and the five bowlers who share the overs
+KEEPER = 5
+BOWLERS = 5
+
+KINDS = ("dot", "1", "2", "3", "4", "6", "wide", "noball", "bye", "legbye", "wicket")
+# chances of each kind of delivery, in KINDS order
+PROFILES = {
+    "T20": (0.34, 0.36, 0.07, 0.005, 0.11, 0.05, 0.035, 0.005, 0.005, 0.02, 0.05),
+    "ODI": (0.50, 0.30, 0.06, 0.01, 0.07, 0.012, 0.025, 0.004, 0.004, 0.015, 0.028),
+    "Test": (0.66, 0.18, 0.04, 0.01, 0.06, 0.004, 0.006, 0.005, 0.006, 0.01, 0.017),
+}
+# each kind's details: (chance, runs off the bat, extra runs, runs run)
+DETAILS = {
+    "dot": [(1.0, 0, 0, 0)],
+    "1": [(1.0, 1, 0, 1)],
+    "2": [(1.0, 2, 0, 2)],
+    "3": [(1.0, 3, 0, 3)],
+    "4": [(1.0, 4, 0, 0)],
+    "6": [(1.0, 6, 0, 0)],
+    "wide": [(0.9, 0, 1, 0), (0.05, 0, 2, 1), (0.05, 0, 5, 0)],
+    "noball": [(0.5, 0, 1, 0), (0.3, 1, 1, 1), (0.15, 4, 1, 0), (0.05, 6, 1, 0)],
+    "bye": [(0.8, 0, 1, 1), (0.05, 0, 2, 2), (0.15, 0, 4, 0)],
+    "legbye": [(0.8, 0, 1, 1), (0.05, 0, 2, 2), (0.15, 0, 4, 0)],
+}
+EXTRA_KINDS = {
+    "wide": Extra.WIDE,
+    "noball": Extra.NOBALL,
+    "bye": Extra.BYE,
+    "legbye": Extra.LEGBYE,
+}
+# how wickets fall: (chance, how out, fielder, runs run first) with the fielder one of FIELDERS
+DISMISSALS = (
+    (0.18, HowOut.BOWLED, None, 0),
+    (0.55, HowOut.CAUGHT, "any", 0),
+    (0.03, HowOut.CAUGHT, "bowler", 0),
+    (0.14, HowOut.LBW, None, 0),
+    (0.03, HowOut.STUMPED, "keeper", 0),
+    (0.06, HowOut.RUN_OUT, "any", 0),
+    (0.01, HowOut.RUN_OUT, "any", 1),
+)
+FIELDERS = (None, "any", "keeper", "bowler")
+# the chance a run out is of the non-striker
+NON_STRIKER_RUN_OUT = 0.4
+CRICSHEET_EXTRAS = {
+    Extra.WIDE: "wides",
+    Extra.NOBALL: "noballs",
+    Extra.BYE: "byes",
+    Extra.LEGBYE: "legbyes",
+}
+CRICSHEET_KINDS = {
+    HowOut.BOWLED: "bowled",
+    HowOut.CAUGHT: "caught",
+    HowOut.LBW: "lbw",
+    HowOut.STUMPED: "stumped",
+    HowOut.RUN_OUT: "run out",
+    HowOut.OTHER: "retired hurt",
+}
+RUN_OUT = HOW_OUT_CODES[HowOut.RUN_OUT]
+# each delivery's outcome is looked up from 16 random bits, so chances are rounded to 1/65536
+DRAW = 1 << 16
+# ledger ids: the batting side's are 1-11 in order, the fielding side's 12-22, the last five of whom bowl
+KEEPER_ID = PLAYERS + 1 + KEEPER
+FIRST_BOWLER_ID = 2 * PLAYERS + 1 - BOWLERS
+
+
+def outcomes(format: str) -> dict[str, np.ndarray]:
+    """Every outcome of a delivery, each kind with each of its details: the outcome for each draw, and their columns."""
+    rows = []
+    for kind, chance in zip(KINDS, PROFILES[format]):
+        if kind == "wicket":
+            for share, how_out, fielder, ran in DISMISSALS:
+                rows.append(
+                    (chance * share, ran, Extra.NO_EXTRA, 0, ran, how_out, fielder)
+                )
+        else:
+            extra = EXTRA_KINDS.get(kind, Extra.NO_EXTRA)
+            for share, batter_runs, extra_runs, ran in DETAILS[kind]:
+                rows.append(
+                    (
+                        chance * share,
+                        batter_runs,
+                        extra,
+                        extra_runs,
+                        ran,
+                        HowOut.NOTOUT,
+                        None,
+                    )
+                )
+    chances, batter_runs, extras, extra_runs, ran, how_outs, fielders = zip(*rows)
+    cumulative = np.cumsum(chances)
+    return {
+        "draws": np.searchsorted(
+            cumulative / cumulative[-1], (np.arange(DRAW) + 0.5) / DRAW
+        ).astype(np.uint8),
+        "batter_runs": np.array(batter_runs),
+        "extra_type": np.array([EXTRA_CODES[extra] for extra in extras]),
+        "extra_runs": np.array(extra_runs),
+        "odd": np.array(ran) % 2 == 1,
+        "legal": np.array(
+            [extra not in (Extra.WIDE, Extra.NOBALL) for extra in extras]
+        ),
+        "how_out": np.array([HOW_OUT_CODES[how_out] for how_out in how_outs]),
+        "fielder": np.array([FIELDERS.index(fielder) for fielder in fielders]),
+    }
+
+
+@dataclass
+class Innings:
+    """A batch of innings played in step: each one's ledger and where it finished."""
+
+    ledgers: list[Ledger]
+    runs: np.ndarray
+    wickets: np.ndarray
+
+
+@dataclass
+class Generator:
+    format: str = "T20"
+    seed: int | None = None
+    batch: int = 2048
+    teams: int = 20
+    start: date = date(2020, 1, 1)
+    tables: dict[str, np.ndarray] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.format not in FORMATS:
+            raise ValueError(f"unknown format {self.format!r}")
+        self.rng = np.random.default_rng(self.seed)
+        self.tables = outcomes(self.format)
+        self.overs, self.innings_per_match = FORMATS[self.format]
+        self.squads = [
+            [f"Team {team} Player {n}" for n in range(1, PLAYERS + 1)]
+            for team in range(1, self.teams + 1)
+        ]
+        self.played = 0
+
+    def matches(self, count: int) -> Iterator[ImportedMatch]:
+        """`count` matches, their innings as ledgers, a batch at a time."""
+        while count > 0:
+            size = min(count, self.batch)
+            yield from self.play(size)
+            count -= size
+
+    def play(self, size: int) -> list[ImportedMatch]:
+        pairs = [self.rng.choice(self.teams, 2, replace=False) for _ in range(size)]
+        squads = [[self.squads[a], self.squads[b]] for a, b in pairs]
+        no_target = np.full(size, np.iinfo(np.int64).max)
+        played = [self.innings([s[0] + s[1] for s in squads], no_target)]
+        if self.innings_per_match == 2:
+            played.append(
+                self.innings([s[1] + s[0] for s in squads], played[0].runs + 1)
+            )
+        else:
+            played.append(self.innings([s[1] + s[0] for s in squads], no_target))
+            played.append(self.innings([s[0] + s[1] for s in squads], no_target))
+            # the side batting second needs what the others leave, unless it already leads by an innings
+            target = played[0].runs + played[2].runs - played[1].runs + 1
+            played.append(self.innings([s[1] + s[0] for s in squads], target))
+        matches = []
+        for number, ((a, b), squad) in enumerate(zip(pairs, squads)):
+            innings = [
+                inn.ledgers[number] for inn in played if len(inn.ledgers[number])
+            ]
+            info = self.info(
+                a, b, squad, [(inn.runs[number], inn.wickets[number]) for inn in played]
+            )
+            matches.append(
+                ImportedMatch(f"synthetic/{self.format}/{self.played}", info, innings)
+            )
+            self.played += 1
+        return matches
+
+    def innings(self, players: list[list[str]], targets: np.ndarray) -> Innings:
+        """
+        A batch of innings, one per list of names: the batting side in order then the fielding side, the last five of
+        whom bowl. Each innings ends when it passes its target, if it has one worth chasing.
+        """
+        t = self.tables
+        size = len(players)
+        limit = self.overs or MAX_OVERS
+        live = targets > 0
+        runs = np.zeros(size, np.int64)
+        wickets = np.zeros(size, np.int64)
+        balls = np.zeros(size, np.int64)
+        over = np.zeros(size, np.int64)
+        striker = np.zeros(size, np.int64)
+        non_striker = np.ones(size, np.int64)
+        next_in = np.full(size, 2)
+        no_penalty = np.zeros(size, np.int64)
+        # each delivery's columns, by step then innings, and whether the innings was still going
+        steps: dict[str, list[np.ndarray]] = {column: [] for column in COLUMNS}
+        lives = []
+        while live.any():
+            # 16 bits for the outcome, the fielder and which batter is run out
+            bits = (
+                self.rng.bit_generator.random_raw(size)
+                .view(np.uint16)
+                .reshape(size, 4)
+                .T
+            )
+            outcome = t["draws"][bits[0]]
+            batter_runs = t["batter_runs"][outcome]
+            extra_runs = t["extra_runs"][outcome]
+            how_out = t["how_out"][outcome]
+            bowler = FIRST_BOWLER_ID + over % BOWLERS
+            out = np.where(
+                (how_out == RUN_OUT) & (bits[1] < NON_STRIKER_RUN_OUT * DRAW),
+                non_striker,
+                striker,
+            )
+            anyone = PLAYERS + 1 + bits[2] % PLAYERS
+            steps["striker"].append(striker + 1)
+            steps["non_striker"].append(non_striker + 1)
+            steps["bowler"].append(bowler)
+            steps["player_out"].append((out + 1) * (how_out > 0))
+            steps["fielder"].append(
+                np.choose(t["fielder"][outcome], (0, anyone, KEEPER_ID, bowler))
+            )
+            steps["batter_runs"].append(batter_runs)
+            steps["extra_type"].append(t["extra_type"][outcome])
+            steps["extra_runs"].append(extra_runs)
+            steps["penalty_runs"].append(no_penalty)
+            steps["how_out"].append(how_out)
+            steps["over"].append(over)
+            lives.append(live)
+
+            runs = runs + (batter_runs + extra_runs) * live
+            swap = t["odd"][outcome] & live
+            striker, non_striker = (
+                np.where(swap, non_striker, striker),
+                np.where(swap, striker, non_striker),
+            )
+            wicket = (how_out > 0) & live
+            striker = np.where(wicket & (striker == out), next_in, striker)
+            non_striker = np.where(wicket & (non_striker == out), next_in, non_striker)
+            next_in = next_in + wicket
+            wickets = wickets + wicket
+            legal = t["legal"][outcome] & live
+            balls = balls + legal
+            over_done = legal & (balls % BALLS_PER_OVER == 0)
+            over = over + over_done
+            striker, non_striker = (
+                np.where(over_done, non_striker, striker),
+                np.where(over_done, striker, non_striker),
+            )
+            live = live & (wickets < PLAYERS - 1) & (over < limit) & (runs < targets)
+
+        mask = np.array(lives).T
+        lengths = mask.sum(axis=1)
+        ends = np.cumsum(lengths)
+        columns = {
+            column: np.array(values)
+            .T[mask]
+            .astype(np.uint16 if TYPECODES[column] == "H" else np.uint8)
+            for column, values in steps.items()
+        }
+        ledgers = [
+            Ledger(
+                ["", *names],
+                **{
+                    column: array(
+                        TYPECODES[column], values[stop - length : stop].tobytes()
+                    )
+                    for column, values in columns.items()
+                },
+            )
+            for names, length, stop in zip(players, lengths.tolist(), ends.tolist())
+        ]
+        return Innings(ledgers, runs, wickets)
+
+    def info(
+        self, a: int, b: int, squads: list[list[str]], innings: list[tuple[int, int]]
+    ) -> dict[str, Any]:
+        teams = [f"Team {a + 1}", f"Team {b + 1}"]
+        day = self.start + timedelta(days=int(self.played))
+        info = {
+            "balls_per_over": BALLS_PER_OVER,
+            "dates": [day.isoformat()],
+            "gender": "male",
+            "match_type": self.format,
+            "players": dict(zip(teams, squads)),
+            "season": str(day.year),
+            "team_type": "club",
+            "teams": teams,
+            "venue": f"Ground {int(self.rng.integers(1, 50))}",
+            "outcome": self.outcome(teams, innings),
+        }
+        if self.overs:
+            info["overs"] = self.overs
+        return info
+
+    def outcome(
+        self, teams: list[str], innings: list[tuple[int, int]]
+    ) -> dict[str, Any]:
+        runs = [int(total) for total, _ in innings]
+        wickets = int(innings[-1][1])
+        target = sum(runs[::2]) - sum(runs[1:-1:2]) + 1
+        if target <= 0:
+            return {"winner": teams[1], "by": {"innings": 1, "runs": 1 - target}}
+        if runs[-1] >= target:
+            return {"winner": teams[1], "by": {"wickets": PLAYERS - 1 - wickets}}
+        if wickets < PLAYERS - 1 and not self.overs:
+            return {"result": "draw"}
+        if runs[-1] == target - 1:
+            return {"result": "tie"}
+        return {"winner": teams[0], "by": {"runs": target - 1 - runs[-1]}}
+
+
+def to_cricsheet(imported: ImportedMatch) -> dict[str, Any]:
+    """A match of ledgers as Cricsheet JSON data, as cricsheet.load_ledgers reads it."""
+    teams = imported.info["teams"]
+    innings = []
+    for number, ledger in enumerate(imported.innings):
+        overs: list[dict[str, Any]] = []
+        names = ledger.names
+        for index in range(len(ledger)):
+            if not overs or overs[-1]["over"] != ledger.over[index]:
+                overs.append({"over": ledger.over[index], "deliveries": []})
+            batter_runs, extra_runs = (
+                ledger.batter_runs[index],
+                ledger.extra_runs[index],
+            )
+            delivery: dict[str, Any] = {
+                "batter": names[ledger.striker[index]],
+                "bowler": names[ledger.bowler[index]],
+                "non_striker": names[ledger.non_striker[index]],
+                "runs": {
+                    "batter": batter_runs,
+                    "extras": extra_runs,
+                    "total": batter_runs + extra_runs,
+                },
+            }
+            extra = EXTRAS[ledger.extra_type[index]]
+            if extra != Extra.NO_EXTRA:
+                delivery["extras"] = {CRICSHEET_EXTRAS[extra]: extra_runs}
+            if ledger.player_out[index]:
+                how_out = HOW_OUTS[ledger.how_out[index]]
+                wicket: dict[str, Any] = {
+                    "kind": CRICSHEET_KINDS[how_out],
+                    "player_out": names[ledger.player_out[index]],
+                }
+                if ledger.fielder[index]:
+                    if (
+                        how_out == HowOut.CAUGHT
+                        and ledger.fielder[index] == ledger.bowler[index]
+                    ):
+                        wicket["kind"] = "caught and bowled"
+                    wicket["fielders"] = [{"name": names[ledger.fielder[index]]}]
+                delivery["wickets"] = [wicket]
+            overs[-1]["deliveries"].append(delivery)
+        innings.append({"team": teams[number % 2], "overs": overs})
+    created = imported.info["dates"][0]
+    meta = {"data_version": "1.0.0", "created": created, "revision": 1}
+    return {"meta": meta, "info": imported.info, "innings": innings}
+
+
+def write(directory: str | Path, matches: Iterator[ImportedMatch]) -> int:
+    """Write each match as Cricsheet JSON into a directory, named by its number, and return how many."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for imported in matches:
+        name = imported.source.rsplit("/", 1)[-1]
+        (directory / f"{name}.json").write_text(
+            json.dumps(to_cricsheet(imported), separators=(",", ":"))
+        )
+        written += 1
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--format", choices=FORMATS, default="T20")
+    parser.add_argument("--matches", type=int, default=100)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    written = write(
+        args.directory, Generator(args.format, args.seed).matches(args.matches)
+    )
+    print(f"{written} {args.format} matches written to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
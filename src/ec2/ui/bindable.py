@@ -0,0 +1,35 @@
+"""
+Bindable versions of the scorebook classes, for UI code that binds elements straight to a card's figures.
+
+The scorebook itself is plain dataclasses with no NiceGUI import. These subclasses make every field a NiceGUI
+BindableProperty, so that each write propagates to bound elements at once, at the cost of that propagation on every
+write. Build a card with bindable_card() and score it with an ordinary Scorer.
+"""
+
+from dataclasses import fields
+from typing import Any
+
+from nicegui import binding
+
+from ec2.scorebook import Batter, BattingOrder, Bowler, BowlingOrder, ScoreCard
+
+
+def bindable[T](cls: type[T], **attributes: Any) -> type[T]:
+    """A subclass of a scorebook dataclass with every field bindable."""
+    namespace = {f.name: binding.BindableProperty() for f in fields(cls)} | attributes
+    return type(f"Bindable{cls.__name__}", (cls,), namespace)
+
+
+BindableBatter = bindable(Batter)
+BindableBowler = bindable(Bowler)
+BindableBattingOrder = bindable(BattingOrder, batter_class=BindableBatter)
+BindableBowlingOrder = bindable(BowlingOrder, bowler_class=BindableBowler)
+BindableScoreCard = bindable(ScoreCard)
+
+
+def bindable_card(**kwargs: Any) -> ScoreCard:
+    return BindableScoreCard(
+        batting_order=BindableBattingOrder(),
+        bowling_order=BindableBowlingOrder(),
+        **kwargs,
+    )
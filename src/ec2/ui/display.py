@@ -1,33 +1,85 @@
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
 from nicegui import ui
 
+from ec2.live.registry import Match
+from ec2.live.scoring import Applied
 from ec2.scorebook import Ball, Extra, HowOut, ScoreCard, Scorer
+from ec2.scorebook.scorer import Entry
+from ec2.storage.journal import Event
+
+if TYPE_CHECKING:
+    from ec2.projection import Projector
 
 
 class InningsCard:
-    def __init__(self, card: ScoreCard):
+    """
+    An innings' score, batters and bowlers, redrawn only when the card's revision changes, and then only the players
+    whose own revision has, from their cached html.
+    """
+
+    def __init__(self, card: ScoreCard, interval: float = 0.1):
         self.card = card
+        self.interval = interval
+        self.revision = -1
+        self.shown: dict[ui.html, tuple[int, int]] = {}
 
     def innings_card(self):
         with ui.column().classes("w-full"):
             with ui.card().tight().props("flat border-none"):
                 with ui.row():
-                    ui.html().bind_content_from(self.card, "score").classes("text-emerald-800 text-3xl")
+                    self.score = ui.html(self.card.score).classes(
+                        "text-emerald-800 text-3xl"
+                    )
+                self.summary = ui.html(self.analytics_html()).classes("text-sm")
 
             with ui.card().tight().props("flat border-none"):
                 ui.label("Batting").classes("text-rose-800")
-                for pos in range(1, 12):
-                    ui.html().bind_content_from(
-                        self.card.batting_order, f"batter_{pos}", backward=lambda batter: batter().html
-                    )
+                self.batter_slots = [ui.html() for _ in range(11)]
 
             with ui.card().tight().props("flat border-none"):
                 ui.label("Bowling").classes("text-rose-800")
-                for pos in range(1, 12):
-                    ui.html().bind_content_from(
-                        self.card.bowling_order, f"bowler_{pos}", backward=lambda bowler: bowler().html
-                    )
+                self.bowler_slots = [ui.html() for _ in range(11)]
+
+        ui.timer(self.interval, self.refresh)
+
+    def innings_log(self):
+        ui.label("Recent history").classes("text-sky-400")
+        self.recent_history = ui.textarea(value=self.card.last_6).classes("w-full")
+
+    def refresh(self):
+        if self.card.revision == self.revision:
+            return
+        self.revision = self.card.revision
+        self.score.set_content(self.card.score)
+        self.summary.set_content(self.analytics_html())
+        self.refresh_slots(self.batter_slots, self.card.batting_order.batter)
+        self.refresh_slots(self.bowler_slots, self.card.bowling_order.bowler)
+        if hasattr(self, "recent_history"):
+            self.recent_history.set_value(self.card.last_6)
+
+    def analytics_html(self) -> str:
+        analytics = self.card.analytics
+        rates = f"RR {analytics.run_rate:.2f}"
+        if analytics.required_rate is not None:
+            rates += f" &middot; RRR {analytics.required_rate:.2f}"
+        rates += f" &middot; last {self.card.window_overs} ov {self.card.recent_runs}"
+        partnership = f"Partnership {analytics.partnership_runs[-1]} ({analytics.partnership_balls[-1]})"
+        fall = ", ".join(
+            f"{n}-{runs} ({over})"
+            for n, (runs, over, _) in enumerate(analytics.fall_of_wickets, 1)
+        )
+        return f"<div>{rates} &middot; {partnership}</div>" + (
+            f"<div>FoW: {fall}</div>" if fall else ""
+        )
+
+    def refresh_slots(self, slots: list[ui.html], player_at):
+        for position, slot in enumerate(slots, start=1):
+            player = player_at(position)
+            if self.shown.get(slot) != (id(player), player.revision):
+                self.shown[slot] = (id(player), player.revision)
+                slot.set_content(player.html)
 
 
 @dataclass
@@ -42,49 +94,78 @@ class Display:
     player_out: str = ""
     how_out: str = "no"
     fielder: str = ""
-    card_1: ScoreCard = field(default_factory=ScoreCard)
-    card_2: ScoreCard = field(default_factory=ScoreCard)
+    match: Match = field(default_factory=lambda: Match("match"))
+    # projects the innings after every ball when set, with the model fitted for `format`; it needs numpy
+    projector: "Projector | None" = None
+    format: str = "T20"
 
     batters: set[str] = field(default_factory=set)
 
+    def __post_init__(self):
+        self.card_1, self.card_2 = (scorer.card for scorer in self.match.scorers)
+
+    @property
+    def scorer(self) -> Scorer:
+        return self.match.scorer
+
     def show(self):
+        # scoring goes through the match's queue, and this page is redrawn once per frame of events applied, while
+        # it's connected
+        self.client = ui.context.client
+        self.client.on_connect(self.attach)
+        self.client.on_disconnect(self.detach)
         self.inns1 = InningsCard(self.card_1)
         self.inns2 = InningsCard(self.card_2)
-        self.scorer = Scorer(card=self.card_1)
-        self.card = self.card_1
-        ui.page_title("ec2")
+        ui.page_title(f"ec2 - {self.match.match_id}")
         with ui.row():
             with ui.column():
                 with ui.card():
                     self.ball_creator()
                 with ui.card():
                     self.player_selection()
+                with ui.card():
+                    self.scrubber()
+                    self.queue_status = ui.label().classes("text-xs text-gray-500")
+                if self.projector is not None:
+                    with ui.card():
+                        self.projection = ui.label().classes("text-sm")
             with ui.column():
                 with ui.tabs().classes("w-full") as tabs:
                     self.first_inns = ui.tab("First")
                     second_inns = ui.tab("Second")
-                with ui.tab_panels(tabs, value=self.first_inns).classes("w-full"):
-                    with ui.tab_panel(self.first_inns):
-                        with ui.column().classes("w-96"):
-                            with ui.card().classes("w-full"):
-                                self.inns1.innings_card()
-                            with ui.card().classes("w-full"):
-                                self.innings_log(self.card_1)
-                            ui.button("Innings Closed").on_click(self.innings_closed)
-                    with ui.tab_panel(second_inns):
-                        with ui.column().classes("w-96"):
-                            with ui.card().classes("w-full"):
-                                self.inns2.innings_card()
-                            with ui.card().classes("w-full"):
-                                self.innings_log(self.card_2)
+                with ui.tab_panels(
+                    tabs, value=(self.first_inns, second_inns)[self.match.innings]
+                ).classes("w-full"):
+                    with ui.tab_panel(self.first_inns), ui.column().classes("w-96"):
+                        with ui.card().classes("w-full"):
+                            self.inns1.innings_card()
+                        with ui.card().classes("w-full"):
+                            self.inns1.innings_log()
+                        ui.button("Innings Closed").on_click(self.innings_closed)
+                    with ui.tab_panel(second_inns), ui.column().classes("w-96"):
+                        with ui.card().classes("w-full"):
+                            self.inns2.innings_card()
+                        with ui.card().classes("w-full"):
+                            self.inns2.innings_log()
+
+    def attach(self):
+        if self.render not in self.match.scoring.renderers:
+            self.match.scoring.renderers.append(self.render)
+
+    def detach(self):
+        if self.render in self.match.scoring.renderers:
+            self.match.scoring.renderers.remove(self.render)
 
     def innings_closed(self):
-        self.scorer = Scorer(self.card_2)
-        self.card = self.card_2
+        self.match.scoring.put(Event.INNINGS_CLOSED)
 
     @property
     def ball_as_string(self) -> str:
-        extras = "" if self.extra_type == Extra.NO_EXTRA else f"+{self.extra_runs}{self.extra_type}"
+        extras = (
+            ""
+            if self.extra_type == Extra.NO_EXTRA
+            else f"+{self.extra_runs}{self.extra_type}"
+        )
         return f"{self.bowler} to {self.striker}: {self.batter_runs} runs {extras}"
 
     def reset(self) -> None:
@@ -104,32 +185,94 @@ class Display:
         self.striker, self.non_striker = self.non_striker, self.striker
 
     def update_scorer(self):
-        self.scorer.update(
-            Ball(
-                striker=self.striker,
-                non_striker=self.non_striker,
-                bowler=self.bowler,
-                batter_runs=self.batter_runs,
-                extra_runs=self.extra_runs,
-                extra_type=Extra(self.extra_type),
-                penalty_runs=self.penalty_runs,
-                player_out=self.player_out,
-                how_out=HowOut(self.how_out),
-                fielder=self.fielder,
-            )
+        ball = Ball(
+            striker=self.striker,
+            non_striker=self.non_striker,
+            bowler=self.bowler,
+            batter_runs=self.batter_runs,
+            extra_runs=self.extra_runs,
+            extra_type=Extra(self.extra_type),
+            penalty_runs=self.penalty_runs,
+            player_out=self.player_out,
+            how_out=HowOut(self.how_out),
+            fielder=self.fielder,
         )
+        self.match.scoring.put(ball)
+        # the ends change now, so that the next tap is scored to the right batter before this one is drawn
         if self.batter_runs % 2 == 1:
             self.change_ends()
-            self.update_dismissed_player_options()
         self.reset()
-        self.striker_select.value = self.striker
-        self.non_striker_select.value = self.non_striker
-        self.ball_desc.update()
 
     def over_bowled(self):
-        self.scorer.over_bowled()
+        self.match.scoring.put(Event.OVER_BOWLED)
         self.change_ends()
 
+    def undo(self):
+        self.match.scoring.put(Event.UNDO)
+
+    def redo(self):
+        self.match.scoring.put(Event.REDO)
+
+    def render(self, applied: list[Applied]):
+        with self.client:
+            for event, outcome in applied:
+                if isinstance(outcome, Exception):
+                    ui.notify(f"{event!r} not scored: {outcome}", type="negative")
+                elif isinstance(outcome, Entry) and event == Event.UNDO:
+                    self.undone(outcome)
+                elif isinstance(outcome, Entry):
+                    self.redone(outcome)
+            self.striker_select.value = self.striker
+            self.non_striker_select.value = self.non_striker
+            self.update_dismissed_player_options()
+            self.ball_desc.update()
+            self.update_scrub_range()
+            self.update_projection()
+            self.update_queue_status(len(applied))
+
+    def undone(self, entry: Entry):
+        if entry.ball is None:
+            self.change_ends()
+        else:
+            self.striker = entry.ball.striker
+            self.non_striker = entry.ball.non_striker
+            self.bowler = entry.ball.bowler
+
+    def redone(self, entry: Entry):
+        if entry.ball is None or entry.ball.batter_runs % 2 == 1:
+            self.change_ends()
+
+    def update_projection(self):
+        if self.projector is not None and self.format in self.projector.models:
+            self.projection.set_text(
+                str(self.projector.project(self.scorer.card, self.format))
+            )
+
+    def update_queue_status(self, events: int):
+        scoring = self.match.scoring
+        lag = scoring.lag
+        self.queue_status.set_text(
+            f"{events} event{'s' * (events != 1)} this frame, {scoring.depth} queued;"
+            f" render lag p50 {lag.percentile(0.5) / 1e6:.0f} ms, max {lag.max / 1e6:.0f} ms"
+        )
+
+    def scrubber(self):
+        ui.label("Scrub").classes("text-blue-800 bg-blue-100 text-xl")
+        self.scrub_slider = ui.slider(min=0, max=0, value=0, on_change=self.scrub)
+        self.scrub_view = ui.html()
+
+    def update_scrub_range(self):
+        self.scrub_slider.props(f"max={len(self.scorer.log)}")
+
+    def scrub(self):
+        card = self.scorer.state_at(self.scrub_slider.value)
+        self.scrub_view.set_content(
+            "".join(
+                [f"<div>{card.score}</div>"]
+                + [batter.html for batter in card.batting_order.slots]
+            )
+        )
+
     def ball_creator(self):
         ui.label("Ball Creator").classes("text-blue-800 bg-blue-100 text-xl")
 
@@ -138,22 +281,34 @@ class Display:
             ui.toggle([0, 1, 2, 3, 4, 5, 6], value=0).bind_value(self, "batter_runs")
 
             ui.label("Extra Type")
-            ui.toggle(["", "nb", "w", "b", "lb"], value="").bind_value(self, "extra_type")
+            ui.toggle(["", "nb", "w", "b", "lb"], value="").bind_value(
+                self, "extra_type"
+            )
 
             ui.label("Extra Runs")
-            ui.toggle([0, 1, 2, 3, 4, 5, 6], value=0).bind_value(self, "extra_runs").bind_enabled(self, "is_extra")
+            ui.toggle([0, 1, 2, 3, 4, 5, 6], value=0).bind_value(
+                self, "extra_runs"
+            ).bind_enabled(self, "is_extra")
 
             ui.label("Out")
-            self.dismissed_player = ui.toggle(["", self.striker, self.non_striker]).bind_value(self, "player_out")
+            self.dismissed_player = ui.toggle(
+                ["", self.striker, self.non_striker]
+            ).bind_value(self, "player_out")
 
             ui.label("How")
             ui.toggle([e.value for e in HowOut]).bind_value(self, "how_out")
 
-            self.ball_desc = ui.label().bind_text_from(self, "ball_as_string").classes("bg-sky-200 col-span-full")
+            self.ball_desc = (
+                ui.label()
+                .bind_text_from(self, "ball_as_string")
+                .classes("bg-sky-200 col-span-full")
+            )
 
         with ui.row():
             ui.button("Add Ball", on_click=self.update_scorer)
             ui.button("Over Bowled", on_click=self.over_bowled)
+            ui.button("Undo", on_click=self.undo)
+            ui.button("Redo", on_click=self.redo)
 
     def player_selection(self):
         with ui.column():
@@ -184,14 +339,18 @@ class Display:
 
     def update_batters(self):
         def options_from(select: ui.select) -> set[str]:
-            options = select.options if isinstance(select.options, list) else select.options.keys()
+            options = (
+                select.options
+                if isinstance(select.options, list)
+                else select.options.keys()
+            )
             return {s for s in options}
 
-        self.batters = self.batters | options_from(self.striker_select) | options_from(self.non_striker_select)
+        self.batters = (
+            self.batters
+            | options_from(self.striker_select)
+            | options_from(self.non_striker_select)
+        )
 
         self.striker_select.set_options(list(self.batters))
         self.non_striker_select.set_options(list(self.batters))
-
-    def innings_log(self, card: ScoreCard):
-        ui.label("Recent history").classes("text-sky-400")
-        self.recent_history = ui.textarea().bind_value_from(card, "last_6").classes("w-full")
@@ -0,0 +1,66 @@
+import json
+from typing import TYPE_CHECKING
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from nicegui import Client, app, ui
+
+from ec2.live.registry import MatchRegistry
+
+from .display import Display
+from .spectator import Spectator
+
+if TYPE_CHECKING:
+    from ec2.projection import Projector
+
+
+def register(registry: MatchRegistry, projector: "Projector | None" = None):
+    @ui.page("/")
+    def index():
+        ui.page_title("ec2")
+        ui.label("Matches").classes("text-blue-800 bg-blue-100 text-xl")
+        for match in registry:
+            with ui.row():
+                ui.label(f"{match.match_id}: {match.scorer.card.score}")
+                ui.link("score", f"/match/{match.match_id}")
+                ui.link("watch", f"/match/{match.match_id}/watch")
+        with ui.row():
+            match_id = ui.input("New match id")
+            ui.button(
+                "Start", on_click=lambda: ui.navigate.to(f"/match/{match_id.value}")
+            )
+
+    @ui.page("/match/{match_id}")
+    def score(match_id: str):
+        try:
+            match = registry.open(match_id)
+        except ValueError as e:
+            ui.label(str(e))
+            return
+        Display(match=match, projector=projector, format=match.format).show()
+
+    @ui.page("/match/{match_id}/watch")
+    def watch(match_id: str, client: Client):
+        if match_id not in registry:
+            ui.label(f"no match {match_id!r}")
+            return
+        Spectator(registry[match_id]).show(client)
+
+    @app.get("/match/{match_id}/events")
+    async def events(match_id: str):
+        """Server-sent events for other subscribers: a snapshot of each innings on connecting, then deltas."""
+        if match_id not in registry:
+            raise HTTPException(404, f"no match {match_id!r}")
+
+        async def stream():
+            async for message in registry[match_id].follow():
+                yield f"data: {json.dumps(message, separators=(',', ':'))}\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.get("/match/{match_id}/scoring")
+    def scoring(match_id: str):
+        """The scoring queue's depth, events applied and frames drawn, and how long events waited to be drawn."""
+        if match_id not in registry:
+            raise HTTPException(404, f"no match {match_id!r}")
+        return registry[match_id].scoring.report()
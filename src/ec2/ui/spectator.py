@@ -0,0 +1,84 @@
+from typing import Any
+
+from nicegui import Client, background_tasks, ui
+
+from ec2.live.registry import Match
+
+
+class SpectatorCard:
+    """An innings drawn from the deltas a match publishes, touching only the elements each one changes."""
+
+    def __init__(self):
+        self.history: list[str] = []
+        self.batters: list[ui.html] = []
+        self.bowlers: list[ui.html] = []
+        with ui.column().classes("w-full"):
+            self.score = ui.html().classes("text-emerald-800 text-3xl")
+            ui.label("Batting").classes("text-rose-800")
+            self.batting = ui.column().classes("gap-0")
+            ui.label("Bowling").classes("text-rose-800")
+            self.bowling = ui.column().classes("gap-0")
+            ui.label("Recent history").classes("text-sky-400")
+            self.recent_history = ui.textarea().props("readonly").classes("w-full")
+
+    def apply(self, delta: dict[str, Any]):
+        self.score.set_content(
+            f"{delta['runs']}/{delta['wickets']} ({delta['over']}.{delta['ball']})"
+        )
+        self.update_rows(
+            self.batting, self.batters, delta["batters"], delta["batting_count"]
+        )
+        self.update_rows(
+            self.bowling, self.bowlers, delta["bowlers"], delta["bowling_count"]
+        )
+        if delta["history"] or delta["history_from"] < len(self.history):
+            del self.history[delta["history_from"] :]
+            self.history.extend(delta["history"])
+            self.recent_history.set_value("\n".join(self.history[:-7:-1]))
+
+    @staticmethod
+    def update_rows(
+        container: ui.column,
+        rows: list[ui.html],
+        players: list[dict[str, Any]],
+        count: int,
+    ):
+        for row in rows[count:]:
+            row.delete()
+        del rows[count:]
+        with container:
+            while len(rows) < count:
+                rows.append(ui.html())
+        for player in players:
+            rows[player["position"] - 1].set_content(player["html"])
+
+
+class Spectator:
+    """A read-only view of a match, drawn only from what the match publishes: it never touches the scorers."""
+
+    def __init__(self, match: Match):
+        self.match = match
+
+    def show(self, client: Client):
+        ui.page_title(f"ec2 - {self.match.match_id}")
+        with ui.tabs().classes("w-full") as tabs:
+            self.tabs = [ui.tab("First"), ui.tab("Second")]
+        self.current = self.match.innings
+        with ui.tab_panels(tabs, value=self.tabs[self.current]).classes(
+            "w-96"
+        ) as self.panels:
+            self.cards = []
+            for tab in self.tabs:
+                with ui.tab_panel(tab):
+                    self.cards.append(SpectatorCard())
+        task = background_tasks.create(
+            self.follow(), name=f"spectate {self.match.match_id}"
+        )
+        client.on_disconnect(task.cancel)
+
+    async def follow(self):
+        async for message in self.match.follow():
+            self.cards[message["innings"]].apply(message["delta"])
+            if message["current"] != self.current:
+                self.current = message["current"]
+                self.panels.set_value(self.tabs[self.current])
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+import pytest
+from classes import Match
+
+from ec2.importers import cricsheet
+from ec2.scorebook import Ball, Ledger
+
+# the one match the tests score: Cricsheet's 951373, a T20
+FIXTURE = Path(__file__).parent / "951373.json"
+
+
+@pytest.fixture
+def match() -> Match:
+    with FIXTURE.open() as f:
+        return Match.from_json(f.read())
+
+
+@pytest.fixture
+def balls() -> list[Ball]:
+    """The first innings."""
+    return list(cricsheet.balls(cricsheet.read(FIXTURE)["innings"][0]))
+
+
+@pytest.fixture
+def ledger() -> Ledger:
+    """The first innings."""
+    return cricsheet.innings_ledger(cricsheet.read(FIXTURE)["innings"][0])
@@ -0,0 +1,91 @@
+from itertools import accumulate
+
+import pytest
+
+from ec2.scorebook import Analytics, Ball, Scorer, snapshot
+
+
+def arrays(analytics: Analytics) -> dict:
+    return {
+        name: getattr(analytics, name)
+        for name in analytics.__dict__
+        if name != "ledger"
+    }
+
+
+def test_analytics_match_the_ledger(ledger):
+    scorer = Scorer()
+    scorer.replay(ledger)
+    card = scorer.card
+    analytics = card.analytics
+    manhattan = [0] * (card.over + 1)
+    for ball, over in zip(ledger, ledger.over):
+        manhattan[over] += ball.total_runs
+    assert list(analytics.over_runs) == manhattan
+    assert list(analytics.worm) == list(accumulate(manhattan))
+    assert len(analytics.fall_of_wickets) == card.wickets
+    assert sum(analytics.partnership_runs) == card.runs
+    assert analytics.run_rate == pytest.approx(
+        card.runs * 6 / sum(analytics.over_balls)
+    )
+
+
+def test_maidens():
+    scorer = Scorer()
+    for _ in range(6):
+        scorer.update(
+            Ball(
+                striker="a", non_striker="b", bowler="x", extra_type="lb", extra_runs=1
+            )
+        )
+    scorer.over_bowled()
+    scorer.update(Ball(striker="a", non_striker="b", bowler="y", batter_runs=1))
+    scorer.over_bowled()
+    analytics = scorer.card.analytics
+    assert list(analytics.maiden) == [1, 0, 0]
+    assert analytics.bowler_maidens == {"x": 1}
+    scorer.undo()
+    scorer.undo()
+    scorer.undo()
+    assert analytics.maidens == 0
+    assert analytics.bowler_maidens == {}
+
+
+def test_undo_and_redo_keep_analytics_current(ledger):
+    scorer = Scorer()
+    scorer.replay(ledger)
+    for _ in range(40):
+        scorer.undo()
+    for _ in range(15):
+        scorer.redo()
+    rebuilt = Analytics()
+    rebuilt.attach(scorer.card.ledger, scorer.card.over)
+    assert arrays(scorer.card.analytics) == arrays(rebuilt)
+
+    replayed = Scorer()
+    for entry in scorer.log[:30]:
+        if entry.ball is None:
+            replayed.over_bowled()
+        else:
+            replayed.update(entry.ball)
+    assert arrays(scorer.state_at(30).analytics) == arrays(replayed.card.analytics)
+
+
+def test_copies_and_snapshots_carry_analytics(ledger):
+    scorer = Scorer()
+    scorer.replay(ledger)
+    card = scorer.card
+    assert arrays(card.copy().analytics) == arrays(card.analytics)
+    assert arrays(snapshot.loads(snapshot.dumps(card)).analytics) == arrays(
+        card.analytics
+    )
+    assert card.analytics.partnerships[0][:2] == (
+        ledger[0].striker,
+        ledger[0].non_striker,
+    )
+
+
+def test_required_rate():
+    analytics = Analytics(target=150, balls_limit=120)
+    assert analytics.required_rate == pytest.approx(7.5)
+    assert Analytics().required_rate is None
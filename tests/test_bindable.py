@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+from nicegui import binding
+
+from ec2.scorebook import ScoreCard, Scorer
+from ec2.ui.bindable import BindableBatter, BindableScoreCard, bindable_card
+
+
+def test_scorebook_does_not_import_nicegui():
+    code = "import sys, ec2.scorebook, ec2.importers.cricsheet; print('nicegui' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_bindable_card_scores_like_a_plain_one(balls):
+    plain, bound = Scorer(ScoreCard()), Scorer(bindable_card())
+    for ball in balls:
+        plain.update(ball)
+        bound.update(ball)
+    assert bound.card.to_json() == plain.card.to_json()
+    assert isinstance(bound.card.batters[balls[0].striker], BindableBatter)
+    assert isinstance(bound.state_at(10), BindableScoreCard)
+
+
+def test_bindable_card_propagates_writes(balls):
+    class Label:
+        text = ""
+
+    label = Label()
+    card = bindable_card()
+    binding.bind_from(label, "text", card, "runs", backward=str)
+    scorer = Scorer(card)
+    for ball in balls[:12]:
+        scorer.update(ball)
+    assert label.text == str(card.runs)
@@ -0,0 +1,55 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from conftest import FIXTURE
+
+from ec2.importers import cricsheet
+from ec2.importers.cache import MatchCache, read
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    return Path(shutil.copy(FIXTURE, tmp_path / "match.json"))
+
+
+def test_cached_match_reads_back_unchanged(tmp_path: Path, source: Path):
+    cache = MatchCache(tmp_path / "cache")
+    cold = cache.load(source)
+    warm = cache.load(source)
+    expected = cricsheet.load_ledgers(source)
+    assert warm.info == expected.info
+    assert warm.source == str(source)
+    for cached, ledger in zip(warm.innings, expected.innings, strict=True):
+        assert list(cached) == list(ledger)
+        assert list(cached.over) == list(ledger.over)
+    assert isinstance(warm.innings[0].striker, memoryview)
+    assert (
+        cricsheet.score_ledger(cold.innings[0]).to_json()
+        == cricsheet.load(source).innings[0].to_json()
+    )
+
+
+def test_cached_innings_keep_their_own_names(tmp_path: Path, source: Path):
+    first, second = MatchCache(tmp_path / "cache").load(source).innings
+    names = list(second.names)
+    first.intern("A Substitute")
+    assert second.names == names
+
+
+@pytest.mark.parametrize("validate", ["mtime", "hash"])
+def test_changed_source_misses_the_cache(tmp_path: Path, source: Path, validate: str):
+    cache = MatchCache(tmp_path / "cache", validate=validate)
+    before = cache.path(source)
+    source.write_text(source.read_text().replace("Eden Gardens", "Lord's"))
+    os.utime(source, ns=(1, 1))
+    assert cache.path(source) != before
+    assert cache.load(source).info["venue"] == "Lord's"
+
+
+def test_unreadable_cache_file(tmp_path: Path):
+    path = tmp_path / "bad.ec2c"
+    path.write_bytes(b"NOPE" + bytes(32))
+    with pytest.raises(ValueError):
+        read(path)
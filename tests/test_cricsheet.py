@@ -0,0 +1,52 @@
+import shutil
+import zipfile
+from pathlib import Path
+
+import pytest
+from classes import Match
+from conftest import FIXTURE
+
+from ec2.importers import cricsheet
+from ec2.scorebook import ScoreCard, Scorer
+
+
+def test_decoder_matches_dataclass_model(match: Match):
+    data = cricsheet.read(FIXTURE)
+    for inns, innings in enumerate(data["innings"]):
+        assert list(cricsheet.balls(innings)) == list(match.balls(inns))
+
+
+def test_load_bowls_completed_overs():
+    imported = cricsheet.load(FIXTURE)
+    first, second = imported.innings
+    assert imported.info["match_type"] == "T20"
+    assert (first.runs, first.wickets, first.over, first.ball) == (155, 9, 20, 0)
+    assert (second.runs, second.wickets, second.over, second.ball) == (161, 6, 19, 4)
+    assert first.is_consistent()
+
+
+def test_replayed_ledger_gives_the_same_card():
+    card = cricsheet.load(FIXTURE).innings[1]
+    scorer = Scorer(ScoreCard())
+    scorer.replay(card.ledger)
+    assert scorer.card.to_json() == card.to_json()
+
+
+@pytest.mark.parametrize("processes", [0, 2])
+def test_ingest_directory_and_archive(tmp_path: Path, processes: int):
+    for name in ("a.json", "b.json"):
+        shutil.copy(FIXTURE, tmp_path / name)
+    archive = tmp_path / "all.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.write(FIXTURE, "c.json")
+        zf.writestr("readme.txt", "not a match")
+
+    from_dir = list(cricsheet.ingest(tmp_path, processes=processes))
+    assert [Path(m.source).name for m in from_dir] == ["a.json", "b.json"]
+    assert [card.runs for card in from_dir[1].innings] == [155, 161]
+
+    from_zip = list(cricsheet.ingest(archive, processes=processes, ledgers=True))
+    assert [m.source for m in from_zip] == [f"{archive}!c.json"]
+    assert [len(ledger) for ledger in from_zip[0].innings] == [
+        len(card.ledger) for card in from_dir[0].innings
+    ]
@@ -0,0 +1,52 @@
+from ec2.scorebook import Delta, Scorer
+
+TOTALS = ("runs", "wickets", "over", "ball", "fours", "sixes", "extras")
+
+
+def apply(state: dict, delta: Delta) -> dict:
+    if delta.full:
+        state = {"batters": {}, "bowlers": {}, "history": []}
+    state |= {total: getattr(delta, total) for total in TOTALS}
+    for players, changed, count in (
+        (state["batters"], delta.batters, delta.batting_count),
+        (state["bowlers"], delta.bowlers, delta.bowling_count),
+    ):
+        players.update((player["position"], player) for player in changed)
+        for position in [position for position in players if position > count]:
+            del players[position]
+    state["history"] = state["history"][: delta.history_from] + delta.history
+    return state
+
+
+def test_update_touches_only_the_balls_players(balls):
+    scorer = Scorer()
+    for ball in balls[:20]:
+        scorer.update(ball)
+    ball = balls[20]
+    delta = scorer.update(ball)
+    assert [batter["name"] for batter in delta.batters] == [
+        ball.striker,
+        ball.non_striker,
+    ]
+    assert [bowler["name"] for bowler in delta.bowlers] == [ball.bowler]
+    assert delta.history == scorer.card.history[-1:]
+    assert delta.history_from == 20
+    assert "deliveries" not in delta.batters[0]
+    assert delta.to_dict()["runs"] == scorer.card.runs
+
+
+def test_deltas_rebuild_the_card(balls):
+    scorer = Scorer()
+    state = apply({}, Delta.snapshot(scorer.card))
+    for n, ball in enumerate(balls[:40], 1):
+        state = apply(state, scorer.update(ball))
+        if n % 6 == 0:
+            state = apply(state, scorer.over_bowled())
+    for _ in range(8):
+        entry = scorer.undo()
+        state = apply(state, scorer.changes(entry.ball, len(scorer.card.history)))
+    for _ in range(3):
+        history = len(scorer.card.history)
+        entry = scorer.redo()
+        state = apply(state, scorer.changes(entry.ball, history))
+    assert state == apply({}, Delta.snapshot(scorer.card))
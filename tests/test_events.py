@@ -0,0 +1,72 @@
+from ec2.scorebook import Ball, ScoreCard, Scorer
+
+
+def scored(balls: list[Ball], overs_every: int = 0) -> Scorer:
+    scorer = Scorer(ScoreCard(), checkpoint_interval=20)
+    for n, ball in enumerate(balls, 1):
+        scorer.update(ball)
+        if overs_every and n % overs_every == 0:
+            scorer.over_bowled()
+    return scorer
+
+
+def test_undo_everything_leaves_an_empty_card(balls):
+    scorer = scored(balls, overs_every=6)
+    while scorer.undo():
+        pass
+    assert scorer.card.to_json() == ScoreCard().to_json()
+    assert scorer.undo() is None
+
+
+def test_undo_matches_shorter_innings(balls):
+    scorer = scored(balls)
+    for _ in range(30):
+        scorer.undo()
+        assert scorer.card.is_consistent()
+    assert scorer.card.to_json() == scored(balls[:-30]).card.to_json()
+
+
+def test_redo_restores_undone_events(balls):
+    scorer = scored(balls, overs_every=6)
+    expected = scorer.card.to_json()
+    for _ in range(25):
+        scorer.undo()
+    while scorer.redo():
+        pass
+    assert scorer.card.to_json() == expected
+
+
+def test_new_ball_clears_redo(balls):
+    scorer = scored(balls[:10])
+    scorer.undo()
+    scorer.update(balls[10])
+    assert scorer.redo() is None
+    assert len(scorer.log) == 10
+
+
+def test_state_at_leaves_live_card_alone(balls):
+    scorer = scored(balls, overs_every=6)
+    live = scorer.card.to_json()
+    assert scorer.state_at(len(scorer.log)).to_json() == live
+    assert (
+        scorer.state_at(7).to_json() == scored(balls[:6], overs_every=6).card.to_json()
+    )
+    assert sorted(scorer.checkpoints) == list(range(0, len(scorer.log) + 1, 20))
+    assert scorer.card.to_json() == live
+
+
+def test_state_at_matches_ball_by_ball(balls):
+    scorer = scored(balls)
+    for events in (3, 44, 101):
+        assert (
+            scorer.state_at(events).to_json() == scored(balls[:events]).card.to_json()
+        )
+
+
+def test_undo_drops_later_checkpoints(balls):
+    scorer = scored(balls)
+    scorer.state_at(len(balls))
+    for _ in range(50):
+        scorer.undo()
+    assert max(scorer.checkpoints) <= len(scorer.log)
+    assert scorer.state_at(len(scorer.log)).to_json() == scorer.card.to_json()
@@ -0,0 +1,49 @@
+from ec2.scorebook import Scorer
+from ec2.scorebook.history import describe
+
+
+def eager(ledger) -> list[str]:
+    # the descriptions as Scorer.update used to format them, one per ball
+    scorer = Scorer()
+    history = []
+    for index, ball in enumerate(ledger):
+        while scorer.card.over < ledger.over[index]:
+            scorer.over_bowled()
+        scorer.update(ball)
+        history.append(describe(scorer.card.over, scorer.card.ball, ball))
+    return history
+
+
+def test_history_is_formatted_from_the_ledger(ledger):
+    scorer = Scorer()
+    scorer.replay(ledger)
+    assert list(scorer.card.history) == eager(ledger)
+    assert scorer.card.history[-1] == eager(ledger)[-1]
+    assert scorer.card.last_6 == "\n".join(eager(ledger)[:-7:-1])
+
+
+def test_recent_follows_undo_and_redo(ledger):
+    scorer = Scorer()
+    for ball in list(ledger)[:10]:
+        scorer.update(ball)
+    expected = "\n".join(list(scorer.card.history)[:-7:-1])
+    for _ in range(4):
+        scorer.undo()
+    assert scorer.card.last_6 == "\n".join(list(scorer.card.history)[:-7:-1])
+    for _ in range(4):
+        scorer.redo()
+    assert scorer.card.last_6 == expected
+
+
+def test_history_can_be_turned_off(ledger):
+    scorer = Scorer()
+    scorer.replay(ledger, history=False)
+    assert len(scorer.card.history) == 0
+    assert scorer.card.last_6 == ""
+    assert scorer.card.runs > 0
+
+
+def test_history_is_not_serialized(ledger):
+    scorer = Scorer()
+    scorer.replay(ledger)
+    assert "history" not in scorer.card.to_dict()
@@ -0,0 +1,82 @@
+import json
+import subprocess
+import sys
+
+from ec2.instrumentation import Histogram, Instrumentation
+from ec2.scorebook import Batter, Delta, ScoreCard, Scorer, snapshot
+
+
+def test_histogram_percentiles_within_a_factor_of_two():
+    histogram = Histogram()
+    for nanoseconds in range(1, 1001):
+        histogram.record(nanoseconds * 1000)
+    assert histogram.count == 1000 and histogram.max == 1_000_000
+    assert 500_000 <= histogram.percentile(0.5) < 1_000_000
+    assert histogram.percentile(1.0) == 1_000_000
+    assert histogram.summary()["mean_us"] == 500.5
+
+
+def test_hooks_measure_and_come_off_again(balls):
+    originals = (Scorer.update, Scorer.update_ledger, Batter.html, ScoreCard.to_json)
+    instruments = Instrumentation().enable(allocations=True)
+    try:
+        scorer = Scorer()
+        for ball in balls[:60]:
+            scorer.update(ball)
+        scorer.update_many(balls[60:])
+        Scorer().replay(scorer.card.ledger)
+        players = scorer.card.batting_order.slots
+        rendered = [player.html for player in players * 2]
+        snapshot.dumps(scorer.card)
+        scorer.card.to_json()
+        Delta.snapshot(scorer.card)
+        report = instruments.report()
+    finally:
+        instruments.disable()
+
+    assert (
+        Scorer.update,
+        Scorer.update_ledger,
+        Batter.html,
+        ScoreCard.to_json,
+    ) == originals
+    assert "to_json" not in vars(ScoreCard)
+    histograms = report["histograms"]
+    assert histograms["ball applied"]["count"] == 60
+    assert histograms["snapshot serialized"]["count"] == 2
+    assert histograms["delta built"]["count"] == 1
+    assert report["counters"]["balls"] == 2 * len(balls)
+    assert report["counters"]["html evaluations"] == 2 * len(players)
+    assert report["counters"]["html cache hits"] == len(players)
+    assert report["counters"]["player renders"] == len(players)
+    assert rendered[len(players) :] == rendered[: len(players)]
+    assert report["allocations"] and all(
+        "ec2" in site["where"] for site in report["allocations"]
+    )
+
+    scorer.update(balls[0])
+    assert instruments.report()["histograms"]["ball applied"]["count"] == 60
+
+
+def test_periodic_report_is_written(tmp_path, balls):
+    instruments = Instrumentation().enable()
+    try:
+        instruments.start_reporting(tmp_path / "report.json", interval=0.01)
+        Scorer().update_many(balls)
+        instruments.stop_reporting()
+    finally:
+        instruments.disable()
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert report["histograms"]["balls applied"]["count"] == 1
+    assert report["counters"]["balls"] > 100
+
+
+def test_ui_hooks_are_skipped_until_nicegui_is_imported():
+    code = (
+        "import sys; from ec2.instrumentation import instruments; "
+        "instruments.enable(); print('nicegui' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
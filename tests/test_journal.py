@@ -0,0 +1,139 @@
+import os
+import threading
+from pathlib import Path
+
+import pytest
+from classes import Match
+
+from ec2.scorebook import Ball, Extra, HowOut, ScoreCard, Scorer
+from ec2.storage.journal import MAGIC, Event, Journal, read, recover
+
+
+def score(balls, overs_every: int = 6) -> Scorer:
+    scorer = Scorer()
+    for n, ball in enumerate(balls, 1):
+        scorer.update(ball)
+        if n % overs_every == 0:
+            scorer.over_bowled()
+    return scorer
+
+
+def journal_innings(journal: Journal, balls, overs_every: int = 6) -> None:
+    for n, ball in enumerate(balls, 1):
+        journal.append(ball)
+        if n % overs_every == 0:
+            journal.append(Event.OVER_BOWLED)
+
+
+def test_records_round_trip(tmp_path: Path):
+    ball = Ball(
+        striker="JJ Roy",
+        non_striker="AD Hales",
+        bowler="S Badree",
+        batter_runs=2,
+        extra_type=Extra.NOBALL,
+        extra_runs=1,
+        penalty_runs=5,
+        player_out="AD Hales",
+        how_out=HowOut.RUN_OUT,
+        fielder="CH Gayle",
+    )
+    long = Ball(striker="Ä" * 200, non_striker="x" * 70_000, bowler="S Badree")
+    with Journal(tmp_path / "j", sync_every=1) as journal:
+        journal.extend([ball, Event.OVER_BOWLED, long, Event.UNDO])
+    assert read(tmp_path / "j") == [ball, Event.OVER_BOWLED, long, Event.UNDO]
+
+
+@pytest.mark.parametrize("sync_every", [0, 1, 8])
+def test_recover_both_innings(tmp_path: Path, match: Match, sync_every: int):
+    path = tmp_path / "match.journal"
+    with Journal(path, sync_every=sync_every, sync_ms=5) as journal:
+        journal_innings(journal, match.balls(0))
+        journal.append(Event.INNINGS_CLOSED)
+        journal_innings(journal, match.balls(1))
+        journal.extend([Event.UNDO, Event.UNDO, Event.REDO])
+
+    recovered = recover(path)
+    assert recovered.innings == 1
+    first, second = recovered.scorers
+    assert first.card.to_json() == score(match.balls(0)).card.to_json()
+    expected = score(match.balls(1))
+    expected.undo()
+    expected.undo()
+    expected.redo()
+    assert second.card.to_json() == expected.card.to_json()
+
+
+def test_every_event_is_synced_off_the_scoring_thread(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    synced = threading.Event()
+    threads = []
+
+    def fsync(fd: int) -> None:
+        threads.append(threading.current_thread())
+        synced.set()
+
+    monkeypatch.setattr(os, "fsync", fsync)
+    with Journal(tmp_path / "j", sync_every=1, sync_ms=10_000) as journal:
+        journal.append(Event.OVER_BOWLED)
+        assert synced.wait(5)
+        assert threading.current_thread() not in threads
+
+
+def test_truncated_record_is_dropped_and_appending_continues(
+    tmp_path: Path, match: Match
+):
+    path = tmp_path / "match.journal"
+    balls = list(match.balls(0))[:20]
+    with Journal(path) as journal:
+        journal.extend(balls)
+    whole = path.stat().st_size
+    with path.open("r+b") as f:
+        f.truncate(whole - 3)
+
+    assert read(path) == balls[:-1]
+    assert recover(path).scorers[0].card.runs == sum(
+        ball.total_runs for ball in balls[:-1]
+    )
+
+    with Journal(path) as journal:
+        journal.append(balls[-1])
+    assert path.stat().st_size == whole
+    assert read(path) == balls
+
+
+def test_corrupt_record_ends_the_journal(tmp_path: Path):
+    path = tmp_path / "match.journal"
+    with Journal(path) as journal:
+        journal.extend(
+            [Ball(striker="A", batter_runs=1), Ball(striker="B", batter_runs=4)]
+        )
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert read(path) == [Ball(striker="A", batter_runs=1)]
+
+
+def test_missing_journal_recovers_empty_cards(tmp_path: Path):
+    recovered = recover(tmp_path / "none")
+    assert recovered.innings == 0
+    assert [scorer.card.to_json() for scorer in recovered.scorers] == [
+        ScoreCard().to_json()
+    ] * 2
+    with Journal(tmp_path / "none"):
+        pass
+    assert (tmp_path / "none").read_bytes() == MAGIC
+
+
+def test_other_files_are_not_overwritten(tmp_path: Path):
+    path = tmp_path / "notes.journal"
+    path.write_bytes(b"not a journal")
+    with pytest.raises(ValueError):
+        Journal(path)
+    assert path.read_bytes() == b"not a journal"
+
+    path.write_bytes(MAGIC[:3])
+    with Journal(path):
+        pass
+    assert path.read_bytes() == MAGIC
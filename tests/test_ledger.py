@@ -0,0 +1,53 @@
+import pytest
+from classes import Match
+
+from ec2.scorebook import Ball, Extra, HowOut, Ledger, ScoreCard, Scorer
+
+
+@pytest.fixture
+def card(match) -> ScoreCard:
+    card = ScoreCard()
+    scorer = Scorer(card)
+    for ball in match.balls(0):
+        scorer.update(ball)
+    return card
+
+
+def test_ledger_round_trips_balls():
+    ledger = Ledger()
+    ball = Ball(
+        striker="S",
+        non_striker="N",
+        bowler="B",
+        batter_runs=1,
+        extra_type=Extra.NOBALL,
+        extra_runs=1,
+        player_out="N",
+        how_out=HowOut.RUN_OUT,
+        fielder="F",
+    )
+    assert ledger.append(ball) == 0
+    assert ledger.append(Ball(striker="N", non_striker="S", bowler="B")) == 1
+    assert ledger[0] == ball
+    assert ledger.names == ["", "S", "N", "B", "F"]
+    assert len(ledger) == 2
+
+
+def test_card_stores_each_delivery_once(match: Match, card: ScoreCard):
+    balls = list(match.balls(0))
+    assert list(card.ledger) == balls
+    assert sum(len(batter.deliveries) for batter in card.batters.values()) == len(balls)
+    assert all(batter.ledger is card.ledger for batter in card.batters.values())
+    assert list(card.batters["JE Root"].balls) == [
+        ball for ball in balls if ball.striker == "JE Root"
+    ]
+    assert list(card.bowlers["S Badree"].balls) == [
+        ball for ball in balls if ball.bowler == "S Badree"
+    ]
+
+
+def test_ledger_survives_json_round_trip(card: ScoreCard):
+    copy = ScoreCard.from_json(card.to_json())
+    assert list(copy.ledger) == list(card.ledger)
+    assert copy.batters["JE Root"].balls[:] == card.batters["JE Root"].balls[:]
+    assert copy.is_consistent()
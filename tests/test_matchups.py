@@ -0,0 +1,52 @@
+import pytest
+from conftest import FIXTURE
+
+from ec2.importers import cricsheet
+from ec2.scorebook import Matchups, Scorer
+
+
+@pytest.fixture
+def cards():
+    return cricsheet.load(FIXTURE).innings
+
+
+def scanned(card) -> dict:
+    # what callers had to do before: filter every batter's balls by bowler
+    pairs = {}
+    for batter in card.batting_order.slots:
+        for ball in batter.balls:
+            runs, balls = pairs.get((batter.name, ball.bowler), (0, 0))
+            pairs[batter.name, ball.bowler] = (
+                runs + ball.batter_runs,
+                balls + (ball.extra_type != "w"),
+            )
+    return pairs
+
+
+def test_matchups_match_a_scan(cards):
+    for card in cards:
+        assert {
+            pair: (m.runs, m.balls) for pair, m in card.matchups.pairs.items()
+        } == scanned(card)
+        assert sum(m.dismissals for m in card.matchups.pairs.values()) <= card.wickets
+
+
+def test_undo_removes_from_matchups(cards):
+    scorer = Scorer()
+    scorer.replay(cards[0].ledger)
+    for _ in range(30):
+        scorer.undo()
+    rebuilt = Matchups()
+    rebuilt.attach(scorer.card.ledger)
+    assert scorer.card.matchups.pairs == rebuilt.pairs
+    assert scorer.card.copy().matchups.pairs == rebuilt.pairs
+
+
+def test_matchups_merge(cards):
+    first = cards[0].matchups
+    total = Matchups.total([first, first])
+    pair = next(iter(first))
+    assert total[pair].runs == 2 * first[pair].runs
+    assert len(total) == len(first)
+    assert Matchups.from_dict(total.to_dict()).pairs == total.pairs
+    assert first["nobody", "at all"].balls == 0
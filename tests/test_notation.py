@@ -0,0 +1,98 @@
+import io
+
+import pytest
+from conftest import FIXTURE
+
+from ec2.importers import cricsheet
+from ec2.importers.notation import Reader, delivery, transcript
+from ec2.scorebook import Extra, HowOut, Scorer
+from ec2.scorebook.ledger import EXTRA_CODES, HOW_OUT_CODES
+
+OVER = """
+# first over
+striker Roy
+non_striker Hales
+bowler Badree
+. 1 4+1nb 2w
+1lb ./c:Samuel Badree
+in Root
+6
+over
+bowler Russell
+1/ro-ns
+"""
+
+
+def test_delivery_tokens():
+    assert delivery(".") == (0, 0, 0, 0, 0, False, "", 0)
+    assert delivery("4+1nb") == (4, EXTRA_CODES[Extra.NOBALL], 1, 0, 0, False, "", 4)
+    assert delivery("2w")[-1] == 1
+    assert delivery("3lb")[:3] == (0, EXTRA_CODES[Extra.LEGBYE], 3)
+    assert delivery("./st:de Kock")[4:7] == (
+        HOW_OUT_CODES[HowOut.STUMPED],
+        False,
+        "de Kock",
+    )
+    assert delivery("1/ro-ns")[4:6] == (HOW_OUT_CODES[HowOut.RUN_OUT], True)
+    for token in ("7", "2x", "1/c-ns", "1+1lb", "0nb"):
+        with pytest.raises(ValueError):
+            delivery(token)
+
+
+def test_reader_scores_and_reports_each_over():
+    out = io.StringIO()
+    (scorer,) = Reader("over", out).read(OVER.splitlines()).close()
+    card = scorer.card
+    assert out.getvalue() == "1 15/1 (1.0)\n1 16/2 (1.1)\n"
+    assert (card.runs, card.wickets, card.over, card.ball) == (16, 2, 1, 1)
+    assert card.extras == {Extra.NOBALL: 1, Extra.WIDE: 2, Extra.LEGBYE: 1}
+    assert card.batters["Hales"].how_out == HowOut.CAUGHT
+    assert card.batters["Hales"].fielder == "Samuel Badree"
+    assert card.batters["Root"].how_out == HowOut.RUN_OUT
+    assert [batter.name for batter in card.batting_order.slots] == [
+        "Roy",
+        "Hales",
+        "Root",
+    ]
+    assert card.is_consistent()
+
+
+def test_reader_errors_give_the_line():
+    with pytest.raises(ValueError, match="line 2: a delivery with no"):
+        Reader().read(["striker Roy", "1"])
+    with pytest.raises(ValueError, match="line 4: not a delivery"):
+        Reader().read(["striker Roy", "non_striker Hales", "bowler Badree", "1 9"])
+
+
+def test_transcript_round_trip_matches_replay():
+    lines = []
+    ledgers = cricsheet.load_ledgers(FIXTURE).innings
+    for ledger in ledgers:
+        lines += transcript(ledger)
+        lines.append("innings")
+    out = io.StringIO()
+    scorers = Reader("innings", out).read(lines).close()
+    assert len(scorers) == 2
+    for ledger, scorer in zip(ledgers, scorers):
+        replayed = Scorer()
+        replayed.replay(ledger)
+        assert scorer.card.to_json() == replayed.card.to_json()
+        assert scorer.card.matchups.pairs == replayed.card.matchups.pairs
+        assert list(scorer.card.analytics.worm) == list(replayed.card.analytics.worm)
+        assert list(scorer.card.history) == list(replayed.card.history)
+    assert out.getvalue() == "1 155/9 (19.6)\n2 161/6 (19.4)\n"
+
+
+def test_bulk_update_ledger_matches_undoable_replay():
+    for ledger in cricsheet.load_ledgers(FIXTURE).innings:
+        undoable = Scorer()
+        undoable.replay(ledger)
+        bulk = Scorer(undoable=False)
+        bulk.replay(ledger)
+        assert bulk.card.to_json() == undoable.card.to_json()
+        assert (
+            bulk.card.analytics.fall_of_wickets
+            == undoable.card.analytics.fall_of_wickets
+        )
+        assert bulk.card.analytics.partnerships == undoable.card.analytics.partnerships
+        assert not bulk.log and bulk.undo() is None
@@ -0,0 +1,81 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from conftest import FIXTURE
+
+from ec2.importers import cricsheet
+from ec2.projection import Projector, count_ledgers, count_warehouse
+from ec2.scorebook import Ball, Extra, Ledger, Scorer
+from ec2.storage.warehouse import Warehouse
+
+
+def innings(over: list[Ball], overs: int = 20) -> Ledger:
+    ledger = Ledger()
+    for number in range(overs):
+        for ball in over:
+            ledger.append(ball, number)
+    return ledger
+
+
+SINGLE = Ball(striker="a", non_striker="b", bowler="c", batter_runs=1)
+WIDE = Ball(
+    striker="a", non_striker="b", bowler="c", extra_type=Extra.WIDE, extra_runs=1
+)
+
+
+def test_singles_every_ball_project_exactly():
+    projector = Projector(seed=1)
+    projector.fit("T20", [innings([SINGLE] * 6)])
+    scorer = Scorer()
+    for number in range(63):
+        if number and number % 6 == 0:
+            scorer.over_bowled()
+        scorer.update(SINGLE)
+    projection = projector.project(scorer.card, target=121)
+    assert projection.quantiles == dict.fromkeys(projection.quantiles, 120)
+    assert (projection.win, projection.tie) == (0.0, 1.0)
+
+
+def test_wides_come_before_each_legal_ball():
+    projector = Projector(simulations=40_000, seed=2)
+    projector.fit("T20", [innings([WIDE] + [SINGLE] * 6)])
+    projection = projector.project(Scorer().card)
+    # a wide for every six legal balls on average, so 140, with spread
+    assert projection.mean == pytest.approx(140, abs=1)
+    assert projection.quantiles[0.1] < 140 < projection.quantiles[0.9]
+
+
+def test_fixture_projection_and_chase():
+    ledgers = cricsheet.load_ledgers(FIXTURE).innings
+    projector = Projector(seed=3)
+    projector.fit("T20", ledgers * 20)
+    scorer = Scorer()
+    scorer.card.analytics.target = 156
+    chase = ledgers[1]
+    for index in range(60):
+        while scorer.card.over < chase.over[index]:
+            scorer.over_bowled()
+        scorer.update(chase.ball(index))
+    projection = projector.project(scorer.card)
+    assert 0 < projection.win < 1
+    assert (
+        scorer.card.runs
+        < projection.quantiles[0.1]
+        <= projection.quantiles[0.5]
+        <= projection.quantiles[0.9]
+    )
+    scorer.card.wickets = 10
+    assert projector.project(scorer.card).quantiles[0.5] == scorer.card.runs
+    with pytest.raises(ValueError):
+        projector.project(scorer.card, "ODI")
+
+
+def test_warehouse_counts_match_ledger_counts():
+    imported = cricsheet.load_ledgers(FIXTURE)
+    with Warehouse() as warehouse:
+        warehouse.add([imported])
+        assert np.array_equal(
+            count_warehouse(warehouse, "T20", 20), count_ledgers(imported.innings, 20)
+        )
+        assert Projector().fit_warehouse(warehouse, "T20").overs == 20
@@ -0,0 +1,153 @@
+import asyncio
+import struct
+
+import pytest
+
+from ec2.live.channel import Channel
+from ec2.live.registry import MatchRegistry
+from ec2.scorebook import Ball
+from ec2.storage.journal import read
+
+
+def test_matches_are_isolated(balls):
+    registry = MatchRegistry()
+    first, second = registry.open("first"), registry.open("second")
+    for ball in balls[:10]:
+        first.update(ball)
+    assert registry.open("first") is first
+    assert first.scorer.card.runs > 0
+    assert second.scorer.card.runs == 0
+    assert [match.match_id for match in registry] == ["first", "second"]
+
+
+def test_invalid_match_id():
+    with pytest.raises(ValueError):
+        MatchRegistry().open("../etc")
+
+
+def test_registry_recovers_journalled_matches(tmp_path, balls):
+    registry = MatchRegistry(tmp_path)
+    match = registry.open("m1")
+    for ball in balls[:6]:
+        match.update(ball)
+    match.over_bowled()
+    match.update(balls[6])
+    score = match.scorer.card.score
+    registry.close()
+
+    recovered = MatchRegistry(tmp_path)
+    recovered.recover()
+    assert "m1" in recovered
+    assert recovered["m1"].scorer.card.score == score
+    recovered.close()
+
+
+def test_registry_skips_files_that_arent_journals(tmp_path, balls, caplog):
+    registry = MatchRegistry(tmp_path)
+    registry.open("m1").update(balls[0])
+    registry.close()
+    (tmp_path / "notes.journal").write_text("not a journal")
+
+    recovered = MatchRegistry(tmp_path)
+    recovered.recover()
+    assert "m1" in recovered
+    assert "notes" not in recovered
+    assert "notes.journal" in caplog.text
+    assert (tmp_path / "notes.journal").read_text() == "not a journal"
+    recovered.close()
+
+
+def test_a_ball_the_journal_cant_hold_leaves_the_card_alone(tmp_path, balls):
+    registry = MatchRegistry(tmp_path)
+    match = registry.open("m1")
+    match.update(balls[0])
+    score = match.scorer.card.score
+    with pytest.raises(struct.error):
+        match.update(
+            Ball(striker=balls[1].striker, bowler=balls[1].bowler, batter_runs=256)
+        )
+    assert match.scorer.card.score == score
+    assert len(match.scorer.card.ledger) == 1
+    registry.close()
+    assert read(tmp_path / "m1.journal") == balls[:1]
+
+
+def test_chases_have_a_required_rate(tmp_path, balls):
+    registry = MatchRegistry(tmp_path)
+    match = registry.open("m1")
+    for ball in balls[:12]:
+        match.update(ball)
+    match.innings_closed()
+    analytics = match.scorer.card.analytics
+    assert analytics.required_rate == analytics.target / 20
+    match.update(balls[0])
+    assert analytics.required_rate is not None
+    registry.close()
+
+    recovered = MatchRegistry(tmp_path)
+    chase = recovered.open("m1").scorer.card.analytics
+    assert (chase.target, chase.balls_limit) == (analytics.target, 120)
+    assert chase.required_rate == analytics.required_rate
+    recovered.close()
+    assert (
+        MatchRegistry(format="Test").open("m1").scorer.card.analytics.balls_limit == 0
+    )
+
+
+def test_channel_drops_oldest_for_slow_subscribers():
+    channel = Channel(maxsize=2)
+    queue = channel.subscribe()
+    for n in range(5):
+        channel.publish(n)
+    assert [queue.get_nowait(), queue.get_nowait()] == [3, 4]
+
+
+def follow(match, steps) -> list[dict]:
+    async def spectate(received: list):
+        async for message in match.follow():
+            received.append(message)
+
+    async def run() -> list[dict]:
+        received = []
+        task = asyncio.create_task(spectate(received))
+        await asyncio.sleep(0)
+        for step in steps:
+            step()
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return received
+
+    return asyncio.run(run())
+
+
+def test_spectators_see_snapshots_then_deltas(balls):
+    match = MatchRegistry().open("m1")
+    received = follow(
+        match, [lambda ball=ball: match.update(ball) for ball in balls[:3]]
+    )
+    assert [(message["innings"], message["delta"]["full"]) for message in received] == [
+        (0, True),
+        (1, True),
+        (0, False),
+        (0, False),
+        (0, False),
+    ]
+    assert [message["delta"]["revision"] for message in received[2:]] == [1, 2, 3]
+    assert len(match.channel) == 0
+
+
+def test_spectators_falling_behind_are_resynced(balls):
+    match = MatchRegistry().open("m1")
+    match.channel.maxsize = 4
+
+    def burst():
+        for ball in balls[:10]:
+            match.update(ball)
+
+    received = follow(match, [burst])
+    last = received[-1]["delta"]
+    assert last["full"]
+    assert last["revision"] == match.scorer.card.revision
+    assert last["history"] == list(match.scorer.card.history)
@@ -0,0 +1,136 @@
+import asyncio
+from itertools import pairwise
+
+from ec2.live.registry import Match, MatchRegistry
+from ec2.storage.journal import Event
+
+
+def test_a_burst_is_applied_in_order_and_drawn_once(balls):
+    match = Match("m")
+    frames = []
+    match.scoring.renderers.append(frames.append)
+
+    async def run():
+        for ball in balls[:6]:
+            match.scoring.put(ball)
+        match.scoring.put(Event.OVER_BOWLED)
+        match.scoring.put(balls[6])
+        match.scoring.put(Event.UNDO)
+        await match.scoring.join()
+
+    asyncio.run(run())
+    assert len(frames) == 1
+    assert [event for event, _ in frames[0]] == [
+        *balls[:6],
+        Event.OVER_BOWLED,
+        balls[6],
+        Event.UNDO,
+    ]
+    assert frames[0][-1][1].ball == balls[6]
+    assert list(match.scorer.card.ledger) == balls[:6]
+    assert match.scorer.card.over == 1
+    report = match.scoring.report()
+    assert (report["depth"], report["applied"], report["frames"]) == (0, 9, 1)
+    assert report["render_lag"]["count"] == 9
+
+
+def test_a_steady_feed_is_drawn_at_the_frame_rate(balls):
+    match = Match("m", frame_rate=50)
+    drawn = []
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        match.scoring.renderers.append(
+            lambda applied: drawn.append((loop.time(), len(applied)))
+        )
+        for ball in balls[:100]:
+            match.scoring.put(ball)
+            await asyncio.sleep(0.002)
+        await match.scoring.join()
+
+    asyncio.run(run())
+    assert sum(count for _, count in drawn) == 100
+    assert len(drawn) < 50
+    assert all(
+        later - earlier >= 0.02 * 0.9 for (earlier, _), (later, _) in pairwise(drawn)
+    )
+    assert list(match.scorer.card.ledger) == balls[:100]
+
+
+def test_failures_are_reported_without_stopping_the_queue(balls, caplog):
+    match = Match("m")
+    frames = []
+
+    def broken(applied):
+        raise RuntimeError("gone")
+
+    match.scoring.renderers += [broken, frames.append]
+
+    async def run():
+        match.scoring.put(Event.BALL)
+        match.scoring.put(balls[0])
+        await match.scoring.join()
+
+    asyncio.run(run())
+    (event, error), (ball, _) = frames[0]
+    assert event == Event.BALL and isinstance(error, KeyError)
+    assert ball == balls[0]
+    assert len(match.scorer.card.ledger) == 1
+    assert match.scoring.errors == 2
+    assert "applying <Event.BALL: 1> failed" in caplog.text
+    assert "RuntimeError: gone" in caplog.text
+
+
+def test_closing_applies_what_is_still_queued(tmp_path, balls):
+    registry = MatchRegistry(tmp_path)
+    match = registry.open("m1")
+
+    async def run():
+        for ball in balls[:10]:
+            match.scoring.put(ball)
+        registry.close()
+
+    asyncio.run(run())
+    recovered = MatchRegistry(tmp_path)
+    assert list(recovered.open("m1").scorer.card.ledger) == balls[:10]
+    recovered.close()
+
+
+def test_closing_mid_frame_draws_the_batch_and_stops(balls):
+    match = Match("m", frame_rate=2)
+    frames = []
+    match.scoring.renderers.append(frames.append)
+
+    async def run():
+        match.scoring.put(balls[0])
+        await match.scoring.join()
+        # the next frame isn't due for half a second, so these wait with the consumer
+        for ball in balls[1:4]:
+            match.scoring.put(ball)
+        await asyncio.sleep(0.01)
+        match.scoring.put(balls[4])
+        match.close()
+        await asyncio.wait_for(match.scoring.join(), 0.1)
+        await asyncio.wait_for(match.scoring.task, 1)
+
+    asyncio.run(run())
+    assert [[event for event, _ in frame] for frame in frames] == [
+        balls[:1],
+        balls[1:5],
+    ]
+    assert list(match.scorer.card.ledger) == balls[:5]
+    assert match.scoring.report()["render_lag"]["count"] == 5
+
+
+def test_closing_an_idle_queue_ends_the_consumer(balls):
+    match = Match("m")
+
+    async def run():
+        match.scoring.put(balls[0])
+        await match.scoring.join()
+        match.close()
+        await asyncio.wait_for(match.scoring.task, 1)
+        await asyncio.wait_for(match.scoring.join(), 0.1)
+
+    asyncio.run(run())
+    assert list(match.scorer.card.ledger) == balls[:1]
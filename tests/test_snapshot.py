@@ -0,0 +1,89 @@
+import pytest
+from classes import Match
+from conftest import FIXTURE
+
+from ec2.importers import cricsheet
+from ec2.scorebook import Ball, Extra, HowOut, ScoreCard, Scorer, snapshot
+from ec2.scorebook.analytics import Analytics
+from ec2.scorebook.history import History
+
+
+def cards() -> list[ScoreCard]:
+    match = Match.from_json(FIXTURE.read_text())
+    # a chase, which carries what only the match knows
+    ball_by_ball = Scorer(ScoreCard(analytics=Analytics(target=153, balls_limit=120)))
+    for ball in match.balls(1):
+        ball_by_ball.update(ball)
+    undone = Scorer(ScoreCard(history=History(enabled=False)))
+    undone.update(
+        Ball(
+            striker="A",
+            non_striker="B",
+            bowler="C",
+            extra_type=Extra.WIDE,
+            extra_runs=1,
+        )
+    )
+    undone.update(
+        Ball(
+            striker="A",
+            non_striker="B",
+            bowler="C",
+            player_out="B",
+            how_out=HowOut.RUN_OUT,
+            fielder="D",
+        )
+    )
+    undone.over_bowled()
+    undone.update(Ball(striker="E", non_striker="A", bowler="F", batter_runs=6))
+    undone.undo()
+    return [
+        *cricsheet.load(FIXTURE).innings,
+        ball_by_ball.card,
+        undone.card,
+        ScoreCard(),
+    ]
+
+
+@pytest.mark.parametrize("card", cards())
+@pytest.mark.parametrize(
+    "codec", [(snapshot.to_json, snapshot.from_json), (snapshot.dumps, snapshot.loads)]
+)
+def test_round_trip_is_exact(card: ScoreCard, codec):
+    encode, decode = codec
+    copy = decode(encode(card))
+    assert copy.to_json() == card.to_json()
+    assert [batter.name for batter in copy.batting_order.slots] == [
+        batter.name for batter in card.batting_order.slots
+    ]
+    assert (
+        copy.analytics.target,
+        copy.analytics.balls_limit,
+        copy.analytics.balls_per_over,
+    ) == (
+        card.analytics.target,
+        card.analytics.balls_limit,
+        card.analytics.balls_per_over,
+    )
+    assert copy.analytics.required_rate == card.analytics.required_rate
+    assert {
+        name: value for name, value in vars(copy.analytics).items() if name != "ledger"
+    } == {
+        name: value for name, value in vars(card.analytics).items() if name != "ledger"
+    }
+    assert copy.matchups.pairs == card.matchups.pairs
+    assert copy.history.enabled == card.history.enabled
+    assert list(copy.history) == list(card.history)
+    assert copy.is_consistent()
+    assert encode(copy) == encode(card)
+
+
+def test_binary_is_compact():
+    card = cricsheet.load(FIXTURE).innings[0]
+    assert len(snapshot.dumps(card)) < len(card.ledger) * 20
+    assert len(snapshot.dumps(card)) < len(card.to_json()) / 3
+
+
+def test_rejects_other_data():
+    with pytest.raises(ValueError):
+        snapshot.loads(b"NOPE" + bytes(40))
@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from ec2.importers import cricsheet
+from ec2.scorebook import Extra, HowOut
+from ec2.synthetic import FORMATS, KEEPER_ID, Generator, write
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_innings_follow_the_laws(format):
+    overs, innings = FORMATS[format]
+    for imported in Generator(format, seed=1, batch=8).matches(10):
+        assert 1 < len(imported.innings) <= innings
+        for ledger in imported.innings:
+            balls = list(ledger)
+            legal = [0] * (ledger.over[-1] + 1)
+            bowlers = {}
+            out = set()
+            for ball, over in zip(balls, ledger.over):
+                legal[over] += ball.extra_type not in (Extra.WIDE, Extra.NOBALL)
+                assert bowlers.setdefault(over, ball.bowler) == ball.bowler
+                assert ball.striker not in out and ball.non_striker not in out
+                if ball.player_out:
+                    assert ball.player_out in (ball.striker, ball.non_striker)
+                    assert (
+                        ball.how_out == HowOut.RUN_OUT
+                        or ball.player_out == ball.striker
+                    )
+                    assert bool(ball.fielder) == (
+                        ball.how_out in (HowOut.CAUGHT, HowOut.STUMPED, HowOut.RUN_OUT)
+                    )
+                    assert (
+                        ball.how_out != HowOut.STUMPED
+                        or ball.fielder == ledger.names[KEEPER_ID]
+                    )
+                    out.add(ball.player_out)
+            assert all(count == 6 for count in legal[:-1]) and 0 < legal[-1] <= 6
+            assert all(
+                bowlers[over] != bowlers[over + 1] for over in range(len(legal) - 1)
+            )
+            assert overs is None or len(legal) <= overs
+            card = cricsheet.score_ledger(ledger)
+            assert card.is_consistent()
+            assert (
+                card.wickets == 10
+                or overs
+                and card.over == overs
+                or ledger is imported.innings[-1]
+            )
+
+
+def test_chases_stop_at_the_target():
+    for imported in Generator("T20", seed=2).matches(50):
+        first, second = (cricsheet.score_ledger(ledger) for ledger in imported.innings)
+        outcome = imported.info["outcome"]
+        if second.runs > first.runs:
+            assert outcome == {
+                "winner": imported.info["teams"][1],
+                "by": {"wickets": 10 - second.wickets},
+            }
+            last = imported.innings[1].ball(len(imported.innings[1]) - 1)
+            assert second.runs - last.batter_runs - last.extra_runs <= first.runs
+        else:
+            assert second.wickets == 10 or second.over == 20
+            assert outcome.get("result") == "tie" or outcome["by"] == {
+                "runs": first.runs - second.runs
+            }
+
+
+def test_seeded_and_written_as_cricsheet(tmp_path):
+    generated = list(Generator("ODI", seed=3, batch=4).matches(6))
+    again = list(Generator("ODI", seed=3, batch=4).matches(6))
+    assert [[list(ledger) for ledger in match.innings] for match in generated] == [
+        [list(ledger) for ledger in match.innings] for match in again
+    ]
+    assert [
+        list(ledger) for ledger in next(Generator("ODI", seed=4).matches(1)).innings
+    ] != [list(ledger) for ledger in generated[0].innings]
+
+    assert write(tmp_path, iter(generated)) == 6
+    imported = sorted(
+        cricsheet.ingest(tmp_path, processes=0),
+        key=lambda match: int(Path(match.source).stem),
+    )
+    for match, original in zip(imported, generated):
+        assert match.info == original.info
+        cards = [cricsheet.score_ledger(ledger) for ledger in original.innings]
+        assert [(card.runs, card.wickets, card.over) for card in match.innings] == [
+            (card.runs, card.wickets, card.over) for card in cards
+        ]
+        assert list(match.innings[0].ledger) == list(original.innings[0])
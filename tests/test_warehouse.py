@@ -0,0 +1,104 @@
+from dataclasses import replace
+
+import pytest
+from conftest import FIXTURE
+
+from ec2.importers import cricsheet
+from ec2.scorebook import HowOut
+from ec2.scorebook.ledger import Ledger
+from ec2.storage.warehouse import Warehouse
+
+
+@pytest.fixture(scope="module")
+def imported() -> cricsheet.ImportedMatch:
+    return cricsheet.load(FIXTURE)
+
+
+def test_innings_figures_match_the_scorebook(imported):
+    with Warehouse() as warehouse:
+        assert warehouse.add([imported]) == 1
+        for number, card in enumerate(imported.innings):
+            batting = warehouse.innings(imported.source, number)
+            assert batting == [
+                {
+                    "name": batter.name,
+                    "position": batter.position,
+                    "runs": batter.runs,
+                    "balls": batter.balls_faced,
+                    "dots": batter.dots,
+                    "fours": batter.fours,
+                    "sixes": batter.sixes,
+                    "how_out": batter.how_out or HowOut.NOTOUT,
+                }
+                for batter in card.batting_order.slots
+            ]
+            for bowler in card.bowling_order.slots:
+                figures = warehouse.bowling(bowler.name)
+                assert (figures["balls"], figures["runs"], figures["wickets"]) == (
+                    bowler.balls_bowled,
+                    bowler.runs,
+                    bowler.wickets,
+                )
+
+
+def test_players_out_away_from_the_crease_are_skipped():
+    ledgers = cricsheet.load_ledgers(FIXTURE)
+    ledger = Ledger()
+    for n, ball in enumerate(ledgers.innings[0]):
+        ledger.append(ball, ledgers.innings[0].over[n])
+    ledger.append(
+        replace(ball, batter_runs=0, player_out="next in", how_out=HowOut.OTHER),
+        ledger.over[-1],
+    )
+    card = cricsheet.score_ledger(ledger)
+    with Warehouse() as warehouse:
+        assert warehouse.add([replace(ledgers, innings=[ledger])]) == 1
+        assert [
+            (row["name"], row["runs"], row["how_out"])
+            for row in warehouse.innings(ledgers.source, 0)
+        ] == [
+            (batter.name, batter.runs, batter.how_out or HowOut.NOTOUT)
+            for batter in card.batting_order.slots
+        ]
+
+
+def test_matches_without_dates_are_added():
+    ledgers = cricsheet.load_ledgers(FIXTURE)
+    with Warehouse() as warehouse:
+        assert warehouse.add([replace(ledgers, info=ledgers.info | {"dates": []})]) == 1
+
+
+def test_rollups_grow_with_each_batch_and_skip_repeats(imported, tmp_path):
+    ledgers = cricsheet.load_ledgers(FIXTURE)
+    later = replace(
+        ledgers,
+        source="later",
+        info=ledgers.info | {"season": "2016/17", "venue": "Lord's"},
+    )
+    with Warehouse(tmp_path / "stats.db") as warehouse:
+        warehouse.add([imported])
+        assert warehouse.add([later, imported]) == 1
+        assert len(warehouse) == 2
+
+    with Warehouse(tmp_path / "stats.db") as warehouse:
+        career = warehouse.batting("MN Samuels", format="T20")
+        assert (
+            career["matches"],
+            career["innings"],
+            career["not_outs"],
+            career["runs"],
+        ) == (2, 2, 2, 170)
+        assert (career["fifties"], career["high"], career["average"]) == (2, 85, None)
+        assert warehouse.batting("MN Samuels", season="2016/17")["runs"] == 85
+        assert warehouse.batting_at("MN Samuels", "Lord's")["runs"] == 85
+        assert warehouse.batting("nobody")["innings"] == 0
+        bowling = warehouse.bowling("CR Brathwaite")
+        assert bowling["wickets"] == 6 and bowling["best"] == 3
+        assert warehouse.leaders(limit=2) == [("MN Samuels", 170), ("JE Root", 108)]
+        assert warehouse.leaders("bowling", "best", season="2015/16", limit=1) == [
+            ("CR Brathwaite", 3)
+        ]
+        matchup = warehouse.matchup("MN Samuels", "DJ Willey")
+        assert matchup == {"balls": 20, "runs": 16, "dismissals": 0}
+        with pytest.raises(ValueError):
+            warehouse.leaders("batting", "wickets")
@@ -0,0 +1,83 @@
+import pytest
+
+from ec2.scorebook import Ball, Batter, Bowler, ScoreCard, Scorer
+from ec2.scorebook.window import Window
+
+
+def sliced(card: ScoreCard) -> dict:
+    # the figures as a caller would otherwise work them out from the players' balls
+    figures = {}
+    for batter in card.batting_order.slots:
+        balls = batter.balls[-Batter.window_size :]
+        figures[batter.name] = sum(ball.batter_runs for ball in balls)
+    for bowler in card.bowling_order.slots:
+        balls = bowler.balls[-Bowler.window_size :]
+        figures[f"bowler {bowler.name}"] = (
+            sum(ball.bowler_runs for ball in balls),
+            100 * sum(not ball.bowler_runs for ball in balls) / len(balls),
+        )
+    return figures
+
+
+def windowed(card: ScoreCard) -> dict:
+    figures = {batter.name: batter.recent_runs for batter in card.batting_order.slots}
+    for bowler in card.bowling_order.slots:
+        figures[f"bowler {bowler.name}"] = (
+            bowler.recent_runs,
+            pytest.approx(bowler.recent_dot_percentage),
+        )
+    return figures
+
+
+def test_window():
+    window = Window(3)
+    for value in range(6):
+        window.push(value)
+    assert (list(window.values), window.total) == ([3, 4, 5], 12)
+    with pytest.raises(ValueError):
+        Window(0)
+
+
+def test_windows_follow_scoring(ledger):
+    scorer = Scorer()
+    for n, ball in enumerate(ledger):
+        while scorer.card.over < ledger.over[n]:
+            scorer.over_bowled()
+        scorer.update(ball)
+        assert windowed(scorer.card) == sliced(scorer.card)
+
+
+def test_windows_after_bulk_undo_and_copy(ledger):
+    scorer = Scorer()
+    scorer.replay(ledger)
+    assert windowed(scorer.card) == sliced(scorer.card)
+    for _ in range(9):
+        scorer.undo()
+    scorer.update(ledger[0])
+    assert windowed(scorer.card) == sliced(scorer.card)
+    assert windowed(scorer.card.copy()) == sliced(scorer.card)
+    assert windowed(ScoreCard.from_json(scorer.card.to_json())) == sliced(scorer.card)
+
+
+def test_recent_overs(ledger):
+    scorer = Scorer()
+    scorer.replay(ledger)
+    card = scorer.card
+    runs = [0] * (card.over + 1)
+    for ball, over in zip(ledger, ledger.over):
+        runs[over] += ball.total_runs
+    last = (
+        runs[-card.window_overs :] if card.ball else runs[-card.window_overs - 1 : -1]
+    )
+    assert card.recent_runs == sum(last)
+    assert card.recent_run_rate > 0
+
+
+def test_strike_rate():
+    scorer = Scorer()
+    for runs in (0, 4, 1, 0):
+        scorer.update(Ball(striker="a", non_striker="b", bowler="x", batter_runs=runs))
+        if runs % 2:
+            scorer.update(Ball(striker="b", non_striker="a", bowler="x"))
+    assert scorer.card.batters["a"].recent_strike_rate == pytest.approx(125.0)
+    assert scorer.card.bowlers["x"].recent_economy == pytest.approx(6 * 5 / 5)